@@ -8,11 +8,31 @@ a = Analysis(
     datas=[
         ('main.py', '.'),
         ('compare.py', '.'),
+        ('geodist.py', '.'),
+        ('assignment.py', '.'),
         ('spida_writer.py', '.'),
+        ('json_codec.py', '.'),
+        ('kat_stream.py', '.'),
+        ('exporter.py', '.'),
+        ('job_cache.py', '.'),
         ('editable_tree.py', '.'),
+        ('map_layer.py', '.'),
+        ('tile_cache.py', '.'),
         ('logo.png', '.'),
     ],
     hiddenimports=[
+        # main.py imports these after the window is up (importlib), so list
+        # them to have them bundled as bytecode rather than compiled per launch
+        'compare',
+        'geodist',
+        'assignment',
+        'spida_writer',
+        'json_codec',
+        'kat_stream',
+        'exporter',
+        'job_cache',
+        'map_layer',
+        'tile_cache',
         'tkinter',
         'tkinter.filedialog',
         'tkinter.messagebox',
@@ -20,15 +40,23 @@ a = Analysis(
         'ttkbootstrap.constants',
         'tkintermapview',
         'pandas',
+        'numpy',
         'openpyxl',
         'et_xmlfile',
         'json',
+        'orjson',
+        'ijson',
+        'xlsxwriter',
+        'pyarrow',
+        'scipy.optimize',
         'pathlib',
         'traceback',
+        'sqlite3',
         'sys',
         'PIL',
         'PIL.Image',
         'PIL.ImageDraw',
+        'PIL.ImageFont',
         'PIL.ImageTk'
     ],
     hookspath=[],
@@ -50,7 +78,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # UPX-packed libraries are decompressed on every launch
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
@@ -19,4 +19,7 @@ sys.path.insert(0, str(application_path))
 import main
 
 if __name__ == "__main__":
+    # frozen builds re-launch this executable for worker processes
+    import multiprocessing
+    multiprocessing.freeze_support()
     main.main() 
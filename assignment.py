@@ -0,0 +1,155 @@
+"""
+assignment.py – minimum-cost one-to-one matching on a sparse bipartite graph.
+
+``compare.match(..., assignment="optimal")`` uses this for the coordinate
+tiers: SPIDA poles are rows, nearby Katapult poles are columns and every
+admissible pairing is an edge ``(row, col, cost)``.  The graph falls apart
+into many small clusters, so each connected component is solved on its own
+dense matrix – tens of thousands of poles cost little more than the
+largest cluster.
+
+Within a component the matching first maximises the number of pairs and
+then minimises their total cost.  ``scipy.optimize.linear_sum_assignment``
+is used when SciPy is installed; otherwise a built-in Hungarian algorithm
+gives the same optimum (exact cost ties may resolve differently).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # optional – built-in Hungarian below
+    linear_sum_assignment = None
+
+Edge = Tuple[int, int, float]            # (row, col, cost)
+
+BACKEND = "scipy" if linear_sum_assignment is not None else "hungarian"
+
+
+def components(edges: List[Edge]) -> List[List[Edge]]:
+    """Split *edges* into connected components, each in input order.
+
+    Components are ordered by their first edge.
+    """
+    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:          # path compression
+            parent[node], node = root, parent[node]
+        return root
+
+    for r, c, _cost in edges:
+        a, b = (0, r), (1, c)
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[rb] = ra
+
+    groups: Dict[Tuple[int, int], List[Edge]] = {}
+    for edge in edges:
+        groups.setdefault(find((0, edge[0])), []).append(edge)
+    return list(groups.values())
+
+
+def min_cost_assignment(edges: Iterable[Edge]) -> Dict[int, int]:
+    """Return ``{row: col}`` for a maximum matching of least total cost.
+
+    Only listed edges can be paired; a row or column appears at most once.
+    Duplicate ``(row, col)`` edges keep the cheapest cost.
+    """
+    best: Dict[Tuple[int, int], float] = {}
+    for r, c, cost in edges:
+        if (r, c) not in best or cost < best[(r, c)]:
+            best[(r, c)] = cost
+    result: Dict[int, int] = {}
+    for comp in components([(r, c, cost) for (r, c), cost in best.items()]):
+        result.update(_solve_component(comp))
+    return result
+
+
+def _solve_component(edges: List[Edge]) -> Dict[int, int]:
+    rows = list(dict.fromkeys(r for r, _, _ in edges))
+    cols = list(dict.fromkeys(c for _, c, _ in edges))
+    if len(rows) == 1 or len(cols) == 1:
+        # a star: the single cheapest edge is the whole answer
+        r, c, _ = min(edges, key=lambda e: e[2])
+        return {r: c}
+
+    # Edge costs are shifted down by BIG so one more pair always beats any
+    # saving in cost; non-edges cost 0 and are dropped afterwards.
+    row_at = {r: i for i, r in enumerate(rows)}
+    col_at = {c: j for j, c in enumerate(cols)}
+    big = (min(len(rows), len(cols)) + 1) * (max(e[2] for e in edges) + 1.0)
+    matrix = [[0.0] * len(cols) for _ in rows]
+    is_edge = set()
+    for r, c, cost in edges:
+        i, j = row_at[r], col_at[c]
+        matrix[i][j] = cost - big
+        is_edge.add((i, j))
+
+    if linear_sum_assignment is not None:
+        row_ind, col_ind = linear_sum_assignment(matrix)
+        pairs = zip(row_ind.tolist(), col_ind.tolist())
+    elif len(rows) <= len(cols):
+        pairs = enumerate(_hungarian(matrix))
+    else:
+        transposed = [list(col) for col in zip(*matrix)]
+        pairs = ((i, j) for j, i in enumerate(_hungarian(transposed)))
+    return {rows[i]: cols[j] for i, j in pairs if (i, j) in is_edge}
+
+
+def _hungarian(cost: List[List[float]]) -> List[int]:
+    """Column assigned to each row of a dense ``n × m`` matrix with ``n <= m``.
+
+    Classic O(n²m) Hungarian algorithm with row/column potentials.
+    """
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)       # p[j]: row (1-based) matched to column j, 0 = free
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta, j1 = inf, 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta, j1 = minv[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:                              # augment along the path
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assigned = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            assigned[p[j] - 1] = j - 1
+    return assigned
@@ -0,0 +1,289 @@
+"""
+batch.py – headless batch runner for many SPIDA ↔ Katapult job pairs.
+
+Runs :func:`compare.compare` for every job across a process pool and
+writes one result file per job plus a summary of the tier match counts.
+Nothing here imports the GUI stack (tkinter, ttkbootstrap, PIL,
+tkintermapview), so it runs on servers and in scheduled jobs.
+
+Usage:
+    python batch.py JOBS -o OUT_DIR [-j WORKERS] [--format csv|xlsx|parquet|feather]
+                    [--cache-dir DIR] [--assignment greedy|optimal]
+                    [--extract-workers N]
+
+JOBS is either
+    • a manifest – CSV with ``name,spida,katapult`` columns or a JSON list of
+      objects with the same keys (relative paths resolve against the
+      manifest's folder), or
+    • a directory holding ``<name>_spida.json`` / ``<name>_katapult.json``
+      pairs (``-spida``/``_kat``/``-kat`` spellings work too).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from .compare import ASSIGNMENT_MODES, compare
+    from .exporter import export_frame
+    from .job_cache import JobCache
+    from . import json_codec
+except ImportError:
+    from compare import ASSIGNMENT_MODES, compare
+    from exporter import export_frame
+    from job_cache import JobCache
+    import json_codec
+
+SPIDA_SUFFIXES = ("_spida", "-spida", ".spida")
+KATAPULT_SUFFIXES = ("_katapult", "-katapult", "_kat", "-kat")
+TIERS = ("scid", "pole_num", "coord_direct", "coord_spec_verified", "unmatched")
+
+
+# ---------------------------------------------------------------------------
+# job discovery
+# ---------------------------------------------------------------------------
+
+def _split_suffix(stem: str, suffixes) -> str | None:
+    lowered = stem.lower()
+    for suffix in suffixes:
+        if lowered.endswith(suffix):
+            return stem[: -len(suffix)]
+    return None
+
+
+def discover_jobs(directory: Path) -> List[Dict[str, str]]:
+    """Pair ``<name>_spida.json`` with ``<name>_katapult.json`` files in *directory*.
+
+    Names are matched case-insensitively (outputs are ``<name>.<fmt>``, and
+    Windows folders don't tell ``A.csv`` from ``a.csv``); a second file for
+    the same name and side is skipped.
+    """
+    pairs: Dict[str, Dict[str, str]] = {}
+    for path in sorted(directory.glob("*.json")):
+        name = _split_suffix(path.stem, SPIDA_SUFFIXES)
+        side = "spida"
+        if name is None:
+            name = _split_suffix(path.stem, KATAPULT_SUFFIXES)
+            side = "katapult"
+        if name is None:
+            continue
+        job = pairs.setdefault(name.lower(), {"name": name})
+        if side in job:
+            print(f"⚠️  Skipping {path.name}: {Path(job[side]).name} already pairs as {job['name']}")
+            continue
+        job[side] = str(path)
+
+    jobs = []
+    for job in pairs.values():
+        if "spida" in job and "katapult" in job:
+            jobs.append(job)
+        else:
+            print(f"⚠️  Skipping {job['name']}: no matching {'katapult' if 'spida' in job else 'spida'} file")
+    return jobs
+
+
+def load_manifest(manifest: Path) -> List[Dict[str, str]]:
+    """Read a CSV or JSON manifest of ``name, spida, katapult`` entries.
+
+    ``name`` defaults to the SPIDA file stem. Each job writes ``<name>.<fmt>``,
+    so names must be unique (ignoring case); duplicates raise ValueError.
+    """
+    if manifest.suffix.lower() == ".json":
+        entries = json_codec.load_path(manifest)
+    else:
+        with manifest.open(newline="", encoding="utf-8") as f:
+            entries = list(csv.DictReader(f))
+
+    jobs = []
+    seen: Dict[str, int] = {}
+    for i, entry in enumerate(entries, start=1):
+        try:
+            spida, katapult = entry["spida"], entry["katapult"]
+        except KeyError as e:
+            raise ValueError(f"{manifest}: entry {i} is missing {e}") from None
+        name = entry.get("name") or Path(spida).stem
+        first = seen.setdefault(name.lower(), i)
+        if first != i:
+            raise ValueError(f"{manifest}: entry {i} reuses the name {name!r} of entry {first}; "
+                             "give each job a unique name")
+        jobs.append({
+            "name": name,
+            "spida": str((manifest.parent / spida).resolve()),
+            "katapult": str((manifest.parent / katapult).resolve()),
+        })
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# worker
+# ---------------------------------------------------------------------------
+
+def _new_record(name: str, error: str = "") -> dict:
+    """Summary record for job *name*; ``status="failed"`` when *error* is given."""
+    record = {"name": name, "status": "failed" if error else "ok", "rows": 0, "seconds": 0.0,
+              "output": "", "error": error}
+    record.update(dict.fromkeys(TIERS, 0))
+    return record
+
+
+def run_job(job: Dict[str, str], out_dir: str, fmt: str = "csv",
+            stream_katapult: bool = False, verbose: bool = False,
+            cache_dir: str | None = None, assignment: str = "greedy",
+            extract_workers: int | None = None) -> dict:
+    """Compare one job pair and write its result; returns a summary record.
+
+    Runs in a worker process – failures are reported in the record rather
+    than raised so one bad job doesn't stop the batch.
+    """
+    record = _new_record(job["name"])
+    started = time.perf_counter()
+    try:
+        log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with log:
+            cache = JobCache(cache_dir) if cache_dir else None
+            df = compare(job["spida"], job["katapult"], stream_katapult=stream_katapult, cache=cache,
+                         assignment=assignment, extract_workers=extract_workers)
+
+        out_path = export_frame(df, Path(out_dir) / f"{job['name']}.{fmt}", fmt)
+
+        record.update(df.attrs.get("match_stats", {}))
+        record["rows"] = len(df)
+        record["output"] = str(out_path)
+    except Exception as e:
+        record["status"] = "failed"
+        record["error"] = f"{type(e).__name__}: {e}"
+        if verbose:
+            traceback.print_exc()
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+# ---------------------------------------------------------------------------
+# driver
+# ---------------------------------------------------------------------------
+
+def _run_pool(jobs: List[Dict[str, str]], workers: int | None, job_args: tuple,
+              records: List[dict]) -> List[Dict[str, str]]:
+    """Run *jobs* on one process pool, appending their records to *records*.
+
+    Returns the jobs left unfinished because a worker process died (which
+    breaks the whole pool); any other error becomes a failed record.
+    """
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, *job_args): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                unfinished.append(job)
+                continue
+            except Exception as e:
+                record = _new_record(job["name"], f"{type(e).__name__}: {e}")
+            records.append(record)
+            icon = "✅" if record["status"] == "ok" else "❌"
+            print(f"{icon} {record['name']}: {record['rows']} rows in {record['seconds']:.1f}s"
+                  + (f" – {record['error']}" if record["error"] else ""))
+    return unfinished
+
+
+def run_batch(jobs: List[Dict[str, str]], out_dir: Path, workers: int | None = None,
+              fmt: str = "csv", stream_katapult: bool = False,
+              verbose: bool = False, cache_dir: Path | None = None,
+              assignment: str = "greedy", extract_workers: int | None = None) -> List[dict]:
+    """Run every job across a process pool and write ``summary.csv``/``summary.json``.
+
+    A worker process that dies (out of memory, a native crash) breaks the
+    pool: the jobs it left unfinished are run again on a fresh pool, then
+    one per pool, so only the job that kills its worker is marked failed.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    job_args = (str(out_dir), fmt, stream_katapult, verbose,
+                str(cache_dir) if cache_dir else None, assignment, extract_workers)
+    records: List[dict] = []
+    pending = _run_pool(jobs, workers, job_args, records)
+    if pending:
+        print(f"⚠️  A worker process died – re-running {len(pending)} unfinished job(s)")
+        pending = _run_pool(pending, workers, job_args, records)
+    for job in pending:   # isolate the job that keeps taking its worker down
+        if _run_pool([job], 1, job_args, records):
+            record = _new_record(job["name"], "BrokenProcessPool: the worker process died")
+            records.append(record)
+            print(f"❌ {job['name']}: {record['error']}")
+
+    order = {job["name"]: i for i, job in enumerate(jobs)}
+    records.sort(key=lambda r: order.get(r["name"], len(order)))
+
+    fields = ["name", "status", "rows", *TIERS, "seconds", "output", "error"]
+    with (out_dir / "summary.csv").open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(records)
+    totals = {tier: sum(r[tier] for r in records) for tier in TIERS}
+    json_codec.dump_path({"jobs": records, "totals": totals}, out_dir / "summary.json", indent=2)
+    return records
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="quic-batch",
+        description="Compare many SPIDA/Katapult job pairs without the GUI.",
+    )
+    parser.add_argument("jobs", type=Path, help="manifest (.csv/.json) or directory of job pairs")
+    parser.add_argument("-o", "--out", type=Path, required=True, help="output directory")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=("csv", "xlsx", "parquet", "feather"), default="csv",
+                        help="per-job output format (default: csv)")
+    parser.add_argument("--stream-katapult", action="store_true",
+                        help="stream Katapult files to cut peak memory (needs ijson)")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="reuse extracted rows of unchanged files from this job cache folder")
+    parser.add_argument("--assignment", choices=ASSIGNMENT_MODES, default="greedy",
+                        help="coordinate tiers: nearest candidate per pole (greedy, default) "
+                             "or one-to-one minimum-cost pairing (optimal)")
+    parser.add_argument("--extract-workers", type=int, default=None, metavar="N",
+                        help="extract each large Katapult job across N processes "
+                             "(combine with a small -j)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="show compare() output for every job")
+    args = parser.parse_args(argv)
+
+    if not args.jobs.exists():
+        print(f"❌ Jobs not found: {args.jobs}")
+        return 1
+    if args.jobs.is_dir():
+        jobs = discover_jobs(args.jobs)
+    else:
+        try:
+            jobs = load_manifest(args.jobs)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+    if not jobs:
+        print("No job pairs found.")
+        return 1
+
+    print(f"🚀 Running {len(jobs)} job(s) on {args.workers} worker(s)...")
+    records = run_batch(jobs, args.out, args.workers, args.format,
+                        args.stream_katapult, args.verbose, args.cache_dir, args.assignment,
+                        args.extract_workers)
+    failed = sum(r["status"] != "ok" for r in records)
+    print(f"📊 Summary written to {args.out / 'summary.csv'} ({failed} failed)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
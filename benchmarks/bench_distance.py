@@ -0,0 +1,84 @@
+"""
+bench_distance.py – scalar vs NumPy distance helpers.
+
+Times, on random poles spread over a few km:
+    * ``haversine_m`` in a Python loop vs ``haversine_matrix`` (all pairs)
+    * brute-force nearest neighbour vs ``nearest_k``
+    * tier-3 radius search: ``_CoordGrid.query`` per pole vs ``query_many``
+
+Usage:
+    python benchmarks/bench_distance.py [--poles 5000] [--radius 5] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import geodist                                    # noqa: E402
+from compare import KatapultPole, _CoordGrid      # noqa: E402
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _coords(n: int, seed: int) -> list[tuple[float, float]]:
+    rnd = random.Random(seed)
+    # ~0.01° ≈ 1 km box around a typical job
+    return [(30.25 + rnd.uniform(0, 0.02), -97.75 + rnd.uniform(0, 0.02)) for _ in range(n)]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--poles", type=int, default=5000, help="poles per side (default 5000)")
+    ap.add_argument("--radius", type=float, default=5.0, help="tier-3 search radius in metres")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per case, best is reported")
+    args = ap.parse_args(argv)
+
+    spida = _coords(args.poles, 1)
+    kat = _coords(args.poles, 2)
+    # the all-pairs cases are quadratic – keep the Python loop to a sample
+    sample = spida[: min(len(spida), 500)]
+
+    rows = []
+
+    def scalar_matrix():
+        return [[geodist.haversine_m(a, b) for b in kat] for a in sample]
+
+    rows.append((f"all pairs {len(sample)}×{len(kat)}",
+                 _best(scalar_matrix, args.repeat),
+                 _best(lambda: geodist.haversine_matrix(sample, kat), args.repeat)))
+
+    def scalar_nearest():
+        return [min(range(len(kat)), key=lambda j: geodist.haversine_m(a, kat[j])) for a in sample]
+
+    rows.append((f"nearest {len(sample)}→{len(kat)}",
+                 _best(scalar_nearest, args.repeat),
+                 _best(lambda: geodist.nearest_k(sample, kat, k=1), args.repeat)))
+
+    grid = _CoordGrid(
+        {str(i): KatapultPole(str(i), None, None, None, None, False, c) for i, c in enumerate(kat)}
+    )
+    rows.append((f"radius {args.radius:g} m, {len(spida)} queries",
+                 _best(lambda: [grid.query(c, args.radius) for c in spida], args.repeat),
+                 _best(lambda: grid.query_many(spida, args.radius), args.repeat)))
+
+    print(f"{'case':<32}{'scalar s':>12}{'numpy s':>12}{'speed-up':>10}")
+    for name, scalar, vector in rows:
+        print(f"{name:<32}{scalar:>12.4f}{vector:>12.4f}{scalar / vector:>9.1f}×")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+bench_map.py – cost of turning a comparison frame into map markers.
+
+Times, on a synthetic frame shaped like the GUI's (renamed columns):
+    * eager markers: every row's detail text built up front, as the map
+      used to do, vs ``frame_map_items`` (markers hold only the row position)
+    * one marker click: row lookup + ``pole_details_text``
+    * ``ClusterIndex`` construction and clustering at a few zoom levels
+
+and reports the memory the marker lists keep alive.
+
+Usage:
+    python benchmarks/bench_map.py [--rows 50000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from map_layer import (                              # noqa: E402
+    LINKED_TIERS, ClusterIndex, MapPoint, frame_map_items, pole_details_text,
+)
+
+TIERS = LINKED_TIERS + ("unmatched", "katapult_only")
+LINE_COLORS = {tier: "#888888" for tier in TIERS}
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _frame(n: int, seed: int = 1) -> pd.DataFrame:
+    rnd = random.Random(seed)
+    cols: dict[str, list] = {name: [] for name in (
+        "SPIDA SCID #", "Katapult SCID #", "SPIDA Pole #", "Katapult Pole #",
+        "SPIDA Pole Spec", "Katapult Pole Spec", "SPIDA Existing %", "Katapult Existing %",
+        "SPIDA Final %", "Katapult Final %", "Com Drop? (SPIDA)", "Com Drop? (Kat)",
+        "SPIDA Coord", "Katapult Coord", "Match Tier", "Match Distance (m)",
+    )}
+    for i in range(n):
+        tier = rnd.choice(TIERS)
+        lat, lon = 30.25 + rnd.uniform(0, 0.05), -97.75 + rnd.uniform(0, 0.05)
+        has_spida = tier != "katapult_only"
+        has_kat = tier != "unmatched"
+        spec = "40'-3 Southern Pine"
+        for side, present in (("SPIDA", has_spida), ("Katapult", has_kat)):
+            cols[f"{side} SCID #"].append(f"{i:05d}" if present else None)
+            cols[f"{side} Pole #"].append(f"PL{i}" if present else None)
+            cols[f"{side} Pole Spec"].append(spec if present else None)
+            cols[f"{side} Existing %"].append(f"{rnd.uniform(10, 90):.2f}%" if present else None)
+            cols[f"{side} Final %"].append(f"{rnd.uniform(10, 90):.2f}%" if present else None)
+        cols["Com Drop? (SPIDA)"].append(rnd.random() < 0.3 if has_spida else None)
+        cols["Com Drop? (Kat)"].append(("Yes" if rnd.random() < 0.3 else "No") if has_kat else None)
+        cols["SPIDA Coord"].append((lat, lon) if has_spida else None)
+        cols["Katapult Coord"].append((lat + rnd.uniform(-2e-5, 2e-5), lon) if has_kat else None)
+        cols["Match Tier"].append(tier)
+        cols["Match Distance (m)"].append(round(rnd.uniform(0, 5), 2) if tier.startswith("coord") else None)
+    return pd.DataFrame(cols)
+
+
+def _eager_points(df: pd.DataFrame) -> list[MapPoint]:
+    # The old update_map(): one record dict and one detail string per row
+    points = []
+    for row in df.to_dict("records"):
+        tier = row.get("Match Tier", "unmatched")
+        text = pole_details_text(row)
+        spida_coord, kat_coord = row.get("SPIDA Coord"), row.get("Katapult Coord")
+        if spida_coord:
+            points.append(MapPoint(spida_coord[0], spida_coord[1], tier, text))
+        if kat_coord and (not spida_coord or kat_coord != spida_coord):
+            kat_tier = tier if tier != "unmatched" else "katapult_only"
+            points.append(MapPoint(kat_coord[0], kat_coord[1], kat_tier, text))
+    return points
+
+
+def _retained(fn) -> float:
+    """MB still allocated by fn()'s result once it returns."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del result
+    return size / 1e6
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=50000, help="frame rows (default 50000)")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per case, best is reported")
+    args = ap.parse_args(argv)
+
+    df = _frame(args.rows)
+    items = frame_map_items(df, LINE_COLORS)
+    print(f"{len(df)} rows → {len(items.points)} markers, {len(items.edges)} lines\n")
+
+    eager_s = _best(lambda: _eager_points(df), args.repeat)
+    lazy_s = _best(lambda: frame_map_items(df, LINE_COLORS), args.repeat)
+    eager_mb = _retained(lambda: _eager_points(df))
+    lazy_mb = _retained(lambda: frame_map_items(df, LINE_COLORS))
+    print(f"{'markers':<28}{'seconds':>10}{'kept MB':>10}")
+    print(f"{'eager detail text':<28}{eager_s:>10.4f}{eager_mb:>10.1f}")
+    print(f"{'row key (lazy)':<28}{lazy_s:>10.4f}{lazy_mb:>10.1f}")
+    print(f"speed-up {eager_s / lazy_s:.1f}×, memory {eager_mb / max(lazy_mb, 1e-9):.1f}× less\n")
+
+    pos = len(df) // 2
+    click_s = _best(lambda: pole_details_text(df.iloc[[pos]].to_dict("records")[0]), args.repeat)
+    print(f"{'one click (row → text)':<28}{click_s * 1e3:>10.3f} ms\n")
+
+    index_s = _best(lambda: ClusterIndex(items.points), args.repeat)
+    print(f"{'ClusterIndex build':<28}{index_s:>10.4f} s")
+    index = ClusterIndex(items.points)
+    for zoom in (10, 13, 16):
+        t0 = time.perf_counter()
+        clusters = index.clusters(zoom)
+        print(f"{f'clusters @ zoom {zoom}':<28}{time.perf_counter() - t0:>10.4f} s  ({len(clusters.count)} clusters)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+bench_pipeline.py – end-to-end timings on synthetic jobs (see synth_jobs.py).
+
+For each job size, times:
+    * parsing both files, extraction (in memory and streamed Katapult),
+      indexing, tier matching and building the frame – the ``compare()``
+      stages – plus one full ``compare()`` from the paths
+    * a batch of SPIDA edits: SCID index, ``apply_edits`` in place and
+      ``EditOverlay.record_many``
+    * saving the edited document (``EditOverlay.write``)
+    * exporting the frame to CSV, Excel and, with pyarrow, Parquet
+
+The planted tier counts are checked against ``match_stats`` (exit 1 on a
+mismatch). ``--json FILE`` stores the results; ``--baseline FILE`` compares
+against an earlier run and exits 1 when a case got slower than
+``--tolerance`` allows.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000 100000] [--repeat 3]
+        [--edits 1000] [--bloat 1] [--jitter-m 4] [--mix TIER=SHARE ...]
+        [--json results.json] [--baseline old.json] [--tolerance 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import compare                                    # noqa: E402
+import exporter                                   # noqa: E402
+import json_codec                                 # noqa: E402
+import spida_writer                               # noqa: E402
+from synth_jobs import DEFAULT_MIX, SynthConfig, make_job, parse_mix, write_job   # noqa: E402
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # optional – Parquet export is skipped
+    pyarrow = None
+
+# Edits cycled through by the edit/save cases, one per SCID
+EDIT_VALUES = (
+    ("SPIDA Pole Spec", "45'-2 Southern Pine"),
+    ("SPIDA Existing %", "55.00%"),
+    ("SPIDA Final %", "61.50%"),
+    ("Com Drop? (SPIDA)", "True"),
+)
+
+# Cases faster than this are not flagged against a baseline – timer noise
+MIN_REGRESSION_S = 0.01
+
+
+def _best(fn, repeat: int, setup=None) -> float:
+    """Best of *repeat* runs of ``fn()`` – or ``fn(setup())``, with *setup* untimed."""
+    best = float("inf")
+    for _ in range(repeat):
+        arg = (setup(),) if setup is not None else ()
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):   # compare() reports as it goes
+            fn(*arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def bench_size(cfg: SynthConfig, edits: int, repeat: int, tmp: Path) -> tuple[dict, list[str]]:
+    """Time every case for one job size; returns ``({case: seconds}, problems)``."""
+    job = make_job(cfg)
+    spida_path, kat_path = write_job(job, tmp, f"synth{cfg.poles}")
+    print(f"\n{cfg.poles} poles – SPIDA {spida_path.stat().st_size / 1e6:.1f} MB, "
+          f"Katapult {kat_path.stat().st_size / 1e6:.1f} MB")
+    times: dict[str, float] = {}
+    problems: list[str] = []
+
+    # ---- compare() stages --------------------------------------------
+    times["parse_spida"] = _best(lambda: json_codec.load_path(spida_path), repeat)
+    times["parse_katapult"] = _best(lambda: json_codec.load_path(kat_path), repeat)
+    spida_doc, kat_doc = job.spida, job.katapult
+    times["extract_spida"] = _best(lambda: compare.extract_spida(spida_doc), repeat)
+    times["extract_katapult"] = _best(lambda: compare.extract_katapult(kat_doc), repeat)
+    times["extract_katapult_stream"] = _best(lambda: compare.extract_katapult(kat_path, stream=True), repeat)
+    spida = _quiet(compare.extract_spida, spida_doc)
+    katapult = _quiet(compare.extract_katapult, kat_doc)
+    times["build_indexes"] = _best(lambda: compare.build_indexes(katapult), repeat)
+    indexes = compare.build_indexes(katapult)
+    times["match"] = _best(lambda: compare.match(spida, indexes), repeat)
+    result = _quiet(compare.match, spida, indexes)
+    times["to_frame"] = _best(lambda: compare.to_frame(result), repeat)
+    times["compare"] = _best(lambda: compare.compare(spida_path, kat_path), repeat)
+
+    expected = job.expected_stats()
+    if dict(result.stats) != expected:
+        problems.append(f"{cfg.poles} poles: match_stats {dict(result.stats)} != planted {expected}")
+
+    # ---- edits and save ----------------------------------------------
+    scids = [row.scid for row in spida.rows][:edits]
+    batch = [(scid, *EDIT_VALUES[i % len(EDIT_VALUES)]) for i, scid in enumerate(scids)]
+    times["scid_index"] = _best(lambda: spida_writer.build_scid_index(spida_doc), repeat)
+    index = spida_writer.build_scid_index(spida_doc)
+    times["apply_edits"] = _best(lambda doc: spida_writer.apply_edits(doc, batch), repeat,
+                                 setup=lambda: copy.deepcopy(spida_doc))
+    times["overlay_record"] = _best(
+        lambda: spida_writer.EditOverlay(spida_doc, index).record_many(batch), repeat
+    )
+    overlay = spida_writer.EditOverlay(spida_doc, index)
+    overlay.record_many(batch)
+    times["save"] = _best(lambda: overlay.write(tmp / "saved.json"), repeat)
+
+    # ---- export ------------------------------------------------------
+    df = _quiet(compare.to_frame, result)
+    formats = ["csv", "xlsx"] + (["parquet"] if pyarrow is not None else [])
+    for fmt in formats:
+        times[f"export_{fmt}"] = _best(lambda: exporter.export_frame(df, tmp / f"out.{fmt}", fmt), repeat)
+
+    for case, secs in times.items():
+        print(f"  {case:<26}{secs:>10.4f} s")
+    print(f"  ({len(batch)} edits per batch)")
+    return times, problems
+
+
+def compare_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Cases at least *tolerance* (and :data:`MIN_REGRESSION_S`) slower than *baseline*."""
+    slower = []
+    print(f"\n{'vs baseline':<34}{'old s':>10}{'new s':>10}{'ratio':>8}")
+    for size, cases in results["sizes"].items():
+        old_cases = baseline.get("sizes", {}).get(size, {})
+        for case, new in cases.items():
+            old = old_cases.get(case)
+            if old is None:
+                continue
+            ratio = new / old if old else float("inf")
+            regressed = ratio > 1 + tolerance and new - old > MIN_REGRESSION_S
+            mark = "  ❌" if regressed else ""
+            print(f"{size + ' ' + case:<34}{old:>10.4f}{new:>10.4f}{ratio:>7.2f}×{mark}")
+            if regressed:
+                slower.append(f"{size} poles {case}: {old:.4f} s → {new:.4f} s")
+    return slower
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="SPIDA poles per job")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per case, best is reported")
+    ap.add_argument("--edits", type=int, default=1000, help="SPIDA edits per batch (default 1000)")
+    ap.add_argument("--mix", nargs="+", metavar="TIER=SHARE", help="tier shares, see synth_jobs.py")
+    ap.add_argument("--jitter-m", type=float, default=4.0, help="max coordinate-tier offset in metres")
+    ap.add_argument("--bloat", type=int, default=1, help="document filler per pole, 0 = lean")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", type=Path, help="write the results to this file")
+    ap.add_argument("--baseline", type=Path, help="earlier --json results to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slow-down vs baseline (default 0.25)")
+    args = ap.parse_args(argv)
+
+    mix = parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX)
+    results = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "json_backend": json_codec.BACKEND,
+        "xlsx_engine": "xlsxwriter" if exporter.xlsxwriter is not None else "openpyxl",
+        "config": {"repeat": args.repeat, "edits": args.edits, "mix": mix,
+                   "jitter_m": args.jitter_m, "bloat": args.bloat, "seed": args.seed},
+        "sizes": {},
+    }
+    problems: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            cfg = SynthConfig(poles=size, mix=mix, jitter_m=args.jitter_m, bloat=args.bloat, seed=args.seed)
+            times, found = bench_size(cfg, args.edits, args.repeat, Path(tmp))
+            results["sizes"][str(size)] = times
+            problems += found
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        problems += compare_baseline(results, json.loads(args.baseline.read_text(encoding="utf-8")),
+                                     args.tolerance)
+    for problem in problems:
+        print(f"❌ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+bench_startup.py – how long QuiC takes to get a window on screen.
+
+Each measurement runs in a fresh interpreter (``-X importtime``), so the
+numbers are cold-import costs:
+    * ``import main`` – what stands between launch and the first window
+    * the deferred modules main.py loads in the background afterwards
+    * with a display, creating ``CompareApp`` and drawing its first frame
+
+It also lists the slowest modules ``main`` imports and fails (exit 1) if a
+module from ``main.DEFERRED_MODULES`` is imported eagerly again.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--top 12] [--json results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_IMPORT_MAIN = "import main"
+_DEFERRED = (
+    "import time, main\n"
+    "t0 = time.perf_counter()\n"
+    "for name in main.DEFERRED_MODULES:\n"
+    "    main._import(name)\n"
+    "print(time.perf_counter() - t0)\n"
+)
+_FIRST_FRAME = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "import main\n"
+    "app = main.CompareApp()\n"
+    "app.update()\n"
+    "print(time.perf_counter() - t0)\n"
+    "app.destroy()\n"
+)
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True,
+                          env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+
+
+def _importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """``(module, depth, self_us, cumulative_us)`` rows of an ``-X importtime`` report."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            name = name[1:]                      # drop the separator space
+            depth = (len(name) - len(name.lstrip())) // 2
+            rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _children(rows, parent: str) -> list[tuple[str, int]]:
+    """``(module, cumulative_us)`` of the modules *parent* imported directly."""
+    end = next(i for i, row in enumerate(rows) if row[0] == parent and row[1] == 0)
+    start = end
+    while start > 0 and rows[start - 1][1] > 0:   # children are listed before their parent
+        start -= 1
+    return [(name, cum) for name, depth, _, cum in rows[start:end] if depth == 1]
+
+
+def _last_float(stdout: str) -> float:
+    return float(stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5, help="fresh interpreters per case, median is reported")
+    ap.add_argument("--top", type=int, default=12, help="slowest imports to list")
+    ap.add_argument("--json", type=Path, help="also write the results to this file")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT))
+    import main as quic_main                      # noqa: E402 – for DEFERRED_MODULES only
+    deferred = set(quic_main.DEFERRED_MODULES)
+
+    reports = []
+    for _ in range(args.runs):
+        proc = _run(_IMPORT_MAIN, importtime=True)
+        if proc.returncode:
+            print(proc.stderr)
+            return 1
+        reports.append(_importtime(proc.stderr))
+    totals = [next(cum for name, depth, _, cum in rows if name == "main" and depth == 0) / 1e6
+              for rows in reports]
+    eager = sorted({row[0] for rows in reports for row in rows} & deferred)
+
+    deferred_s = statistics.median(_last_float(_run(_DEFERRED).stdout) for _ in range(args.runs))
+
+    first_frame = _run(_FIRST_FRAME)
+    first_frame_s = _last_float(first_frame.stdout) if first_frame.returncode == 0 else None
+
+    results = {
+        "python": sys.version.split()[0],
+        "import_main_s": statistics.median(totals),
+        "deferred_imports_s": deferred_s,
+        "first_frame_s": first_frame_s,
+        "eager_deferred_modules": eager,
+        "slowest_imports": [],
+    }
+
+    print(f"{'import main (median)':<34}{results['import_main_s']:>8.3f} s")
+    print(f"{'background imports after window':<34}{deferred_s:>8.3f} s")
+    if first_frame_s is None:
+        print(f"{'first frame':<34}{'skipped (no display)':>20}")
+    else:
+        print(f"{'first frame (import + window)':<34}{first_frame_s:>8.3f} s")
+
+    # modules main imports directly, from the median run
+    median_run = sorted(zip(totals, range(len(reports))))[len(reports) // 2][1]
+    print("\nslowest imports by main (cumulative ms):")
+    for name, cum_us in sorted(_children(reports[median_run], "main"), key=lambda r: -r[1])[:args.top]:
+        results["slowest_imports"].append({"module": name, "cumulative_ms": cum_us / 1e3})
+        print(f"  {cum_us / 1e3:>8.1f}  {name}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if eager:
+        print(f"\n❌ imported before the window: {', '.join(eager)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
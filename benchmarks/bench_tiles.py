@@ -0,0 +1,123 @@
+"""
+bench_tiles.py – map tiles from the network vs the on-disk tile cache.
+
+Starts a local stand-in tile server (plain PNGs, configurable latency),
+then times for a job-sized bounding box:
+    * loading every tile from the server, one at a time like the map does
+    * ``TileCache.prefetch`` of the same area (parallel downloads)
+    * loading every tile again, now answered from the SQLite cache
+
+``--serve PORT`` only runs the stand-in server, e.g. to try the GUI offline:
+
+    python benchmarks/bench_tiles.py --serve 8765
+    QUIC_TILE_SERVER="http://127.0.0.1:8765/{z}/{x}/{y}.png" python main.py
+
+Usage:
+    python benchmarks/bench_tiles.py [--latency-ms 50] [--zoom 12 17] [--serve PORT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tile_cache import TileCache, bbox_tiles, coords_bbox      # noqa: E402
+
+# ~3 km × 2 km job
+JOB_COORDS = [(30.250, -97.750), (30.268, -97.722)]
+
+
+def _handler(latency_s: float):
+    class TileHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            try:
+                z, x, y = (int(p.split(".")[0]) for p in self.path.strip("/").split("/"))
+            except ValueError:
+                self.send_error(404)
+                return
+            time.sleep(latency_s)
+            buf = io.BytesIO()
+            Image.new("RGB", (256, 256), (z * 13 % 256, x % 256, y % 256)).save(buf, "PNG")
+            body = buf.getvalue()
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return TileHandler
+
+
+def serve(port: int, latency_s: float) -> ThreadingHTTPServer:
+    """Start the stand-in tile server on a daemon thread (port 0 = any free port)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(latency_s))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--latency-ms", type=float, default=50.0, help="server delay per tile (default 50)")
+    ap.add_argument("--zoom", type=int, nargs=2, default=(12, 17), metavar=("MIN", "MAX"))
+    ap.add_argument("--serve", type=int, metavar="PORT", help="only run the stand-in tile server")
+    args = ap.parse_args(argv)
+
+    if args.serve is not None:
+        server = serve(args.serve, args.latency_ms / 1000)
+        print(f"🗺️  Tile server on http://127.0.0.1:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+
+    server = serve(0, args.latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png"
+    bbox = coords_bbox(JOB_COORDS)
+    tiles = list(bbox_tiles(bbox, *args.zoom))
+    print(f"{len(tiles)} tiles, zoom {args.zoom[0]}–{args.zoom[1]}, {args.latency_ms:g} ms server latency\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TileCache(Path(tmp) / "tiles.db", tile_server=url)
+
+        t0 = time.perf_counter()
+        for tile in tiles:
+            cache.fetch(*tile)
+        network_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        result = cache.prefetch(bbox, *args.zoom)
+        prefetch_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for tile in tiles:
+            cache.tile(*tile)
+        cached_s = time.perf_counter() - t0
+        size_mb = cache.size() / 1e6
+        cache.close()
+    server.shutdown()
+
+    print(f"{'case':<30}{'seconds':>10}{'ms/tile':>10}")
+    for name, secs in (("network, one at a time", network_s),
+                       (f"prefetch ({result.downloaded} downloaded)", prefetch_s),
+                       ("cache hits", cached_s)):
+        print(f"{name:<30}{secs:>10.3f}{secs / len(tiles) * 1e3:>10.3f}")
+    print(f"\ncache size {size_mb:.1f} MB, {network_s / cached_s:.0f}× faster than the network")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+"""
+synth_jobs.py – synthetic SPIDA / Katapult job pairs for the benchmarks.
+
+Builds a SPIDA exchange document (leads → locations → Measured/Recommended
+designs with pole, attachments, wires and analysis results) and a Katapult
+job (pole and service-location nodes, connections with sections, photos
+carrying the birthmarks) that ``compare()`` reads like real exports.
+
+Every SPIDA pole is planted for one match tier, so the expected
+``match_stats`` are known up front:
+
+    scid                 Katapult node carries the SPIDA SCID
+    pole_num             same pole number, unrelated SCID
+    coord_direct         Katapult pole < 1 m away, nothing else in common
+    coord_spec_verified  1 m – *jitter_m* away with the same pole spec
+    unmatched            no Katapult pole at all
+
+Poles sit ~40 m apart on a grid, so coordinate candidates never overlap.
+*katapult_only* adds Katapult poles with no SPIDA counterpart and *bloat*
+pads both documents with the wires, analysis cases and photo data that
+make real exports large without changing the comparison.
+
+Usage:
+    python benchmarks/synth_jobs.py OUT_DIR [--poles 1000] [--jitter-m 4] [--bloat 1]
+                                    [--mix scid=.5 pole_num=.2 coord_direct=.1 ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import json_codec                                 # noqa: E402
+
+# Share of SPIDA poles planted per tier (normalised, need not sum to 1)
+DEFAULT_MIX: Mapping[str, float] = {
+    "scid": 0.55,
+    "pole_num": 0.20,
+    "coord_direct": 0.10,
+    "coord_spec_verified": 0.10,
+    "unmatched": 0.05,
+}
+TIERS: Tuple[str, ...] = tuple(DEFAULT_MIX)
+
+ORIGIN = (30.25, -97.75)        # south-west corner of the job
+SPACING_M = 40.0                # typical span length
+LOCATIONS_PER_LEAD = 50
+
+# (height ft, class, species) – the spec catalogue both sides draw from
+POLE_SPECS: Tuple[Tuple[int, str, str], ...] = (
+    (35, "5", "Southern Pine"),
+    (40, "4", "Southern Pine"),
+    (40, "3", "Douglas Fir"),
+    (45, "3", "Southern Pine"),
+    (45, "2", "Western Red Cedar"),
+    (50, "2", "Southern Pine"),
+    (55, "1", "Douglas Fir"),
+)
+
+# Number ranges that keep the tiers apart: SPIDA SCIDs are 1..poles
+_SPIDA_POLE_NUM = 1_000_000     # SPIDA pole # (also Katapult DLOC for pole_num tier)
+_KAT_OTHER_POLE_NUM = 5_000_000
+_KAT_OTHER_SCID = 20_000_000
+
+
+class SynthConfig(NamedTuple):
+    """Shape of one synthetic job pair."""
+    poles: int = 1000
+    mix: Mapping[str, float] = DEFAULT_MIX
+    jitter_m: float = 4.0            # max offset of coordinate-tier Katapult poles
+    katapult_only: float = 0.02      # extra Katapult poles, share of *poles*
+    charter_drop: float = 0.25       # share of poles with a Charter service drop
+    bloat: int = 1                   # filler wires / cases / photos per pole, 0 = lean
+    seed: int = 1
+
+
+class SynthJob(NamedTuple):
+    """A generated pair plus the tier every SPIDA row was planted for."""
+    spida: dict
+    katapult: dict
+    tiers: Tuple[str, ...]           # per SPIDA row, in SCID order
+
+    def expected_stats(self) -> Dict[str, int]:
+        """``match_stats`` a greedy ``compare()`` should report for this pair."""
+        stats = dict.fromkeys(TIERS, 0)
+        for tier in self.tiers:
+            stats[tier] += 1
+        return stats
+
+
+def parse_mix(items: List[str]) -> Dict[str, float]:
+    """``["scid=.5", "unmatched=.1"]`` → tier mix; unnamed tiers get 0."""
+    mix = dict.fromkeys(TIERS, 0.0)
+    for item in items:
+        tier, _, share = item.partition("=")
+        if tier not in mix:
+            raise ValueError(f"Unknown tier {tier!r} (expected one of {TIERS})")
+        mix[tier] = float(share)
+    if sum(mix.values()) <= 0:
+        raise ValueError("Tier mix must have a positive share")
+    return mix
+
+
+def _plan_tiers(cfg: SynthConfig, rnd: random.Random) -> List[str]:
+    total = sum(cfg.mix.get(t, 0.0) for t in TIERS)
+    counts = [int(cfg.poles * cfg.mix.get(t, 0.0) / total) for t in TIERS]
+    counts[0] += cfg.poles - sum(counts)            # rounding goes to the SCID tier
+    tiers = [t for t, n in zip(TIERS, counts) for _ in range(n)]
+    rnd.shuffle(tiers)
+    return tiers
+
+
+def _grid_coord(i: int, cols: int) -> Tuple[float, float]:
+    row, col = divmod(i, cols)
+    lat = ORIGIN[0] + row * SPACING_M / 111_320.0
+    lon = ORIGIN[1] + col * SPACING_M / (111_320.0 * math.cos(math.radians(ORIGIN[0])))
+    return lat, lon
+
+
+def _offset(coord: Tuple[float, float], dist_m: float, rnd: random.Random) -> Tuple[float, float]:
+    bearing = rnd.uniform(0, 2 * math.pi)
+    dlat = dist_m * math.cos(bearing) / 111_320.0
+    dlon = dist_m * math.sin(bearing) / (111_320.0 * math.cos(math.radians(coord[0])))
+    return coord[0] + dlat, coord[1] + dlon
+
+
+# ---------------------------------------------------------------------------
+# SPIDA side
+# ---------------------------------------------------------------------------
+
+def _spida_design(layer: str, alias: str, spec: tuple, load: float, charter: bool,
+                  bloat: int, rnd: random.Random) -> dict:
+    height_ft, klass, species = spec
+    attachments = [{
+        "id": "Insulator#1",
+        "owner": {"industry": "UTILITY", "id": "Acme Power"},
+        "clientItem": {"type": "PIN", "size": "15kV"},
+        "attachmentHeight": {"unit": "METRE", "value": round(height_ft * 0.3048 - 1.2, 3)},
+    }]
+    if charter:
+        attachments.append({
+            "id": "Charter#1",
+            "owner": {"industry": "COMMUNICATION", "id": "Charter"},
+            "usageGroup": "COMMUNICATION_SERVICE",
+            "clientItem": {"type": "ServiceDrop"},
+            "attachmentHeight": {"unit": "METRE", "value": 5.6},
+        })
+    wires = [{
+        "id": f"Wire#{w}",
+        "owner": {"industry": "UTILITY", "id": "Acme Power"},
+        "usageGroup": "PRIMARY" if w % 2 else "NEUTRAL",
+        "clientItem": {"size": "1/0 ACSR", "coreStrands": 6, "conductorStrands": 1},
+        "attachmentHeight": {"unit": "METRE", "value": round(rnd.uniform(6, 12), 3)},
+        "midspanHeight": {"unit": "METRE", "value": round(rnd.uniform(5, 9), 3)},
+        "tensionGroup": "Full",
+    } for w in range(2 * bloat)]
+    results = [{"component": "Pole", "analysisType": "STRESS", "actual": load, "allowable": 1.0,
+                "unit": "PERCENT", "passes": load <= 1.0}]
+    results += [{"component": f"Crossarm#{c}", "analysisType": "STRESS",
+                 "actual": round(rnd.uniform(0.1, 0.9), 4), "allowable": 1.0,
+                 "unit": "PERCENT", "passes": True} for c in range(bloat)]
+    analysis = [{"id": "Light - Grade C", "results": results}]
+    analysis += [{"id": f"Extreme Wind #{c}", "results": results[1:]} for c in range(bloat)]
+    return {
+        "label": layer,
+        "layerType": layer,
+        "structure": {
+            "pole": {
+                "id": "Pole",
+                "clientItemAlias": alias,
+                "clientItem": {
+                    "species": species,
+                    "classOfPole": klass,
+                    "height": {"unit": "METRE", "value": round(height_ft * 0.3048, 4)},
+                },
+                "glc": {"unit": "METRE", "value": 1.02},
+                "agl": {"unit": "METRE", "value": round(height_ft * 0.3048 - 1.8, 4)},
+            },
+            "attachments": attachments,
+            "wires": wires,
+            "spans": [],
+        },
+        "analysis": analysis,
+    }
+
+
+def _spida_location(i: int, coord: tuple, spec_idx: int, charter: bool,
+                    cfg: SynthConfig, rnd: random.Random) -> dict:
+    spec = POLE_SPECS[spec_idx]
+    alias = f"pole-alias-{spec_idx}"
+    existing = round(rnd.uniform(0.15, 0.95), 4)
+    final = round(min(existing + rnd.uniform(0.0, 0.2), 1.2), 4)
+    location = {
+        "label": f"L{1 + i // LOCATIONS_PER_LEAD}-{_SPIDA_POLE_NUM + i + 1}",
+        "geographicCoordinate": {"type": "Point", "coordinates": [coord[1], coord[0]]},
+        "designs": [
+            _spida_design("Measured", alias, spec, existing, charter, cfg.bloat, rnd),
+            _spida_design("Recommended", alias, spec, final, charter, cfg.bloat, rnd),
+        ],
+    }
+    if cfg.bloat:
+        location["comments"] = "field verified; " * (4 * cfg.bloat)
+        location["remedies"] = [{"description": f"Remedy {r}", "status": "OPEN"}
+                                for r in range(cfg.bloat)]
+    return location
+
+
+def _spida_document(locations: List[dict]) -> dict:
+    owners = [{"id": "Acme Power", "name": "Acme Power"}, {"id": "Charter", "name": "Charter"}]
+    leads = [
+        {"label": f"Lead {n + 1}", "owners": owners,
+         "locations": locations[start:start + LOCATIONS_PER_LEAD]}
+        for n, start in enumerate(range(0, len(locations), LOCATIONS_PER_LEAD))
+    ]
+    return {
+        "label": "Synthetic job",
+        "dateModified": 0,
+        "clientFile": "synthetic.client",
+        "clientData": {
+            "poles": [
+                {"species": species, "classOfPole": klass,
+                 "height": {"unit": "METRE", "value": height_ft * 0.3048},
+                 "aliases": [{"id": f"pole-alias-{n}"}]}
+                for n, (height_ft, klass, species) in enumerate(POLE_SPECS)
+            ],
+        },
+        "leads": leads,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Katapult side
+# ---------------------------------------------------------------------------
+
+class _KatapultBuilder:
+    """Accumulates nodes, connections and photos of the Katapult job."""
+
+    def __init__(self, cfg: SynthConfig, rnd: random.Random):
+        self.cfg = cfg
+        self.rnd = rnd
+        self.nodes: Dict[str, dict] = {}
+        self.connections: Dict[str, dict] = {}
+        self.photos: Dict[str, dict] = {}
+        # one photo per spec carries its birthmark, like a field crew's first photo
+        self.birthmark_ids = [f"bm-{n}" for n in range(len(POLE_SPECS))]
+        for bm_id, (height_ft, klass, species) in zip(self.birthmark_ids, POLE_SPECS):
+            self.photos[f"photo-{bm_id}"] = {"photofirst_data": {"birthmark": {
+                bm_id: {"height": height_ft, "class": klass, "species": species},
+            }}}
+
+    def pole(self, scid: str, pole_num: str, coord: tuple, spec_idx: int, charter: bool) -> str:
+        rnd, bloat = self.rnd, self.cfg.bloat
+        node_id = f"n{len(self.nodes):07d}"
+        attrs = {
+            "node_type": {"button_added": "pole"},
+            "scid": {"-Imported": scid},
+            "DLOC_number": {"-Imported": pole_num},
+            "latitude": {"-Imported": f"{coord[0]:.8f}"},
+            "longitude": {"-Imported": f"{coord[1]:.8f}"},
+            "existing_capacity_%": {"-Imported": f"{rnd.uniform(15, 95):.2f}"},
+            "final_passing_capacity_%": {"-Imported": f"{rnd.uniform(15, 99):.2f}"},
+        }
+        height_ft, klass, species = POLE_SPECS[spec_idx]
+        if rnd.random() < 0.5:
+            attrs["pole_spec"] = {"-Imported": f"{height_ft}'-{klass} {species}"}
+        else:
+            attrs["birthmark_id"] = {"-Imported": self.birthmark_ids[spec_idx]}
+        for n in range(bloat):
+            attrs[f"note_{n}"] = {"-Imported": "checked " * 8}
+        self.nodes[node_id] = {"attributes": attrs, "latitude": coord[0], "longitude": coord[1]}
+
+        for p in range(bloat):
+            self.photos[f"photo-{node_id}-{p}"] = {
+                "associated": {node_id: True},
+                "camera_heading": round(rnd.uniform(0, 360), 1),
+                "photofirst_data": {
+                    "wire": {f"w{w}": {"_measured_height": round(rnd.uniform(200, 450), 1),
+                                       "trace": f"trace-{w}"} for w in range(3)},
+                    "equipment": {"e0": {"equipment_type": "crossarm",
+                                         "_measured_height": round(rnd.uniform(300, 500), 1)}},
+                },
+            }
+        if charter:
+            self._service_location(node_id, coord)
+        return node_id
+
+    def _service_location(self, pole_id: str, coord: tuple) -> None:
+        node_id = f"n{len(self.nodes):07d}"
+        conn_id = f"c{len(self.connections):07d}"
+        section_id = f"s{len(self.connections):07d}"
+        house = _offset(coord, 25.0, self.rnd)
+        self.nodes[node_id] = {"attributes": {
+            "node_type": {"button_added": "Service Location"},
+            "node_sub_type": {"-Imported": "Charter"},
+            "measured_attachments": {section_id: False},
+            "latitude": {"-Imported": f"{house[0]:.8f}"},
+            "longitude": {"-Imported": f"{house[1]:.8f}"},
+        }}
+        self.connections[conn_id] = {
+            "node_id_1": node_id,
+            "node_id_2": pole_id,
+            "attributes": {"connection_type": {"button_added": "service drop"}},
+            "sections": {section_id: {"multi_attributes": {}, "latitude": house[0], "longitude": house[1]}},
+        }
+
+    def span(self, a: str, b: str) -> None:
+        conn_id = f"c{len(self.connections):07d}"
+        self.connections[conn_id] = {
+            "node_id_1": a,
+            "node_id_2": b,
+            "attributes": {"connection_type": {"button_added": "aerial cable"}},
+            "sections": {f"s{len(self.connections):07d}-{k}": {"multi_attributes": {}}
+                         for k in range(max(1, self.cfg.bloat))},
+        }
+
+    def document(self) -> dict:
+        return {
+            "name": "Synthetic job",
+            "nodes": self.nodes,
+            "connections": self.connections,
+            "photos": self.photos,
+            "traces": {"trace_data": {f"trace-{w}": {"company": "Acme Power"} for w in range(3)}},
+        }
+
+
+# ---------------------------------------------------------------------------
+# job pair
+# ---------------------------------------------------------------------------
+
+def make_job(cfg: SynthConfig = SynthConfig()) -> SynthJob:
+    """Generate one SPIDA / Katapult pair as parsed documents."""
+    rnd = random.Random(cfg.seed)
+    tiers = _plan_tiers(cfg, rnd)
+    extra = int(cfg.poles * cfg.katapult_only)
+    cols = max(1, math.ceil(math.sqrt(cfg.poles + extra)))
+    direct_max = min(cfg.jitter_m, 0.9)
+    verified = (1.1, max(cfg.jitter_m, 1.2))
+
+    kat = _KatapultBuilder(cfg, rnd)
+    locations = []
+    prev_node = None
+    for i, tier in enumerate(tiers):
+        coord = _grid_coord(i, cols)
+        spec_idx = rnd.randrange(len(POLE_SPECS))
+        charter = rnd.random() < cfg.charter_drop
+        locations.append(_spida_location(i, coord, spec_idx, charter, cfg, rnd))
+        if tier == "unmatched":
+            prev_node = None
+            continue
+
+        scid = str(_KAT_OTHER_SCID + i)
+        pole_num = str(_KAT_OTHER_POLE_NUM + i)
+        kat_spec = spec_idx
+        if tier == "scid":
+            scid = str(i + 1)
+            kat_coord = _offset(coord, rnd.uniform(0, cfg.jitter_m), rnd)
+        elif tier == "pole_num":
+            pole_num = str(_SPIDA_POLE_NUM + i + 1)
+            kat_coord = _offset(coord, rnd.uniform(0, cfg.jitter_m), rnd)
+        elif tier == "coord_direct":
+            kat_coord = _offset(coord, rnd.uniform(0, direct_max), rnd)
+            kat_spec = rnd.randrange(len(POLE_SPECS))   # spec is not checked under 1 m
+        else:
+            kat_coord = _offset(coord, rnd.uniform(*verified), rnd)
+        node = kat.pole(scid, pole_num, kat_coord, kat_spec, charter)
+        if prev_node is not None:
+            kat.span(prev_node, node)
+        prev_node = node
+
+    for j in range(extra):
+        i = cfg.poles + j
+        kat.pole(str(_KAT_OTHER_SCID + i), str(_KAT_OTHER_POLE_NUM + i), _grid_coord(i, cols),
+                 rnd.randrange(len(POLE_SPECS)), False)
+
+    return SynthJob(_spida_document(locations), kat.document(), tuple(tiers))
+
+
+def write_job(job: SynthJob, out_dir: Path | str, name: str = "synthetic") -> Tuple[Path, Path]:
+    """Write *job* as ``<name>_spida.json`` / ``<name>_katapult.json`` (batch-mode naming)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = out_dir / f"{name}_spida.json", out_dir / f"{name}_katapult.json"
+    for path, doc in zip(paths, (job.spida, job.katapult)):
+        json_codec.dump_path(doc, path)
+    return paths
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("out_dir", type=Path)
+    ap.add_argument("--poles", type=int, default=1000, help="SPIDA poles (default 1000)")
+    ap.add_argument("--mix", nargs="+", metavar="TIER=SHARE", help="tier shares, e.g. scid=.8 unmatched=.2")
+    ap.add_argument("--jitter-m", type=float, default=4.0, help="max coordinate-tier offset in metres")
+    ap.add_argument("--katapult-only", type=float, default=0.02, help="extra Katapult poles, share of --poles")
+    ap.add_argument("--bloat", type=int, default=1, help="filler per pole, 0 = lean documents")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--name", default="synthetic", help="file name prefix")
+    args = ap.parse_args(argv)
+
+    cfg = SynthConfig(poles=args.poles, mix=parse_mix(args.mix) if args.mix else DEFAULT_MIX,
+                      jitter_m=args.jitter_m, katapult_only=args.katapult_only,
+                      bloat=args.bloat, seed=args.seed)
+    job = make_job(cfg)
+    for path in write_job(job, args.out_dir, args.name):
+        print(f"{path}  {path.stat().st_size / 1e6:.1f} MB")
+    print("expected tiers: " + ", ".join(f"{t} {n}" for t, n in job.expected_stats().items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,14 +7,35 @@ Returns a Pandas DataFrame with:
 """
 
 from __future__ import annotations
-import json
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import functools
+from math import cos, floor, radians
+import multiprocessing
+import os
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+import sys
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+try:
+    from . import assignment as _assignment
+    from . import geodist
+    from . import json_codec
+    from . import kat_stream
+except ImportError:
+    import assignment as _assignment
+    import geodist
+    import json_codec
+    import kat_stream
+
 Coord = Tuple[float, float]              # (lat, lon) helper alias
-EARTH_R = 6371000                        # metres – for overlap test
+EARTH_R = geodist.EARTH_R                # metres – for overlap test
 
 # ---------------------------------------------------------------------------
 # helpers
@@ -200,14 +221,8 @@ def _coords_from_kat_node(node: dict) -> Optional[Coord]:
     except (ValueError, TypeError):
         return None
 
-def _haversine_m(p1: Coord, p2: Coord) -> float:
-    """Calculate distance between two coordinates in meters using Haversine formula."""
-    from math import radians, sin, cos, sqrt, atan2
-    lat1, lon1 = map(radians, p1)
-    lat2, lon2 = map(radians, p2)
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1)*cos(lat2)*sin(dlon/2)**2
-    return 2 * EARTH_R * atan2(sqrt(a), sqrt(1-a))
+# Scalar distance in metres; batch versions live in geodist
+_haversine_m = geodist.haversine_m
 
 # ---------------------------------------------------------------------------
 # added helper
@@ -224,27 +239,163 @@ def _digits_only(txt: str | None) -> str | None:
 # helpers for spatial fallback matching
 # ---------------------------------------------------------------------------
 
-from math import inf  # added for _nearest_scid
+class _CoordGrid:
+    """Uniform grid over pole records' ``coord`` for radius queries.
 
+    Coordinates are projected equirectangularly (metres, scaled by the cosine
+    of the job's mean latitude) and bucketed into square cells of *cell_m*.
+    A query only visits the cells its radius can reach and confirms every hit
+    with the exact haversine distance, so results match a full linear scan.
+    """
 
-def _nearest_scid(sp_coord: Coord | None, kat_dict: Dict[str, dict], max_dist_m: float = 5.0) -> Optional[str]:
+    def __init__(self, kat_rows_by_scid: Mapping[Any, Any], cell_m: float = 5.0):
+        self.cell_m = cell_m
+        # Each row sits under its SCID *and* its digits-only key – index it once.
+        entries: List[tuple[int, str, dict, Coord]] = []
+        seen: set[int] = set()
+        for k_scid, row in kat_rows_by_scid.items():
+            k_coord: Coord | None = row.coord
+            if not k_coord or id(row) in seen:
+                continue
+            seen.add(id(row))
+            entries.append((len(entries), k_scid, row, k_coord))
+
+        self._size = len(entries)
+        self._lat_ref = (
+            sum(c[0] for _, _, _, c in entries) / len(entries) if entries else 0.0
+        )
+        self._cos_ref = cos(radians(self._lat_ref))
+        self._cells: Dict[tuple[int, int], List[tuple[int, str, dict, Coord]]] = {}
+        for entry in entries:
+            self._cells.setdefault(self._cell_of(entry[3]), []).append(entry)
+
+        # Array form of the same grid for query_many(): entries sorted by a
+        # packed cell key, insertion order kept within a cell.
+        self._entries = entries
+        self._coords = np.array([e[3] for e in entries], dtype=np.float64).reshape(-1, 2)
+        keys = np.array(
+            [_pack_cell(*self._cell_of(e[3])) for e in entries], dtype=np.int64
+        )
+        order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[order]
+        self._sorted_pos = order
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _project(self, coord: Coord) -> tuple[float, float]:
+        lat, lon = coord
+        return EARTH_R * radians(lon) * self._cos_ref, EARTH_R * radians(lat)
+
+    def _cell_of(self, coord: Coord) -> tuple[int, int]:
+        x, y = self._project(coord)
+        return floor(x / self.cell_m), floor(y / self.cell_m)
+
+    def query(self, coord: Coord, max_dist_m: float) -> list[tuple[str, dict, float]]:
+        """Return ``(scid, row, distance)`` for rows within *max_dist_m*, nearest first.
+
+        Ties keep the order rows were inserted in, like the sorted linear scan.
+        """
+        if not self._cells:
+            return []
+        x, y = self._project(coord)
+        # Longitude degrees shrink towards the poles: widen the x reach by the
+        # worst-case cosine inside the search radius (plus 1% slack).
+        dlat = max_dist_m / EARTH_R
+        lat_far = min(abs(radians(coord[0])) + dlat, radians(89.9))
+        reach_x = max_dist_m * 1.01 * self._cos_ref / max(cos(lat_far), 1e-6)
+        reach_y = max_dist_m * 1.01
+
+        hits = []
+        for ix in range(floor((x - reach_x) / self.cell_m), floor((x + reach_x) / self.cell_m) + 1):
+            for iy in range(floor((y - reach_y) / self.cell_m), floor((y + reach_y) / self.cell_m) + 1):
+                for order, k_scid, row, k_coord in self._cells.get((ix, iy), ()):
+                    dist = _haversine_m(coord, k_coord)
+                    if dist <= max_dist_m:
+                        hits.append((dist, order, k_scid, row))
+        hits.sort(key=lambda h: (h[0], h[1]))
+        return [(k_scid, row, dist) for dist, _, k_scid, row in hits]
+
+    def query_many(self, coords: List[Coord], max_dist_m: float) -> List[list[tuple[str, dict, float]]]:
+        """:meth:`query` for many coordinates at once, vectorised with NumPy.
+
+        Candidate cells of every query are looked up with one ``searchsorted``
+        and all candidate distances come from a single
+        :func:`geodist.haversine_pairs` call.
+        """
+        out: List[list] = [[] for _ in coords]
+        if not coords or not self._size:
+            return out
+        q = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        lat_r = np.radians(q[:, 0])
+        x = EARTH_R * np.radians(q[:, 1]) * self._cos_ref
+        y = EARTH_R * lat_r
+        # same reach as query(), see there
+        lat_far = np.minimum(np.abs(lat_r) + max_dist_m / EARTH_R, radians(89.9))
+        reach_x = max_dist_m * 1.01 * self._cos_ref / np.maximum(np.cos(lat_far), 1e-6)
+        reach_y = max_dist_m * 1.01
+        ix_lo = np.floor((x - reach_x) / self.cell_m).astype(np.int64)
+        ix_n = np.floor((x + reach_x) / self.cell_m).astype(np.int64) - ix_lo + 1
+        iy_lo = np.floor((y - reach_y) / self.cell_m).astype(np.int64)
+        iy_n = np.floor((y + reach_y) / self.cell_m).astype(np.int64) - iy_lo + 1
+
+        # Every query scans a (span_x × span_y) window; cap the cells per chunk
+        span_x, span_y = int(ix_n.max()), int(iy_n.max())
+        ox, oy = np.meshgrid(np.arange(span_x), np.arange(span_y), indexing="ij")
+        ox, oy = ox.ravel(), oy.ravel()
+        step = max(1, _QUERY_CELLS // len(ox))
+        for start in range(0, len(q), step):
+            sl = slice(start, start + step)
+            inside = (ox < ix_n[sl, None]) & (oy < iy_n[sl, None])
+            qidx, cell = np.nonzero(inside)
+            keys = _pack_cell(ix_lo[sl][qidx] + ox[cell], iy_lo[sl][qidx] + oy[cell])
+            lo = np.searchsorted(self._sorted_keys, keys, side="left")
+            counts = np.searchsorted(self._sorted_keys, keys, side="right") - lo
+            if not counts.any():
+                continue
+            # expand each [lo, lo + count) run into explicit candidate slots
+            qidx = np.repeat(qidx + start, counts)
+            slots = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            pos = self._sorted_pos[slots]
+
+            dist = geodist.haversine_pairs(q[qidx], self._coords[pos])
+            keep = dist <= max_dist_m
+            qidx, pos, dist = qidx[keep], pos[keep], dist[keep]
+            order = np.lexsort((pos, dist, qidx))
+            entries = self._entries
+            for qi, p, d in zip(qidx[order].tolist(), pos[order].tolist(), dist[order].tolist()):
+                entry = entries[p]
+                out[qi].append((entry[1], entry[2], d))
+        return out
+
+
+# Upper bound on (query, cell) pairs _CoordGrid.query_many() expands at once
+_QUERY_CELLS = 1 << 18
+
+
+def _pack_cell(ix, iy):
+    """Single int64 key for grid cell ``(ix, iy)`` (scalars or arrays); sorts like the tuple."""
+    return ix * (1 << 32) + iy
+
+
+def _nearest_scid(
+    sp_coord: Coord | None,
+    kat_dict: Dict[str, dict],
+    max_dist_m: float = 5.0,
+    grid: _CoordGrid | None = None,
+) -> Optional[str]:
     """Return the Katapult SCID whose coordinate lies within *max_dist_m* metres of
-    *sp_coord* – or *None* if no candidate is close enough.*"""
+    *sp_coord* – or *None* if no candidate is close enough.*
+
+    Pass a prebuilt *grid* to avoid re-indexing *kat_dict* on every call."""
     if not sp_coord:
         return None
 
-    nearest: Optional[str] = None
-    best = max_dist_m  # keep *strictly* best so first within radius wins
-
-    for k_scid, row in kat_dict.items():
-        k_coord: Coord | None = row.get("Katapult Coord")
-        if not k_coord:
-            continue
-        dist = _haversine_m(sp_coord, k_coord)
-        if dist < best:
-            best = dist
-            nearest = k_scid
-    return nearest
+    grid = grid if grid is not None else _CoordGrid(kat_dict)
+    for k_scid, _row, dist in grid.query(sp_coord, max_dist_m):
+        if dist < max_dist_m:  # *strictly* inside; first (nearest) wins
+            return k_scid
+    return None
 
 # ---------------------------------------------------------------------------
 # advanced pole normalization and matching helpers
@@ -339,13 +490,13 @@ def _build_lookup_tables(kat_rows_by_scid: dict) -> tuple[dict, dict, dict]:
             scid_lookup[clean_scid] = row_data
         
         # Pole number lookup (normalized)
-        pole_num = row_data.get("Katapult Pole #")
+        pole_num = row_data.pole_num
         norm_pole = _normalize_pole_num(pole_num)
         if norm_pole:
             pole_num_lookup[norm_pole] = row_data
         
         # Coordinate lookup (for spatial queries)
-        coord = row_data.get("Katapult Coord")
+        coord = row_data.coord
         if coord:
             # Round to 6 decimal places for lookup key (~0.1m precision)
             coord_key = (round(coord[0], 6), round(coord[1], 6))
@@ -353,34 +504,104 @@ def _build_lookup_tables(kat_rows_by_scid: dict) -> tuple[dict, dict, dict]:
     
     return scid_lookup, pole_num_lookup, coord_lookup
 
-def _find_closest_poles(sp_coord: Coord | None, kat_rows_by_scid: dict, max_dist_m: float = 5.0) -> list[tuple[str, dict, float]]:
-    """Find all Katapult poles within max_dist_m, sorted by distance."""
+def _find_closest_poles(
+    sp_coord: Coord | None,
+    kat_rows_by_scid: dict,
+    max_dist_m: float = 5.0,
+    grid: _CoordGrid | None = None,
+) -> list[tuple[str, dict, float]]:
+    """Find all Katapult poles within max_dist_m, sorted by distance.
+
+    Pass a prebuilt *grid* (built once per run) to turn this into a radius
+    query instead of a scan over every Katapult pole.
+    """
     if not sp_coord:
         return []
-    
-    candidates = []
-    for k_scid, row in kat_rows_by_scid.items():
-        k_coord = row.get("Katapult Coord")
-        if k_coord:
-            dist = _haversine_m(sp_coord, k_coord)
-            if dist <= max_dist_m:
-                candidates.append((k_scid, row, dist))
-    
-    # Sort by distance
-    return sorted(candidates, key=lambda x: x[2])
+
+    grid = grid if grid is not None else _CoordGrid(kat_rows_by_scid)
+    return grid.query(sp_coord, max_dist_m)
 
 # ---------------------------------------------------------------------------
 # main compare with tiered matching
 # ---------------------------------------------------------------------------
-def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
-    """Return DataFrame with merged comparison."""
-    spida_path = Path(spida_path)
-    kat_path = Path(kat_path)
+JsonSource = Union[Path, str, dict]     # file path *or* an already-parsed document
+
+# Stages reported through compare(progress=...), in execution order
+COMPARE_STAGES: Tuple[str, ...] = (
+    "load_spida",
+    "load_katapult",
+    "build_tables",
+    "tier_matching",
+    "build_frame",
+)
+
+
+# How the coordinate tiers pick a Katapult pole, see match()
+ASSIGNMENT_MODES: Tuple[str, ...] = ("greedy", "optimal")
+
+# Extra cost (metres) of a < 1 m pairing whose specs disagree, "optimal" mode
+SPEC_MISMATCH_PENALTY_M = 1.0
+
 
-    # ---------------- load SPIDA ----------------
-    with spida_path.open("r", encoding="utf-8") as f:
-        spida = json.load(f)
+class CompareCancelled(Exception):
+    """Raised inside compare() / ComparePipeline.run() when *cancel* has been set."""
 
+
+def _load_json(src: JsonSource) -> dict:
+    """Return the parsed document for *src*.
+
+    Dicts are passed through untouched so callers that already decoded a file
+    (e.g. the GUI at load time) don't pay for parsing it a second time.
+    """
+    if isinstance(src, dict):
+        return src
+    return json_codec.load_path(src)
+
+# ---------------------------------------------------------------------------
+# pole records
+# ---------------------------------------------------------------------------
+
+class SpidaPole(NamedTuple):
+    """One SPIDA location as read by the comparison."""
+    scid: str
+    pole_num: Optional[str]
+    spec: str
+    existing: Optional[str]      # loading %, formatted by _fmt_pct
+    final: Optional[str]
+    charter_drop: bool
+    coord: Optional[Coord]
+
+
+class KatapultPole(NamedTuple):
+    """One Katapult pole node as read by the comparison."""
+    scid: str
+    pole_num: Optional[str]
+    spec: Optional[str]
+    existing: Optional[str]
+    final: Optional[str]
+    com_drop: bool               # any service location / service drop on the pole
+    coord: Optional[Coord]
+
+
+# Frame columns filled from each record, in field order
+SPIDA_COLUMNS: Tuple[str, ...] = (
+    "SCID", "SPIDA Pole #", "SPIDA Spec", "SPIDA Existing %", "SPIDA Final %",
+    "SPIDA Charter Drop", "SPIDA Coord",
+)
+KATAPULT_COLUMNS: Tuple[str, ...] = (
+    "Katapult SCID #", "Katapult Pole #", "Katapult Spec", "Katapult Existing %",
+    "Katapult Final %", "Katapult Charter Drop", "Katapult Coord",
+)
+
+# ---------------------------------------------------------------------------
+# extraction – parsed documents → row tables (cacheable)
+# ---------------------------------------------------------------------------
+
+def _extract_spida(spida: dict) -> dict:
+    """Extract one row per SPIDA location from a parsed SPIDA document.
+
+    Returns ``{"sp_rows": [SpidaPole, ...], "sp_charter_scids": {...}}``.
+    """
     # Quick sanity-check: verify Charter attachments are found
     owners = _owners_table(spida)
     test_hits = [
@@ -436,7 +657,7 @@ def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
     print(f"📋 Built alias table with {len(alias_table)} pole specifications")
 
     # ---------------- process SPIDA locations ----------------
-    sp_rows: List[dict] = []
+    sp_rows: List[SpidaPole] = []
     scid_counter = 0
     sp_charter_scids: set[str] = set()
 
@@ -480,25 +701,208 @@ def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
             # Extract coordinates
             coord = _coords_from_spida_location(loc)
 
-            sp_rows.append(
-                {
-                    "SCID": scid,
-                    "SPIDA Pole #": pole_num,
-                    "SPIDA Spec": sp_spec,
-                    "SPIDA Existing %": sp_exist,
-                    "SPIDA Final %": sp_final,
-                    "SPIDA Charter Drop": charter,
-                    "SPIDA Coord": coord
-                }
-            )
+            sp_rows.append(SpidaPole(scid, pole_num, sp_spec, sp_exist, sp_final, charter, coord))
 
-    # ---------------- load Katapult ----------------
-    with kat_path.open("r", encoding="utf-8") as f:
-        kat = json.load(f)
+    return {"sp_rows": sp_rows, "sp_charter_scids": sp_charter_scids}
 
-    # Collect all birthmarks from the JSON
-    birthmarks = {}
-    _collect_birthmarks(kat, birthmarks)
+
+# Node types we accept as actual poles
+ALLOWED_NODE_TYPES: FrozenSet[str] = frozenset({"pole", "Power", "Power Transformer", "Joint", "Joint Transformer"})
+
+
+def _birthmark_ref(attrs: dict) -> Any | None:
+    """First value of an attribute whose name mentions birthmark/spec."""
+    for key in attrs.keys():
+        if 'birthmark' in key.lower() or 'spec' in key.lower():
+            # Use _get_imported_val to handle Katapult's nested attribute structure
+            ref = _get_imported_val(attrs.get(key))
+            if ref:
+                return ref
+    return None
+
+
+def _katapult_pole(node: dict, birthmarks: Dict[str, dict], kat_com_drop_scids: set) -> Optional[KatapultPole]:
+    """Pole record for one Katapult node, or None when it isn't a pole with a SCID.
+
+    Depends only on the node itself, the birthmark index and the com-drop
+    SCIDs, so nodes can be processed in any order or in worker processes.
+    """
+    attrs = node["attributes"]
+    scid_raw = _first_val(attrs.get("scid"))
+    scid = scid_raw if scid_raw and scid_raw.isdigit() else None
+
+    # Skip anything that isn't one of our allowed pole-type nodes
+    node_type_attr = attrs.get("node_type")
+    if isinstance(node_type_attr, dict):
+        node_type_val = node_type_attr.get("button_added") or _first_val(node_type_attr)
+    else:
+        node_type_val = node_type_attr
+    if node_type_val and str(node_type_val) not in ALLOWED_NODE_TYPES:
+        return None
+
+    # collect main pole data
+    if not scid:
+        return None
+
+    # Extract pole number using correct Katapult field names
+    # Primary field: DLOC_number
+    dloc_data = attrs.get('DLOC_number', {})
+    dloc_number = _first_val(dloc_data) if dloc_data else None
+    pole_num = None
+    if dloc_number and dloc_number != 'N/A':
+        # Check if it already starts with PL to avoid double prefix
+        pole_num = dloc_number if str(dloc_number).startswith('PL') else f"PL{dloc_number}"
+
+    # Fallback: pole_tag.tagtext  
+    if not pole_num:
+        pole_tag_data = attrs.get('pole_tag', {})
+        pole_tag_inner = _first_val(pole_tag_data) if pole_tag_data else {}
+        if isinstance(pole_tag_inner, dict):
+            tagtext = pole_tag_inner.get('tagtext')
+            if tagtext and tagtext != 'N/A':
+                # Check if it already starts with PL to avoid double prefix
+                pole_num = tagtext if str(tagtext).startswith('PL') else f"PL{tagtext}"
+
+    # Extract pole spec from attributes - try direct pole_spec first
+    kat_spec = None
+
+    # ⬇️ NEW: Direct check for pole_spec before birthmark logic
+    spec_raw = _get_imported_val(attrs.get("pole_spec"))
+    if spec_raw:              # already a finished spec like "45-3 Southern Pine"
+        kat_spec = str(spec_raw)
+    else:
+        # ⬇️ EXISTING: Look for birthmark reference in node attributes
+        birthmark_ref = _birthmark_ref(attrs)
+
+        if birthmark_ref and isinstance(birthmark_ref, str) and birthmark_ref in birthmarks:
+            spec_data = birthmarks[birthmark_ref]
+            height = spec_data.get('height')
+            klass = spec_data.get('class')
+            species = spec_data.get('species')
+            if height and klass and species:
+                kat_spec = f"{height}'-{klass} {species}"
+
+        # Fallback to old method if birthmark not found
+        if not kat_spec:
+            height_raw = _first_val(attrs.get("pole_height")) or _first_val(attrs.get("poleLength")) or _first_val(attrs.get("Height"))
+            klass      = _first_val(attrs.get("pole_class")) or _first_val(attrs.get("Class"))
+            species    = _first_val(attrs.get("pole_species")) or _first_val(attrs.get("Species"))
+            feet = _to_feet(height_raw)
+            kat_spec = f"{feet}'-{klass} {species}" if all([feet, klass, species]) else None
+
+    ex_pct = _first_val(attrs.get("existing_capacity_%"))
+    fi_pct = _first_val(attrs.get("final_passing_capacity_%"))
+
+    # Extract coordinates
+    coord = _coords_from_kat_node(node)
+
+    # Build row once so we can map it by multiple keys (SCID and digits-only).
+    # com_drop is True if ANY service location exists on the pole
+    row_data = KatapultPole(
+        scid, pole_num, kat_spec, _fmt_pct(ex_pct), _fmt_pct(fi_pct),
+        scid in kat_com_drop_scids, coord,
+    )
+    return row_data
+
+
+# Katapult jobs smaller than this are always extracted in-process
+PARALLEL_MIN_NODES = 5000
+
+# (nodes, birthmarks, com-drop SCIDs) seen by extraction workers: inherited
+# when forked, filled in by _init_pole_worker otherwise
+_POLE_WORKER_STATE: Optional[tuple] = None
+
+
+def default_extract_workers() -> Optional[int]:
+    """``$QUIC_EXTRACT_WORKERS`` as a worker count, else None (extract in-process)."""
+    env = os.environ.get("QUIC_EXTRACT_WORKERS", "").strip()
+    if not env:
+        return None
+    try:
+        workers = int(env)
+    except ValueError:
+        print(f"⚠️  Ignoring QUIC_EXTRACT_WORKERS={env!r} – expected a number")
+        return None
+    return workers if workers > 1 else None
+
+
+def _init_pole_worker(birthmarks: Dict[str, dict], kat_com_drop_scids: set) -> None:
+    global _POLE_WORKER_STATE
+    _POLE_WORKER_STATE = (None, birthmarks, kat_com_drop_scids)
+
+
+def _extract_pole_chunk(task) -> List[Optional[tuple]]:
+    """Worker side of :func:`_extract_poles_parallel`.
+
+    *task* is a ``(start, stop)`` slice of the inherited node list, or the
+    nodes themselves when they had to be shipped. Records travel back as
+    plain tuples.
+    """
+    nodes, birthmarks, kat_com_drop_scids = _POLE_WORKER_STATE
+    if isinstance(task, tuple):
+        task = nodes[task[0]:task[1]]
+    out = []
+    for node in task:
+        row = _katapult_pole(node, birthmarks, kat_com_drop_scids)
+        out.append(None if row is None else tuple(row))
+    return out
+
+
+def _extract_poles_parallel(nodes: List[dict], birthmarks: Dict[str, dict],
+                            kat_com_drop_scids: set, workers: int) -> List[Optional[KatapultPole]]:
+    """:func:`_katapult_pole` for every node across *workers* processes, in node order.
+
+    Where ``fork`` is available (Linux) and this is the only thread, the
+    workers inherit the parsed job and only receive index ranges. Forking
+    while other threads run (the GUI's Tk, tile and worker threads) can
+    deadlock a child on a lock one of them held, so then – and on other
+    platforms – the workers are started with ``forkserver`` or ``spawn``
+    and each chunk of nodes is pickled to its worker once. Any pool failure
+    falls back to in-process extraction.
+    """
+    global _POLE_WORKER_STATE
+    chunk = -(-len(nodes) // (workers * 4))          # a few chunks per worker
+    bounds = [(i, min(i + chunk, len(nodes))) for i in range(0, len(nodes), chunk)]
+    methods = multiprocessing.get_all_start_methods()
+    forked = sys.platform.startswith("linux") and "fork" in methods and threading.active_count() == 1
+    try:
+        if forked:
+            _POLE_WORKER_STATE = (nodes, birthmarks, kat_com_drop_scids)
+            pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+            tasks = bounds
+        else:
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            pool = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_pole_worker,
+                                       initargs=(birthmarks, kat_com_drop_scids))
+            tasks = [nodes[a:b] for a, b in bounds]
+        with pool:
+            parts = list(pool.map(_extract_pole_chunk, tasks))
+    except (OSError, BrokenProcessPool) as e:
+        print(f"⚠️  Parallel Katapult extraction failed ({e}); extracting in-process")
+        return [_katapult_pole(node, birthmarks, kat_com_drop_scids) for node in nodes]
+    finally:
+        _POLE_WORKER_STATE = None
+
+    make = KatapultPole._make
+    return [None if row is None else make(row) for part in parts for row in part]
+
+
+def _extract_katapult(kat: dict, workers: Optional[int] = None) -> dict:
+    """Extract the pole rows and service-drop sets from a Katapult job.
+
+    With *workers* > 1 and at least :data:`PARALLEL_MIN_NODES` nodes, the
+    per-node pass runs in a process pool (:func:`_extract_poles_parallel`);
+    the tables are the same either way.
+
+    Returns a dict with
+
+    * ``kat_rows_by_scid`` – :class:`KatapultPole` per SCID, also under its
+      digits-only key (both keys share the same record)
+    * ``kat_scids`` – the official SCIDs, once each, in node order
+    * ``kat_charter_scids`` / ``kat_com_drop_scids`` – service-drop SCIDs
+    """
+    # Birthmark index from the known locations (full scan only as fallback)
+    birthmarks = _index_birthmarks(kat)
 
     connections = kat.get("connections", {})
     section_to_conn: Dict[str, dict] = {}
@@ -506,8 +910,8 @@ def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
         for sid in conn.get("sections", {}):
             section_to_conn[sid] = conn
 
-    kat_rows_by_scid: Dict[str, dict] = {}
-    kat_scid_set: set[str] = set()
+    kat_rows_by_scid: Dict[str, KatapultPole] = {}
+    kat_scids: Dict[str, None] = {}  # ordered set – keeps Katapult-only rows deterministic
     kat_charter_scids: set[str] = set()
     kat_com_drop_scids: set[str] = set()  # Track poles with ANY service locations
 
@@ -555,95 +959,15 @@ def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
                     kat_com_drop_scids.add(pole_scid)
 
     # Second pass: Process main pole data
-    # (constant set of node types we accept as actual poles)
-    ALLOWED_NODE_TYPES: set[str] = {"pole", "Power", "Power Transformer", "Joint", "Joint Transformer"}
-    for node_id, node in kat["nodes"].items():
-        attrs = node["attributes"]
-        scid_raw = _first_val(attrs.get("scid"))
-        scid = scid_raw if scid_raw and scid_raw.isdigit() else None
-
-        # Skip anything that isn't one of our allowed pole-type nodes
-        node_type_attr = attrs.get("node_type")
-        if isinstance(node_type_attr, dict):
-            node_type_val = node_type_attr.get("button_added") or _first_val(node_type_attr)
-        else:
-            node_type_val = node_type_attr
-        if node_type_val and str(node_type_val) not in ALLOWED_NODE_TYPES:
-            continue
-
-        # collect main pole data
-        if not scid:
+    nodes = list(kat["nodes"].values())
+    if workers and workers > 1 and len(nodes) >= PARALLEL_MIN_NODES:
+        poles = _extract_poles_parallel(nodes, birthmarks, kat_com_drop_scids, workers)
+    else:
+        poles = [_katapult_pole(node, birthmarks, kat_com_drop_scids) for node in nodes]
+    for row_data in poles:
+        if row_data is None:
             continue
-
-        # Extract pole number using correct Katapult field names
-        # Primary field: DLOC_number
-        dloc_data = attrs.get('DLOC_number', {})
-        dloc_number = _first_val(dloc_data) if dloc_data else None
-        pole_num = None
-        if dloc_number and dloc_number != 'N/A':
-            # Check if it already starts with PL to avoid double prefix
-            pole_num = dloc_number if str(dloc_number).startswith('PL') else f"PL{dloc_number}"
-        
-        # Fallback: pole_tag.tagtext  
-        if not pole_num:
-            pole_tag_data = attrs.get('pole_tag', {})
-            pole_tag_inner = _first_val(pole_tag_data) if pole_tag_data else {}
-            if isinstance(pole_tag_inner, dict):
-                tagtext = pole_tag_inner.get('tagtext')
-                if tagtext and tagtext != 'N/A':
-                    # Check if it already starts with PL to avoid double prefix
-                    pole_num = tagtext if str(tagtext).startswith('PL') else f"PL{tagtext}"
-        
-        # Extract pole spec from attributes - try direct pole_spec first
-        kat_spec = None
-        
-        # ⬇️ NEW: Direct check for pole_spec before birthmark logic
-        spec_raw = _get_imported_val(attrs.get("pole_spec"))
-        if spec_raw:              # already a finished spec like "45-3 Southern Pine"
-            kat_spec = str(spec_raw)
-        else:
-            # ⬇️ EXISTING: Look for birthmark reference in node attributes
-            birthmark_ref = None
-            for key in attrs.keys():
-                if 'birthmark' in key.lower() or 'spec' in key.lower():
-                    # Use _get_imported_val to handle Katapult's nested attribute structure
-                    birthmark_ref = _get_imported_val(attrs.get(key))
-                    if birthmark_ref:
-                        break
-            
-            if birthmark_ref and isinstance(birthmark_ref, str) and birthmark_ref in birthmarks:
-                spec_data = birthmarks[birthmark_ref]
-                height = spec_data.get('height')
-                klass = spec_data.get('class')
-                species = spec_data.get('species')
-                if height and klass and species:
-                    kat_spec = f"{height}'-{klass} {species}"
-            
-            # Fallback to old method if birthmark not found
-            if not kat_spec:
-                height_raw = _first_val(attrs.get("pole_height")) or _first_val(attrs.get("poleLength")) or _first_val(attrs.get("Height"))
-                klass      = _first_val(attrs.get("pole_class")) or _first_val(attrs.get("Class"))
-                species    = _first_val(attrs.get("pole_species")) or _first_val(attrs.get("Species"))
-                feet = _to_feet(height_raw)
-                kat_spec = f"{feet}'-{klass} {species}" if all([feet, klass, species]) else None
-
-        ex_pct = _first_val(attrs.get("existing_capacity_%"))
-        fi_pct = _first_val(attrs.get("final_passing_capacity_%"))
-
-        # Extract coordinates
-        coord = _coords_from_kat_node(node)
-
-        # Build row once so we can map it by multiple keys (SCID and digits-only).
-        row_data = {
-            "Katapult SCID #": scid,  # expose raw Katapult SCID as optional visible column
-            "Katapult Pole #": pole_num,
-            "Katapult Spec": kat_spec,
-            "Katapult Existing %": _fmt_pct(ex_pct),
-            "Katapult Final %": _fmt_pct(fi_pct),
-            "Katapult Charter Drop": scid in kat_com_drop_scids,  # True if ANY service location exists
-            "Com Drop?": "Yes" if scid in kat_com_drop_scids else "No",
-            "Katapult Coord": coord
-        }
+        scid = row_data.scid
 
         # primary mapping by SCID
         kat_rows_by_scid[scid] = row_data
@@ -653,185 +977,304 @@ def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
             kat_rows_by_scid[digits_key] = row_data
 
         # Track the official SCID once (avoid dup keys from digits mapping)
-        kat_scid_set.add(scid)
+        kat_scids[scid] = None
 
-    # ---------------- build optimized lookup tables ----------------
-    scid_lookup, pole_num_lookup, coord_lookup = _build_lookup_tables(kat_rows_by_scid)
+    return {
+        "kat_rows_by_scid": kat_rows_by_scid,
+        "kat_scids": list(kat_scids),
+        "kat_charter_scids": kat_charter_scids,
+        "kat_com_drop_scids": kat_com_drop_scids,
+    }
+
+
+def _load_tables(src: JsonSource, kind: str, load: Callable[[JsonSource], dict],
+                 extract: Callable[[dict], dict], cache=None) -> dict:
+    """Extracted tables for *src*, served from *cache* when possible.
+
+    Only path sources are cached – an already-parsed document has no file
+    to key the entry on. On a cache hit the file is not parsed at all.
+    """
+    if cache is None or isinstance(src, dict):
+        return extract(load(src))
+    tables = cache.get(src, kind)
+    if tables is not None:
+        return _records_from_plain(tables)
+    tables = extract(load(src))
+    cache.put(src, kind, _records_to_plain(tables))
+    return tables
+
+
+# Table entries holding records; the cache stores them as plain tuples so
+# entries don't depend on the import path of this module.
+_RECORD_TABLES = {"sp_rows": SpidaPole, "kat_rows_by_scid": KatapultPole}
+
+
+def _records_to_plain(tables: dict) -> dict:
+    out = dict(tables)
+    for key in _RECORD_TABLES.keys() & out.keys():
+        rows = out[key]
+        if isinstance(rows, dict):
+            plain: Dict[int, tuple] = {}  # keeps rows shared between keys shared
+            out[key] = {k: plain.setdefault(id(r), tuple(r)) for k, r in rows.items()}
+        else:
+            out[key] = [tuple(r) for r in rows]
+    return out
+
+
+def _records_from_plain(tables: dict) -> dict:
+    out = dict(tables)
+    for key in _RECORD_TABLES.keys() & out.keys():
+        make = _RECORD_TABLES[key]._make
+        rows = out[key]
+        if isinstance(rows, dict):
+            made: Dict[int, tuple] = {}
+            out[key] = {k: made.setdefault(id(r), make(r)) for k, r in rows.items()}
+        else:
+            out[key] = [make(r) for r in rows]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# staged API – each stage returns an immutable object the next one consumes
+# ---------------------------------------------------------------------------
+
+class SpidaTables(NamedTuple):
+    """Stage 1 – one row per SPIDA location, in document order."""
+    rows: Tuple[SpidaPole, ...]
+    charter_scids: FrozenSet[str]
+
+
+class KatapultTables(NamedTuple):
+    """Stage 1 – Katapult pole rows and service-drop SCID sets.
+
+    ``rows_by_scid`` holds each row under its SCID and its digits-only key;
+    ``scids`` lists the official SCIDs once each, in node order.
+    """
+    rows_by_scid: Mapping[str, KatapultPole]
+    scids: Tuple[str, ...]
+    charter_scids: FrozenSet[str]
+    com_drop_scids: FrozenSet[str]
+
+
+class KatapultIndexes(NamedTuple):
+    """Stage 2 – lookup tables and spatial grid over one :class:`KatapultTables`."""
+    katapult: KatapultTables
+    scid_lookup: Mapping[str, KatapultPole]
+    pole_num_lookup: Mapping[str, KatapultPole]
+    coord_lookup: Mapping[Coord, KatapultPole]
+    grid: _CoordGrid
+
+
+class SpidaIndexes(NamedTuple):
+    """SPIDA rows by match key – lets :func:`rematch` find the poles a Katapult change reaches."""
+    spida: SpidaTables
+    by_scid_key: Mapping[str, Tuple[int, ...]]
+    by_pole_key: Mapping[str, Tuple[int, ...]]
+    grid: _CoordGrid   # over SPIDA coordinates, keyed by row position
+
+
+class PoleMatch(NamedTuple):
+    """Outcome of tier matching for one SPIDA row."""
+    row: Optional[KatapultPole]  # None when unmatched
+    tier: str
+    distance: Optional[float]    # metres, coordinate tiers only
+
+
+class MatchResult(NamedTuple):
+    """Stage 3 – one :class:`PoleMatch` per SPIDA row plus tier counts.
+
+    ``rematched`` is None for a full match, or the SPIDA row positions
+    :func:`rematch` re-ran. ``assignment`` is the coordinate-tier mode.
+    """
+    spida: SpidaTables
+    katapult: KatapultTables
+    matches: Tuple[PoleMatch, ...]
+    stats: Mapping[str, int]
+    max_dist_m: float
+    rematched: Optional[FrozenSet[int]] = None
+    assignment: str = "greedy"
+
+
+def extract_spida(src: JsonSource, cache=None,
+                  load: Callable[[JsonSource], dict] = _load_json) -> SpidaTables:
+    """Stage 1: parse (or fetch from *cache*) and extract a SPIDA job.
+
+    *load* turns *src* into the document; it is not called on a cache hit.
+    """
+    tables = _load_tables(src, "spida", load, _extract_spida, cache)
+    return SpidaTables(
+        rows=tuple(tables["sp_rows"]),
+        charter_scids=frozenset(tables["sp_charter_scids"]),
+    )
+
+
+def extract_katapult(src: JsonSource, stream: bool = False, cache=None,
+                     workers: Optional[int] = None) -> KatapultTables:
+    """Stage 1: parse (or fetch from *cache*) and extract a Katapult job.
+
+    With *stream* a path is read through :func:`kat_stream.extract_katapult`,
+    keeping only the fields used here. *workers* > 1 spreads the per-node
+    work of large jobs over that many processes.
+    """
+    def _load(source: JsonSource) -> dict:
+        if stream and not isinstance(source, dict):
+            return kat_stream.extract_katapult(source)
+        return _load_json(source)
+
+    tables = _load_tables(src, "katapult", _load, functools.partial(_extract_katapult, workers=workers), cache)
+    return KatapultTables(
+        rows_by_scid=MappingProxyType(tables["kat_rows_by_scid"]),
+        scids=tuple(tables["kat_scids"]),
+        charter_scids=frozenset(tables["kat_charter_scids"]),
+        com_drop_scids=frozenset(tables["kat_com_drop_scids"]),
+    )
 
-    # ---------------- prepare list comparisons ----------------
-    # Collect all SCIDs and pole numbers
-    spida_scids = [row["SCID"] for row in sp_rows]
-    spida_pole_nums = [row["SPIDA Pole #"] for row in sp_rows if row["SPIDA Pole #"]]
-    
-    katapult_scids = list(kat_scid_set)
-    katapult_pole_nums = [row["Katapult Pole #"] for row in kat_rows_by_scid.values() if row["Katapult Pole #"]]
-    
-    # Create summary comparison data
-    scids_only_in_spida = set(spida_scids) - set(katapult_scids)
-    scids_only_in_katapult = set(katapult_scids) - set(spida_scids)
-    scids_in_both = set(spida_scids) & set(katapult_scids)
-    
-    poles_only_in_spida = set(spida_pole_nums) - set(katapult_pole_nums)
-    poles_only_in_katapult = set(katapult_pole_nums) - set(spida_pole_nums)
-    poles_in_both = set(spida_pole_nums) & set(katapult_pole_nums)
 
-    # ---------------- merge into df with tiered matching ----------------
-    merged_rows: List[dict] = []
+def build_indexes(katapult: KatapultTables) -> KatapultIndexes:
+    """Stage 2: lookup tables for tiers 1–2 and the coordinate grid for tier 3."""
+    scid_lookup, pole_num_lookup, coord_lookup = _build_lookup_tables(katapult.rows_by_scid)
+    return KatapultIndexes(
+        katapult=katapult,
+        scid_lookup=MappingProxyType(scid_lookup),
+        pole_num_lookup=MappingProxyType(pole_num_lookup),
+        coord_lookup=MappingProxyType(coord_lookup),
+        grid=_CoordGrid(katapult.rows_by_scid, cell_m=5.0),
+    )
+
+
+def build_spida_indexes(spida: SpidaTables) -> SpidaIndexes:
+    """Positions of SPIDA rows by tier-1 / tier-2 key, plus a grid over their coordinates."""
+    by_scid: Dict[str, List[int]] = {}
+    by_pole: Dict[str, List[int]] = {}
+    for i, sp in enumerate(spida.rows):
+        scid_key = _clean_digits(sp.scid)
+        if scid_key:
+            by_scid.setdefault(scid_key, []).append(i)
+        pole_key = _normalize_pole_num(sp.pole_num)
+        if pole_key:
+            by_pole.setdefault(pole_key, []).append(i)
+    return SpidaIndexes(
+        spida=spida,
+        by_scid_key=MappingProxyType({k: tuple(v) for k, v in by_scid.items()}),
+        by_pole_key=MappingProxyType({k: tuple(v) for k, v in by_pole.items()}),
+        grid=_CoordGrid(dict(enumerate(spida.rows)), cell_m=5.0),
+    )
+
+
+def _match_pole(sp: SpidaPole, indexes: KatapultIndexes, max_dist_m: float) -> PoleMatch:
+    """Run the tier cascade for one SPIDA row."""
+    key_match = _match_keys(sp, indexes)
+    if key_match is not None:
+        return key_match
+    closest_poles = _find_closest_poles(
+        sp.coord, indexes.katapult.rows_by_scid, max_dist_m=max_dist_m, grid=indexes.grid
+    )
+    return _match_coords(sp, closest_poles, max_dist_m)
+
+
+def _match_keys(sp: SpidaPole, indexes: KatapultIndexes) -> Optional[PoleMatch]:
+    """Tiers 1–2 for one SPIDA row, or None to fall through to the coordinate tiers."""
+    # ==================== TIER 1: EXACT SCID MATCH ====================
+    clean_spida_scid = _clean_digits(sp.scid)
+    if clean_spida_scid and clean_spida_scid in indexes.scid_lookup:
+        return PoleMatch(indexes.scid_lookup[clean_spida_scid], 'scid', None)
+
+    # ==================== TIER 2: POLE NUMBER MATCH ====================
+    norm_spida_pole = _normalize_pole_num(sp.pole_num)
+    if norm_spida_pole and norm_spida_pole in indexes.pole_num_lookup:
+        return PoleMatch(indexes.pole_num_lookup[norm_spida_pole], 'pole_num', None)
+    return None
+
+
+def _match_coords(
+    sp: SpidaPole, closest_poles: List[tuple[str, KatapultPole, float]], max_dist_m: float
+) -> PoleMatch:
+    """Tiers 3–4 for one SPIDA row given its Katapult candidates, nearest first."""
+    # ==================== TIER 3 & 4: COORDINATE + SPEC MATCHING ====================
+    if sp.coord:
+        for kat_scid, candidate_data, distance in closest_poles:
+            # Tier 3a: Direct match if < 1m
+            if distance < 1.0:
+                return PoleMatch(candidate_data, 'coord_direct', distance)
+
+            # Tier 3b + 4: Candidate match (1m – max_dist_m) requires spec verification
+            elif distance <= max_dist_m:
+                if _specs_match(sp.spec, candidate_data.spec):
+                    return PoleMatch(candidate_data, 'coord_spec_verified', distance)
+
+    # ==================== HANDLE UNMATCHED POLES ====================
+    return PoleMatch(None, 'unmatched', None)
+
+
+# SPIDA rows per _CoordGrid.query_many() call in match() – keeps cancel responsive
+_COORD_BATCH = 5000
+
+
+def match(
+    spida: SpidaTables,
+    indexes: KatapultIndexes,
+    max_dist_m: float = 5.0,
+    cancel: Optional[threading.Event] = None,
+    assignment: str = "greedy",
+) -> MatchResult:
+    """Stage 3: tiered matching of every SPIDA row against *indexes*.
+
+    Tiers, first hit wins: SCID, pole number, coordinate < 1 m, then
+    coordinate within *max_dist_m* with a matching spec.
+
+    Rows left over after the key tiers get their coordinate candidates from
+    one batched :meth:`_CoordGrid.query_many` call. With *assignment*
+    ``"greedy"`` each row takes its nearest admissible candidate, so two
+    rows may share a Katapult pole. ``"optimal"`` pairs rows and
+    candidates one-to-one instead – see :func:`_assign_coords`.
+    """
+    if assignment not in ASSIGNMENT_MODES:
+        raise ValueError(f"Unknown assignment mode: {assignment!r} (expected one of {ASSIGNMENT_MODES})")
+    matches: List[Optional[PoleMatch]] = []
     match_stats = {
         'scid': 0,
-        'pole_num': 0, 
+        'pole_num': 0,
         'coord_direct': 0,
         'coord_spec_verified': 0,
         'unmatched': 0
     }
-    
-    for sp in sp_rows:
-        scid = sp["SCID"]
-        sp_pole_num = sp.get("SPIDA Pole #")
-        sp_coord = sp.get("SPIDA Coord")
-        sp_spec = sp.get("SPIDA Spec")
-        
-        kdat = None
-        match_tier = None
-        match_distance = None
-        
-        # ==================== TIER 1: EXACT SCID MATCH ====================
-        clean_spida_scid = _clean_digits(scid)
-        if clean_spida_scid and clean_spida_scid in scid_lookup:
-            kdat = scid_lookup[clean_spida_scid]
-            match_tier = 'scid'
-            match_stats['scid'] += 1
-        
-        # ==================== TIER 2: POLE NUMBER MATCH ====================
-        if not kdat:
-            norm_spida_pole = _normalize_pole_num(sp_pole_num)
-            if norm_spida_pole and norm_spida_pole in pole_num_lookup:
-                kdat = pole_num_lookup[norm_spida_pole]
-                match_tier = 'pole_num'
-                match_stats['pole_num'] += 1
-        
-        # ==================== TIER 3 & 4: COORDINATE + SPEC MATCHING ====================
-        if not kdat and sp_coord:
-            closest_poles = _find_closest_poles(sp_coord, kat_rows_by_scid, max_dist_m=5.0)
-            
-            for kat_scid, candidate_data, distance in closest_poles:
-                # Tier 3a: Direct match if < 1m
-                if distance < 1.0:
-                    kdat = candidate_data
-                    match_tier = 'coord_direct'
-                    match_distance = distance
-                    match_stats['coord_direct'] += 1
-                    break
-                
-                # Tier 3b + 4: Candidate match (1-5m) requires spec verification
-                elif distance <= 5.0:
-                    kat_spec = candidate_data.get("Katapult Spec")
-                    if _specs_match(sp_spec, kat_spec):
-                        kdat = candidate_data
-                        match_tier = 'coord_spec_verified'
-                        match_distance = distance
-                        match_stats['coord_spec_verified'] += 1
-                        break
-        
-        # ==================== HANDLE UNMATCHED POLES ====================
-        if not kdat:
-            match_tier = 'unmatched'
-            match_stats['unmatched'] += 1
-
-        krow = kdat or {}
-
-        row = {**sp, **krow}
-        
-        # Add missing columns with defaults
-        if "Katapult Pole #" not in row:
-            row["Katapult Pole #"] = None
-        if "Katapult SCID #" not in row:
-            row["Katapult SCID #"] = None
-        if "Katapult Spec" not in row:
-            row["Katapult Spec"] = None
-        if "Katapult Existing %" not in row:
-            row["Katapult Existing %"] = None
-        if "Katapult Final %" not in row:
-            row["Katapult Final %"] = None
-        if "Katapult Charter Drop" not in row:
-            row["Katapult Charter Drop"] = False
-        if "Com Drop?" not in row:
-            row["Com Drop?"] = "No"
-        if "Katapult Coord" not in row:
-            row["Katapult Coord"] = None
-            
-        # ==================== ADD MATCH METADATA ====================
-        row["Match Tier"] = match_tier
-        row["Match Distance (m)"] = f"{match_distance:.2f}" if match_distance is not None else None
-        
-        # Add comparison columns
-        row["Spec Match"] = row.get("SPIDA Spec") == row.get("Katapult Spec")
-        row["Existing % Match"] = row.get("SPIDA Existing %") == row.get("Katapult Existing %")
-        row["Final % Match"] = row.get("SPIDA Final %") == row.get("Katapult Final %")
-        row["Charter Drop Match"] = row["SPIDA Charter Drop"] == row["Katapult Charter Drop"]
-        
-        # Add list comparison information
-        scid = row["SCID"]
-        pole_num = row.get("SPIDA Pole #")
-        
-        # SCID comparison status
-        if scid in scids_in_both:
-            row["SCID Status"] = "In Both"
-        elif scid in scids_only_in_spida:
-            row["SCID Status"] = "SPIDA Only"
-        else:
-            row["SCID Status"] = "Unknown"
-            
-        # Pole number comparison status
-        if pole_num and pole_num in poles_in_both:
-            row["Pole # Status"] = "In Both"
-        elif pole_num and pole_num in poles_only_in_spida:
-            row["Pole # Status"] = "SPIDA Only"
-        elif pole_num:
-            row["Pole # Status"] = "Unknown"
-        else:
-            row["Pole # Status"] = "No Pole #"
-        
-        # Legacy flag for backward compatibility
-        row["Matched by Coord"] = match_tier in ['coord_direct', 'coord_spec_verified']
-        
-        merged_rows.append(row)
+    pending: List[int] = []
+    for sp_idx, sp in enumerate(spida.rows):
+        if cancel is not None and sp_idx % 500 == 0 and cancel.is_set():
+            raise CompareCancelled("tier_matching")
+        result = _match_keys(sp, indexes)
+        if result is None and sp.coord:
+            pending.append(sp_idx)
+        elif result is None:
+            result = PoleMatch(None, 'unmatched', None)
+        matches.append(result)
+
+    candidates: Dict[int, list] = {}
+    for start in range(0, len(pending), _COORD_BATCH):
+        if cancel is not None and cancel.is_set():
+            raise CompareCancelled("tier_matching")
+        batch = pending[start:start + _COORD_BATCH]
+        found = indexes.grid.query_many([spida.rows[i].coord for i in batch], max_dist_m)
+        if assignment == "optimal":
+            candidates.update(zip(batch, found))
+            continue
+        for sp_idx, closest_poles in zip(batch, found):
+            matches[sp_idx] = _match_coords(spida.rows[sp_idx], closest_poles, max_dist_m)
+    if assignment == "optimal":
+        if cancel is not None and cancel.is_set():
+            raise CompareCancelled("tier_matching")
+        claimed = {id(pm.row) for pm in matches if pm is not None and pm.row is not None}
+        for sp_idx, result in _assign_coords(spida, candidates, claimed, max_dist_m).items():
+            matches[sp_idx] = result
+
+    for result in matches:
+        match_stats[result.tier] += 1
 
-    # ==================== ADD KATAPULT-ONLY POLES ====================
-    matched_katapult_scids = set()
-    for row in merged_rows:
-        if row.get("Katapult SCID #"):
-            matched_katapult_scids.add(row["Katapult SCID #"])
-    
-    for scid in kat_scid_set:
-        if scid not in matched_katapult_scids:
-            krow = kat_rows_by_scid[scid]
-            row = {
-                "SCID": scid,
-                "SPIDA Pole #": None,
-                "SPIDA Spec": None,
-                "SPIDA Existing %": None,
-                "SPIDA Final %": None,
-                "SPIDA Charter Drop": False,
-                "SPIDA Coord": None,
-                **krow,
-                "Match Tier": "katapult_only",
-                "Match Distance (m)": None,
-                "Matched by Coord": False,
-                "Spec Match": False,
-                "Existing % Match": False,
-                "Final % Match": False,
-                "Charter Drop Match": False,
-                "SCID Status": "Katapult Only",
-                "Pole # Status": "Katapult Only" if krow.get("Katapult Pole #") else "No Pole #"
-            }
-            merged_rows.append(row)
-    
     # ==================== REPORT MATCH STATISTICS ====================
-    total_spida_poles = len(sp_rows)
-    total_matches = sum(match_stats[key] for key in ['scid', 'pole_num', 'coord_direct', 'coord_spec_verified'])
+    total_spida_poles = len(spida.rows)
+    total_matches = total_spida_poles - match_stats['unmatched']
     match_rate = (total_matches / total_spida_poles * 100) if total_spida_poles > 0 else 0
-    
+
     print(f"\n📊 Tiered Matching Results:")
     print(f"   🎯 Tier 1 (SCID): {match_stats['scid']} poles")
     print(f"   🏷️  Tier 2 (Pole #): {match_stats['pole_num']} poles")
@@ -840,12 +1283,621 @@ def compare(spida_path: Path | str, kat_path: Path | str) -> pd.DataFrame:
     print(f"   ❌ Unmatched: {match_stats['unmatched']} poles")
     print(f"   ✅ Overall match rate: {match_rate:.1f}% ({total_matches}/{total_spida_poles})")
 
-    return pd.DataFrame(merged_rows)
+    return MatchResult(
+        spida=spida,
+        katapult=indexes.katapult,
+        matches=tuple(matches),
+        stats=MappingProxyType(match_stats),
+        max_dist_m=max_dist_m,
+        assignment=assignment,
+    )
+
+
+def _assign_coords(
+    spida: SpidaTables,
+    candidates: Dict[int, List[tuple[str, KatapultPole, float]]],
+    claimed: set,
+    max_dist_m: float,
+) -> Dict[int, PoleMatch]:
+    """Coordinate tiers as a minimum-cost bipartite matching.
+
+    Admissible pairs are the ones the greedy tiers accept – under 1 m, or
+    up to *max_dist_m* with matching specs – skipping Katapult rows already
+    *claimed* (by ``id``) in the key tiers. A pair costs its distance plus
+    :data:`SPEC_MISMATCH_PENALTY_M` when a < 1 m pair's specs disagree.
+    :func:`assignment.min_cost_assignment` pairs as many rows as possible
+    at the least total cost, solving each cluster of nearby poles on its
+    own; the result does not depend on file order (up to exact ties).
+    """
+    columns: Dict[int, KatapultPole] = {}
+    distance: Dict[Tuple[int, int], float] = {}
+    edges = []
+    specs_ok: Dict[Tuple[Any, Any], bool] = {}   # few distinct specs per job
+    for sp_idx in sorted(candidates):
+        sp = spida.rows[sp_idx]
+        for _kat_scid, candidate_data, dist in candidates[sp_idx]:
+            col = id(candidate_data)
+            if col in claimed:
+                continue
+            spec_pair = (sp.spec, candidate_data.spec)
+            spec_ok = specs_ok.get(spec_pair)
+            if spec_ok is None:
+                spec_ok = specs_ok[spec_pair] = _specs_match(*spec_pair)
+            if dist < 1.0:
+                cost = dist if spec_ok else dist + SPEC_MISMATCH_PENALTY_M
+            elif dist <= max_dist_m and spec_ok:
+                cost = dist
+            else:
+                continue
+            columns[col] = candidate_data
+            distance[(sp_idx, col)] = dist
+            edges.append((sp_idx, col, cost))
+
+    pairs = _assignment.min_cost_assignment(edges)
+    out = {sp_idx: PoleMatch(None, 'unmatched', None) for sp_idx in candidates}
+    for sp_idx, col in pairs.items():
+        dist = distance[(sp_idx, col)]
+        out[sp_idx] = PoleMatch(columns[col], 'coord_direct' if dist < 1.0 else 'coord_spec_verified', dist)
+    print(f"🧮 Optimal coordinate assignment ({_assignment.BACKEND}): "
+          f"{len(pairs)}/{len(candidates)} poles paired")
+    return out
+
+
+class _ListSets(NamedTuple):
+    """SCID / pole # membership sets behind the two status columns."""
+    scids_in_both: set
+    scids_only_in_spida: set
+    poles_in_both: set
+    poles_only_in_spida: set
+
+
+def _list_sets(result: MatchResult) -> _ListSets:
+    # Collect all SCIDs and pole numbers
+    spida_scids = {row.scid for row in result.spida.rows}
+    spida_pole_nums = {row.pole_num for row in result.spida.rows if row.pole_num}
+
+    katapult_scids = set(result.katapult.scids)
+    katapult_pole_nums = {row.pole_num for row in result.katapult.rows_by_scid.values() if row.pole_num}
+    return _ListSets(
+        scids_in_both=spida_scids & katapult_scids,
+        scids_only_in_spida=spida_scids - katapult_scids,
+        poles_in_both=spida_pole_nums & katapult_pole_nums,
+        poles_only_in_spida=spida_pole_nums - katapult_pole_nums,
+    )
+
+
+def _scid_status(scid: str, sets: _ListSets) -> str:
+    if scid in sets.scids_in_both:
+        return "In Both"
+    elif scid in sets.scids_only_in_spida:
+        return "SPIDA Only"
+    return "Unknown"
+
+
+def _pole_status(pole_num: str | None, sets: _ListSets) -> str:
+    if pole_num and pole_num in sets.poles_in_both:
+        return "In Both"
+    elif pole_num and pole_num in sets.poles_only_in_spida:
+        return "SPIDA Only"
+    elif pole_num:
+        return "Unknown"
+    return "No Pole #"
+
+
+# Stand-in for an unmatched SPIDA pole's Katapult side
+_NO_KATAPULT = KatapultPole(None, None, None, None, None, False, None)
+
+
+def _spida_columns(rows: List[SpidaPole], matches: List[PoleMatch], sets: _ListSets) -> Dict[str, list]:
+    """Frame columns for SPIDA poles and their matches, built column by column."""
+    sp_cols = list(zip(*rows)) if rows else [()] * len(SpidaPole._fields)
+    krows = [pm.row or _NO_KATAPULT for pm in matches]
+    k_cols = list(zip(*krows)) if krows else [()] * len(KatapultPole._fields)
+    tiers = [pm.tier for pm in matches]
+
+    columns = {name: list(values) for name, values in zip(SPIDA_COLUMNS, sp_cols)}
+    for name, values in zip(KATAPULT_COLUMNS, k_cols):
+        columns[name] = list(values)
+    # "Com Drop?" sits between the charter flag and the coordinate
+    columns = _insert_after(columns, "Katapult Charter Drop", "Com Drop?",
+                            ["Yes" if drop else "No" for drop in columns["Katapult Charter Drop"]])
+
+    # ==================== ADD MATCH METADATA ====================
+    columns["Match Tier"] = tiers
+    columns["Match Distance (m)"] = [
+        f"{pm.distance:.2f}" if pm.distance is not None else None for pm in matches
+    ]
+
+    # Add comparison columns
+    for flag, left, right in (
+        ("Spec Match", "SPIDA Spec", "Katapult Spec"),
+        ("Existing % Match", "SPIDA Existing %", "Katapult Existing %"),
+        ("Final % Match", "SPIDA Final %", "Katapult Final %"),
+        ("Charter Drop Match", "SPIDA Charter Drop", "Katapult Charter Drop"),
+    ):
+        columns[flag] = [a == b for a, b in zip(columns[left], columns[right])]
+
+    # Add list comparison information
+    columns["SCID Status"] = [_scid_status(scid, sets) for scid in columns["SCID"]]
+    columns["Pole # Status"] = [_pole_status(pole, sets) for pole in columns["SPIDA Pole #"]]
+
+    # Legacy flag for backward compatibility
+    columns["Matched by Coord"] = [tier in ('coord_direct', 'coord_spec_verified') for tier in tiers]
+    return columns
+
+
+def _insert_after(columns: Dict[str, list], after: str, name: str, values: list) -> Dict[str, list]:
+    out = {}
+    for key, col in columns.items():
+        out[key] = col
+        if key == after:
+            out[name] = values
+    return out
+
+
+def _katapult_only_columns(result: MatchResult) -> Dict[str, list]:
+    """Frame columns for Katapult poles no SPIDA pole matched, in node order."""
+    matched_katapult_scids = {pm.row.scid for pm in result.matches if pm.row and pm.row.scid}
+    krows = [
+        result.katapult.rows_by_scid[scid]
+        for scid in result.katapult.scids
+        if scid not in matched_katapult_scids
+    ]
+    n = len(krows)
+    k_cols = list(zip(*krows)) if krows else [()] * len(KatapultPole._fields)
+
+    columns: Dict[str, list] = {
+        "SCID": [row.scid for row in krows],
+        "SPIDA Pole #": [None] * n,
+        "SPIDA Spec": [None] * n,
+        "SPIDA Existing %": [None] * n,
+        "SPIDA Final %": [None] * n,
+        "SPIDA Charter Drop": [False] * n,
+        "SPIDA Coord": [None] * n,
+    }
+    for name, values in zip(KATAPULT_COLUMNS, k_cols):
+        columns[name] = list(values)
+    columns["Com Drop?"] = ["Yes" if drop else "No" for drop in columns["Katapult Charter Drop"]]
+    columns.update({
+        "Match Tier": ["katapult_only"] * n,
+        "Match Distance (m)": [None] * n,
+        "Matched by Coord": [False] * n,
+        "Spec Match": [False] * n,
+        "Existing % Match": [False] * n,
+        "Final % Match": [False] * n,
+        "Charter Drop Match": [False] * n,
+        "SCID Status": ["Katapult Only"] * n,
+        "Pole # Status": ["Katapult Only" if row.pole_num else "No Pole #" for row in krows],
+    })
+    return columns
+
+
+def to_frame(result: MatchResult) -> pd.DataFrame:
+    """Stage 4: merged DataFrame – one row per SPIDA pole, then Katapult-only poles.
+
+    Built from whole columns in one go; no per-row dicts.
+    """
+    head = _spida_columns(list(result.spida.rows), list(result.matches), _list_sets(result))
+    tail = _katapult_only_columns(result)
+    df = pd.DataFrame({name: values + tail[name] for name, values in head.items()})
+    df.attrs["match_stats"] = dict(result.stats)
+    return df
+
+
+# ---------------------------------------------------------------------------
+# incremental re-compare (new Katapult tables, same SPIDA side)
+# ---------------------------------------------------------------------------
+
+def _moved_keys(old_order: List[str], new_order: List[str]) -> set:
+    """Keys (present in both lists) outside a longest common ordering.
+
+    Every other key keeps its relative order, so treating just these as
+    changed is enough to make insertion-order tie-breaks line up again.
+    """
+    position = {key: i for i, key in enumerate(new_order)}
+    seq = [position[key] for key in old_order]
+    # patience-sort LIS over new positions, remembering predecessors
+    tails: List[int] = []
+    tails_idx: List[int] = []
+    prev = [-1] * len(seq)
+    for i, value in enumerate(seq):
+        lo = bisect_left(tails, value)
+        if lo == len(tails):
+            tails.append(value)
+            tails_idx.append(i)
+        else:
+            tails[lo] = value
+            tails_idx[lo] = i
+        prev[i] = tails_idx[lo - 1] if lo else -1
+    keep = set()
+    i = tails_idx[-1] if tails_idx else -1
+    while i != -1:
+        keep.add(old_order[i])
+        i = prev[i]
+    return set(old_order) - keep
+
+
+def _changed_katapult_rows(old: KatapultTables, new: KatapultTables) -> Tuple[set, List[KatapultPole]]:
+    """Keys and rows (old and new versions) that differ between two Katapult tables.
+
+    Matching only sees ``rows_by_scid`` (lookups and grid are built from
+    it), so that is what gets diffed. Tie-breaks follow insertion order, so
+    unchanged keys that moved relative to the others count as changed too.
+    """
+    changed_keys = set()
+    for key, row in new.rows_by_scid.items():
+        if old.rows_by_scid.get(key) != row:
+            changed_keys.add(key)
+    changed_keys.update(key for key in old.rows_by_scid if key not in new.rows_by_scid)
+
+    kept_old = [k for k in old.rows_by_scid if k not in changed_keys]
+    kept_new = [k for k in new.rows_by_scid if k not in changed_keys]
+    if kept_old != kept_new:
+        changed_keys |= _moved_keys(kept_old, kept_new)
+
+    rows: List[KatapultPole] = []
+    for key in changed_keys:
+        for table in (old, new):
+            row = table.rows_by_scid.get(key)
+            if row is not None:
+                rows.append(row)
+    return changed_keys, rows
+
+
+def rematch(
+    previous: MatchResult,
+    indexes: KatapultIndexes,
+    spida_indexes: Optional[SpidaIndexes] = None,
+    cancel: Optional[threading.Event] = None,
+) -> MatchResult:
+    """Stage 3, incrementally: re-match only SPIDA rows the Katapult change can reach.
+
+    A SPIDA row is re-run when a changed Katapult row (old or new version)
+    shares its SCID key, shares its normalised pole #, or lies within
+    ``max_dist_m`` of it – every way a tier could pick a different row.
+    All other rows keep their previous match. The result equals a full
+    :func:`match`; its ``rematched`` field lists the re-run positions.
+
+    Pass the :func:`build_spida_indexes` of ``previous.spida`` when
+    re-matching repeatedly against the same SPIDA job.
+
+    An ``"optimal"`` assignment couples poles across a whole cluster, so
+    such a result is simply matched again in full.
+    """
+    spida = previous.spida
+    if previous.assignment != "greedy":
+        return match(spida, indexes, max_dist_m=previous.max_dist_m, cancel=cancel,
+                     assignment=previous.assignment)
+    if spida_indexes is None or spida_indexes.spida is not spida:
+        spida_indexes = build_spida_indexes(spida)
+    katapult = indexes.katapult
+    max_dist_m = previous.max_dist_m
+    changed_keys, changed_rows = _changed_katapult_rows(previous.katapult, katapult)
+
+    # SPIDA rows a changed Katapult row could be (or have been) matched to
+    affected = set()
+    for key in changed_keys:
+        affected.update(spida_indexes.by_scid_key.get(_clean_digits(key), ()))
+    for row in changed_rows:
+        affected.update(spida_indexes.by_pole_key.get(_normalize_pole_num(row.pole_num), ()))
+        if row.coord:
+            affected.update(i for i, _sp, _dist in spida_indexes.grid.query(row.coord, max_dist_m))
+
+    matches = list(previous.matches)
+    for n, sp_idx in enumerate(sorted(affected)):
+        if cancel is not None and n % 500 == 0 and cancel.is_set():
+            raise CompareCancelled("tier_matching")
+        matches[sp_idx] = _match_pole(spida.rows[sp_idx], indexes, max_dist_m)
+
+    # untouched matches: same content under the same key – point at the new table's rows
+    rows_by_scid = katapult.rows_by_scid
+    for sp_idx, pm in enumerate(matches):
+        if pm.row is not None and sp_idx not in affected:
+            matches[sp_idx] = pm._replace(row=rows_by_scid[pm.row.scid])
+
+    stats = dict.fromkeys(('scid', 'pole_num', 'coord_direct', 'coord_spec_verified', 'unmatched'), 0)
+    for pm in matches:
+        stats[pm.tier] += 1
+    print(f"♻️  Incremental re-match: {len(changed_keys)} Katapult key(s) changed, "
+          f"{len(affected)}/{len(matches)} SPIDA poles re-run")
+
+    return MatchResult(
+        spida=spida,
+        katapult=katapult,
+        matches=tuple(matches),
+        stats=MappingProxyType(stats),
+        max_dist_m=max_dist_m,
+        rematched=frozenset(affected),
+    )
+
+
+def patch_frame(df: pd.DataFrame, result: MatchResult) -> pd.DataFrame:
+    """Frame for *result* made by patching *df*, the frame of the match it was derived from.
+
+    Only the :func:`rematch`-ed rows are rebuilt; the status columns are
+    refreshed (they depend on the whole Katapult SCID / pole # sets) and
+    the Katapult-only tail is regenerated. Everything else is carried over
+    column by column. Falls back to :func:`to_frame` for a full match.
+    """
+    if result.rematched is None:
+        return to_frame(result)
+
+    n = len(result.spida.rows)
+    sets = _list_sets(result)
+    positions = sorted(result.rematched)
+    patched = _spida_columns(
+        [result.spida.rows[i] for i in positions], [result.matches[i] for i in positions], sets
+    )
+    tail = _katapult_only_columns(result)
+    columns = {}
+    for col in df.columns:
+        values = df[col].iloc[:n].tolist()
+        for i, value in zip(positions, patched[col]):
+            values[i] = value
+        values.extend(tail[col])
+        columns[col] = values
+    columns["SCID Status"][:n] = [_scid_status(sp.scid, sets) for sp in result.spida.rows]
+    columns["Pole # Status"][:n] = [_pole_status(sp.pole_num, sets) for sp in result.spida.rows]
+
+    out = pd.DataFrame(columns, columns=df.columns)
+    out.attrs["match_stats"] = dict(result.stats)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# one-shot compare
+# ---------------------------------------------------------------------------
+
+def compare(
+    spida_src: JsonSource,
+    kat_src: JsonSource,
+    stream_katapult: bool = False,
+    progress: Optional[Callable[[str], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    cache=None,
+    max_dist_m: float = 5.0,
+    assignment: str = "greedy",
+    extract_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Return DataFrame with merged comparison.
+
+    Runs every stage of the staged API once; use :class:`ComparePipeline`
+    to keep stage results between runs.
+
+    Each source may be a path to the JSON file or the already-parsed
+    document; parsed documents are read but never modified.
+
+    With *stream_katapult* a Katapult *path* is read incrementally through
+    :func:`kat_stream.extract_katapult`, keeping only the fields used here.
+
+    *progress* is called with each name in :data:`COMPARE_STAGES` as that
+    stage starts. Setting *cancel* makes the run raise
+    :class:`CompareCancelled` at the next stage boundary (or within a few
+    hundred poles during tier matching).
+
+    With a *cache* (:class:`job_cache.JobCache`) the rows extracted from
+    each source *path* are stored on disk and reused while the file is
+    unchanged, skipping parsing entirely.
+
+    *assignment* selects how the coordinate tiers pair poles, see
+    :func:`match`. *extract_workers* > 1 extracts large Katapult jobs in
+    that many processes (see :func:`extract_katapult`).
+    """
+    pipeline = ComparePipeline(spida_src, kat_src, max_dist_m=max_dist_m,
+                               stream_katapult=stream_katapult, cache=cache,
+                               assignment=assignment, extract_workers=extract_workers)
+    return pipeline.run(progress=progress, cancel=cancel)
+
+
+class ComparePipeline:
+    """Memoising driver for the staged API.
+
+    Each stage result is kept and reused until one of its inputs changes:
+    a new Katapult source re-runs extraction, indexing and matching for the
+    Katapult side only; a new ``max_dist_m`` re-runs matching and the frame.
+
+    With *incremental* (the default) a new Katapult source that leaves the
+    SPIDA side and tolerance alone goes through :func:`rematch` and
+    :func:`patch_frame` instead, re-running only the poles it can affect
+    (``"greedy"`` assignment only).
+
+    With *keep_spida_document* the parsed SPIDA document is kept in
+    :attr:`spida_document` (``None`` when the tables came from the cache),
+    so callers that edit and save it don't parse the file a second time.
+
+        pipe = ComparePipeline(spida_path, kat_path)
+        df = pipe.run()
+        pipe.set_max_dist(3.0)        # SPIDA/Katapult tables and indexes reused
+        df = pipe.run()
+    """
+
+    def __init__(self, spida_src: JsonSource | None = None, kat_src: JsonSource | None = None,
+                 max_dist_m: float = 5.0, stream_katapult: bool = False, cache=None,
+                 incremental: bool = True, assignment: str = "greedy",
+                 extract_workers: Optional[int] = None, keep_spida_document: bool = False):
+        self.spida_src = spida_src
+        self.kat_src = kat_src
+        self.max_dist_m = max_dist_m
+        self.assignment = assignment
+        self.extract_workers = extract_workers
+        self.stream_katapult = stream_katapult
+        self.cache = cache
+        self.incremental = incremental
+        self.keep_spida_document = keep_spida_document
+        self.spida_document: Optional[dict] = None
+        self._spida: Optional[SpidaTables] = None
+        self._katapult: Optional[KatapultTables] = None
+        # downstream memos remember the upstream objects they were built from
+        self._indexes: Optional[KatapultIndexes] = None
+        self._spida_indexes: Optional[SpidaIndexes] = None
+        self._result: Optional[MatchResult] = None
+        self._frame: Optional[Tuple[MatchResult, pd.DataFrame]] = None
+        self._rematched_from: Optional[MatchResult] = None
+
+    # ---- inputs ------------------------------------------------------
+    def set_spida(self, src: JsonSource) -> None:
+        """Use a new SPIDA source; Katapult tables and indexes are kept."""
+        self.spida_src = src
+        self._spida = None
+        self.spida_document = None
+
+    def set_katapult(self, src: JsonSource) -> None:
+        """Use a new Katapult source; SPIDA tables are kept."""
+        self.kat_src = src
+        self._katapult = None
+
+    def set_max_dist(self, max_dist_m: float) -> None:
+        """Change the coordinate tolerance; only matching and the frame re-run."""
+        self.max_dist_m = max_dist_m
+
+    def set_assignment(self, assignment: str) -> None:
+        """Change the coordinate-tier mode (see :data:`ASSIGNMENT_MODES`); only matching and the frame re-run."""
+        self.assignment = assignment
+
+    # ---- stages ------------------------------------------------------
+    def spida(self) -> SpidaTables:
+        if self._spida is None:
+            load = _load_json
+            if self.keep_spida_document:
+                def load(src: JsonSource) -> dict:
+                    self.spida_document = _load_json(src)
+                    return self.spida_document
+            self._spida = extract_spida(self.spida_src, cache=self.cache, load=load)
+        return self._spida
+
+    def katapult(self) -> KatapultTables:
+        if self._katapult is None:
+            self._katapult = extract_katapult(self.kat_src, stream=self.stream_katapult, cache=self.cache,
+                                              workers=self.extract_workers)
+        return self._katapult
+
+    def indexes(self) -> KatapultIndexes:
+        katapult = self.katapult()
+        if self._indexes is None or self._indexes.katapult is not katapult:
+            self._indexes = build_indexes(katapult)
+        return self._indexes
+
+    def result(self, cancel: Optional[threading.Event] = None) -> MatchResult:
+        spida, indexes = self.spida(), self.indexes()
+        cached = self._result
+        if (cached is not None and cached.spida is spida and cached.max_dist_m == self.max_dist_m
+                and cached.assignment == self.assignment):
+            if cached.katapult is not indexes.katapult:
+                if self.incremental and self.assignment == "greedy":
+                    if self._spida_indexes is None or self._spida_indexes.spida is not spida:
+                        self._spida_indexes = build_spida_indexes(spida)
+                    self._result = rematch(cached, indexes, self._spida_indexes, cancel=cancel)
+                    self._rematched_from = cached
+                else:
+                    self._result = match(spida, indexes, max_dist_m=self.max_dist_m, cancel=cancel,
+                                         assignment=self.assignment)
+        else:
+            self._result = match(spida, indexes, max_dist_m=self.max_dist_m, cancel=cancel,
+                                 assignment=self.assignment)
+        return self._result
+
+    def frame(self, cancel: Optional[threading.Event] = None) -> pd.DataFrame:
+        result = self.result(cancel)
+        if self._frame is None or self._frame[0] is not result:
+            previous = self._frame
+            if (result.rematched is not None and previous is not None
+                    and previous[0] is self._rematched_from):
+                self._frame = (result, patch_frame(previous[1], result))
+            else:
+                self._frame = (result, to_frame(result))
+            self._rematched_from = None
+        return self._frame[1].copy()
+
+    def run(
+        self,
+        progress: Optional[Callable[[str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> pd.DataFrame:
+        """Run (or reuse) every stage, reporting :data:`COMPARE_STAGES` on the way.
+
+        Returns a copy of the memoised frame, so callers may modify it.
+        """
+        def _stage(name: str) -> None:
+            if cancel is not None and cancel.is_set():
+                raise CompareCancelled(name)
+            if progress is not None:
+                progress(name)
+
+        _stage("load_spida")
+        self.spida()
+        _stage("load_katapult")
+        self.katapult()
+        _stage("build_tables")
+        self.indexes()
+        _stage("tier_matching")
+        self.result(cancel)
+        _stage("build_frame")
+        return self.frame()
+
+# ---------------------------------------------------------------------------
+# vectorised match flags (GUI column names)
+# ---------------------------------------------------------------------------
+
+# compare() column → name in the GUI table (and in MATCH_FLAG_COLUMNS), where they differ
+GUI_COLUMN_NAMES: Dict[str, str] = {
+    "SCID": "SPIDA SCID #",
+    "SPIDA Spec": "SPIDA Pole Spec",
+    "Katapult Spec": "Katapult Pole Spec",
+    "SPIDA Charter Drop": "Com Drop? (SPIDA)",
+    "Com Drop?": "Com Drop? (Kat)",
+}
+
+# flag column → (left column, right column, normaliser)
+MATCH_FLAG_COLUMNS: Dict[str, Tuple[str, str, str]] = {
+    "Spec Match": ("SPIDA Pole Spec", "Katapult Pole Spec", "spec"),
+    "Existing % Match": ("SPIDA Existing %", "Katapult Existing %", "value"),
+    "Final % Match": ("SPIDA Final %", "Katapult Final %", "value"),
+    "Charter Drop Match": ("Com Drop? (SPIDA)", "Com Drop? (Kat)", "charter"),
+}
+
+def _normalise_column(col: pd.Series, kind: str) -> pd.Series:
+    """Column-wise normalisation used before comparing SPIDA and Katapult values.
+
+    ``value``   – stripped text, blanks become missing
+    ``spec``    – as ``value`` plus prime marks removed, whitespace collapsed, lower-cased
+    ``charter`` – lower-cased text with True/Yes → ``yes`` and False/No → ``no``
+    """
+    missing = col.isna()
+    text = col.astype(object).where(~missing, "").astype(str).str.strip()
+    if kind == "spec":
+        text = (
+            text.str.replace("′", "", regex=False)
+            .str.replace("'", "", regex=False)
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip()
+            .str.lower()
+        )
+    elif kind == "charter":
+        text = text.str.lower().replace({"true": "yes", "false": "no"})
+        return text.astype(object).where(~missing, None)
+    return text.astype(object).where(~missing & (text != ""), None)
+
+def compute_match_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the boolean match columns of :data:`MATCH_FLAG_COLUMNS` for *df*.
+
+    Values are normalised column-wise and compared in one pass per flag;
+    two missing values count as a match. Absent columns are treated as
+    all-missing.
+    """
+    flags = {}
+    for flag, (left, right, kind) in MATCH_FLAG_COLUMNS.items():
+        sides = []
+        for name in (left, right):
+            col = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+            sides.append(_normalise_column(col, kind))
+        a, b = sides
+        a_missing, b_missing = a.isna(), b.isna()
+        same = a.where(~a_missing, "").eq(b.where(~b_missing, ""))
+        flags[flag] = ((same & ~a_missing & ~b_missing) | (a_missing & b_missing)).astype(bool)
+    return pd.DataFrame(flags, index=df.index)
 
 # Export haversine function for use in other modules
-def haversine_m(p1: Coord, p2: Coord) -> float:
-    """Public interface for distance calculation."""
-    return _haversine_m(p1, p2)
+haversine_m = geodist.haversine_m
 
 # ---------------------------------------------------------------------------
 # spec builder helper
@@ -909,16 +1961,75 @@ def _build_spida_spec(pole_struct: dict, alias_table: dict) -> str | None:
     return species or None
 
 def _collect_birthmarks(obj, out):
-    """Recursively collect all birthmark sections from Katapult JSON."""
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            if k == "birthmark":
-                out.update(v)  # Use update to merge all birthmarks into one dict
-            else:
-                _collect_birthmarks(v, out)
-    elif isinstance(obj, list):
-        for el in obj:
-            _collect_birthmarks(el, out)
+    """Collect all birthmark sections anywhere in the Katapult JSON.
+
+    Full-document fallback for :func:`_index_birthmarks`. The walk is
+    iterative (same visiting order as a recursive depth-first walk) so deeply
+    nested exports can't hit the recursion limit.
+    """
+    stack = [(False, obj)]
+    while stack:
+        is_birthmark, cur = stack.pop()
+        if is_birthmark:
+            out.update(cur)  # Use update to merge all birthmarks into one dict
+        elif isinstance(cur, dict):
+            stack.extend(
+                (k == "birthmark", v) for k, v in reversed(list(cur.items()))
+            )
+        elif isinstance(cur, list):
+            stack.extend((False, el) for el in reversed(cur))
+
+def _index_birthmarks(kat: dict) -> dict:
+    """Return the merged birthmark index of a Katapult job.
+
+    Birthmarks are read only from where Katapult keeps them:
+
+    * the top-level ``birthmark`` block (compact documents built by
+      :mod:`kat_stream` already carry the merged index there), and
+    * ``photos.<id>.photofirst_data.birthmark``.
+
+    Documents matching neither layout, or with a node whose birthmark
+    reference isn't found there (kept per node or under another key), fall
+    back to a full scan, so no birthmark the scan would see is dropped.
+    """
+    photos = kat.get("photos")
+    has_photo_data = isinstance(photos, dict) and any(
+        isinstance(p, dict) and "photofirst_data" in p for p in photos.values()
+    )
+    if not has_photo_data and not isinstance(kat.get("birthmark"), dict):
+        birthmarks: dict = {}
+        _collect_birthmarks(kat, birthmarks)
+        return birthmarks
+
+    birthmarks = {}
+    for key, value in kat.items():  # document order, like the full walk
+        if key == "birthmark" and isinstance(value, dict):
+            birthmarks.update(value)
+        elif key == "photos" and has_photo_data:
+            for photo in value.values():
+                data = photo.get("photofirst_data") if isinstance(photo, dict) else None
+                block = data.get("birthmark") if isinstance(data, dict) else None
+                if isinstance(block, dict):
+                    birthmarks.update(block)
+    if _unresolved_birthmark_refs(kat, birthmarks):
+        birthmarks = {}
+        _collect_birthmarks(kat, birthmarks)
+    return birthmarks
+
+
+def _unresolved_birthmark_refs(kat: dict, birthmarks: dict) -> bool:
+    """True if a node without ``pole_spec`` names a birthmark missing from *birthmarks*."""
+    nodes = kat.get("nodes")
+    if not isinstance(nodes, dict):
+        return False
+    for node in nodes.values():
+        attrs = node.get("attributes") if isinstance(node, dict) else None
+        if not isinstance(attrs, dict) or _get_imported_val(attrs.get("pole_spec")):
+            continue
+        ref = _birthmark_ref(attrs)
+        if isinstance(ref, str) and ref not in birthmarks:
+            return True
+    return False
 
 # ---------------------------------------------------------------------------
 # Charter service drop detection helpers
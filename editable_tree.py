@@ -10,14 +10,121 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
 class EditableTree(ttk.Treeview):
-    """Double-click a cell → inline Entry → <Return> saves."""
+    """Double-click a cell → inline Entry → <Return> saves.
+
+    Large tables can be shown virtualised with :meth:`set_rows`: the rows are
+    kept as precomputed display strings and only a window of *page_size*
+    consecutive rows exists as Treeview items. The window slides as the view
+    nears either end of it, and a scrollbar attached with
+    :meth:`attach_yscrollbar` spans the full row count.
+    """
     
-    def __init__(self, *args, editable_cols=None, **kwargs):
+    def __init__(self, *args, editable_cols=None, page_size=200, on_edit=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.editable_cols = editable_cols or set()
+        self.on_edit = on_edit  # called as on_edit(row_index, column, new_value)
         self.bind("<Double-1>", self._edit_cell)
         self.current_entry = None
 
+        # virtual mode state
+        self.page_size = page_size
+        self._rows: list[list[str]] | None = None   # all rows, display strings
+        self._offset = 0                              # row index of the first item
+        self._shift_pending = False
+        self._yscroll_target = None
+
+    # ------------------------------------------------------------------
+    # virtual mode
+    # ------------------------------------------------------------------
+    def attach_yscrollbar(self, scrollbar):
+        """Drive *scrollbar* over all rows, not just the materialised window."""
+        self._yscroll_target = scrollbar.set
+        scrollbar.configure(command=self._on_scrollbar)
+        self.configure(yscrollcommand=self._on_yscroll)
+
+    def set_rows(self, columns, rows):
+        """Replace the contents with *rows* (sequences of display strings).
+
+        Item ids are the row indices, so edits can be written back to the
+        row store.
+        """
+        self["columns"] = list(columns)
+        self._rows = [list(r) for r in rows]
+        self._offset = 0
+        self._fill(0)
+        self.yview_moveto(0)
+
+    def see_row(self, row_idx: int):
+        """Materialise row *row_idx* if needed and scroll it into view."""
+        if self._rows is not None and not self._offset <= row_idx < self._offset + len(self.get_children()):
+            self._show(row_idx)
+        self.see(str(row_idx))
+
+    def _fill(self, start: int):
+        """Make rows ``start … start + page_size`` the Treeview items, keeping selection and focus."""
+        if self.current_entry:                 # its item is about to go away
+            self.current_entry.destroy()
+            self.current_entry = None
+        selected = self.selection()
+        focused = self.focus()
+        self.delete(*self.get_children())
+        stop = min(start + self.page_size, len(self._rows))
+        for i in range(start, stop):
+            self.insert("", tk.END, iid=str(i), values=self._rows[i])
+        self._offset = start
+        keep = [iid for iid in selected if start <= int(iid) < stop]
+        if keep:
+            self.selection_set(keep)
+        if focused and start <= int(focused) < stop:
+            self.focus(focused)
+
+    def _show(self, top_row: int):
+        """Scroll so *top_row* is the first visible row, sliding the window if needed."""
+        self._shift_pending = False
+        total = len(self._rows or ())
+        if not total:
+            return
+        top_row = max(0, min(int(top_row), total - 1))
+        # leave a quarter of the window above the top row to scroll back into
+        start = max(0, min(top_row - self.page_size // 4, total - self.page_size))
+        if start != self._offset or not self.get_children():
+            self._fill(start)
+        self.yview_moveto((top_row - self._offset) / len(self.get_children()))
+
+    def _visible_rows(self) -> int:
+        first, last = self.yview()
+        return max(1, round((last - first) * len(self.get_children())))
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar command: positions are fractions of *all* rows."""
+        if self._rows is None:
+            return self.yview(action, amount) if unit is None else self.yview(action, amount, unit)
+        top = self._offset + self.yview()[0] * len(self.get_children())
+        if action == "moveto":
+            self._show(float(amount) * len(self._rows))
+        elif unit == "pages":
+            self._show(round(top) + int(amount) * self._visible_rows())
+        else:
+            self._show(round(top) + int(amount))
+
+    def _on_yscroll(self, first, last):
+        total = len(self._rows) if self._rows is not None else 0
+        count = len(self.get_children())
+        if not total or not count:
+            if self._yscroll_target is not None:
+                self._yscroll_target(first, last)
+            return
+        top = self._offset + float(first) * count
+        bottom = self._offset + float(last) * count
+        if self._yscroll_target is not None:
+            self._yscroll_target(top / total, bottom / total)
+        # wheel / keyboard scrolling inside the window: slide it before the edge
+        near_top = float(first) < 0.1 and self._offset > 0
+        near_end = float(last) > 0.9 and self._offset + count < total
+        if (near_top or near_end) and not self._shift_pending:
+            self._shift_pending = True
+            self.after_idle(self._show, round(top))
+
     def _edit_cell(self, evt):
         """Handle double-click event to start editing a cell."""
         region = self.identify_region(evt.x, evt.y)
@@ -77,6 +184,13 @@ class EditableTree(ttk.Treeview):
             vals = list(self.item(row_id, "values"))
             vals[col_idx] = new_val
             self.item(row_id, values=vals)
+            if self._rows is not None:
+                row_idx = int(row_id)
+                self._rows[row_idx][col_idx] = new_val
+            else:
+                row_idx = self.index(row_id)
+            if self.on_edit is not None and new_val != str(old_value):
+                self.on_edit(row_idx, heading, new_val)
             
             entry.destroy()
             self.current_entry = None
@@ -118,6 +232,9 @@ class EditableTree(ttk.Treeview):
                     pass
         
         # If no more editable columns in current row, move to next row
+        if self._rows is not None and int(current_row) + 1 < len(self._rows):
+            self.see_row(int(current_row) + 1)
+            self.update_idletasks()
         children = self.get_children()
         try:
             current_idx = children.index(current_row)
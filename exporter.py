@@ -0,0 +1,202 @@
+"""
+exporter.py – write comparison results to Excel, CSV, Parquet or Feather.
+
+Excel output is streamed row by row (xlsxwriter ``constant_memory`` mode,
+or openpyxl's write-only mode when xlsxwriter isn't installed) and keeps the
+mismatch highlighting as real cell formats. CSV, Parquet and Feather are
+meant for downstream pipelines; the last two need ``pyarrow``.
+
+No GUI imports – safe to call from worker threads and batch jobs.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:  # optional – falls back to openpyxl
+    xlsxwriter = None
+
+try:
+    from .compare import GUI_COLUMN_NAMES, MATCH_FLAG_COLUMNS, compute_match_flags
+except ImportError:
+    from compare import GUI_COLUMN_NAMES, MATCH_FLAG_COLUMNS, compute_match_flags
+
+EXPORT_FORMATS = {
+    ".xlsx": "xlsx",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".feather": "feather",
+}
+
+MISMATCH_FILL = "#F8D7DA"   # light red background
+MISMATCH_FONT = "#842029"   # dark red text
+
+
+def export_columns(df: pd.DataFrame) -> List[str]:
+    """Columns worth exporting: no internal ``__`` columns, no coordinate tuples."""
+    return [c for c in df.columns if not c.startswith("__") and "Coord" not in c]
+
+
+def mismatch_flags(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """Map each compared value column in *df* to its match-flag values.
+
+    GUI frames carry the flags of :data:`MATCH_FLAG_COLUMNS` already. A raw
+    ``compare()`` frame (as ``batch.py`` writes it) is recognised by its
+    column names; its flags are recomputed under the GUI names with
+    :func:`compute_match_flags`, so both highlight the same cells.
+    """
+    renamed = {c: GUI_COLUMN_NAMES[c] for c in df.columns if c in GUI_COLUMN_NAMES}
+    if renamed:
+        view = df.rename(columns=renamed)
+        flag_frame = compute_match_flags(view)
+    else:
+        view = flag_frame = df
+    original = {gui: col for col, gui in renamed.items()}
+    mapping = {}
+    for flag, (left, right, _kind) in MATCH_FLAG_COLUMNS.items():
+        if flag in flag_frame.columns:
+            for col in (left, right):
+                if col in view.columns:
+                    mapping[original.get(col, col)] = flag_frame[flag]
+    return mapping
+
+
+def export_frame(df: pd.DataFrame, path: Path | str, fmt: Optional[str] = None,
+                 highlight: bool = True) -> Path:
+    """Export *df* to *path*; the format comes from *fmt* or the file suffix.
+
+    Only :func:`export_columns` are written. With *highlight*, Excel cells
+    whose match flag is False get a red fill (see :func:`mismatch_flags`).
+    """
+    path = Path(path)
+    fmt = fmt or EXPORT_FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported export format: {path.suffix or path.name}")
+
+    cols = export_columns(df)
+    if fmt == "xlsx":
+        flags = mismatch_flags(df) if highlight else {}
+        if xlsxwriter is not None:
+            _write_xlsx_xlsxwriter(df, cols, flags, path)
+        else:
+            _write_xlsx_openpyxl(df, cols, flags, path)
+    elif fmt == "csv":
+        df[cols].to_csv(path, index=False, encoding="utf-8")
+    elif fmt in ("parquet", "feather"):
+        table = _arrow_ready(df[cols])
+        if fmt == "parquet":
+            table.to_parquet(path, index=False)
+        else:
+            table.reset_index(drop=True).to_feather(path)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# helpers
+# ---------------------------------------------------------------------------
+
+def _cell_columns(df: pd.DataFrame, cols: List[str]) -> List[list]:
+    """Column values as plain Python objects, missing values as None."""
+    out = []
+    for col in cols:
+        values = df[col]
+        out.append(values.astype(object).where(values.notna(), None).tolist())
+    return out
+
+
+def _mismatch_masks(cols: List[str], flags: Dict[str, pd.Series]) -> List[Optional[list]]:
+    masks = []
+    for col in cols:
+        flag = flags.get(col)
+        if flag is None:
+            masks.append(None)
+        else:
+            masks.append((flag.astype(str).str.lower() == "false").tolist())
+    return masks
+
+
+def _write_xlsx_xlsxwriter(df, cols, flags, path: Path):
+    values = _cell_columns(df, cols)
+    masks = _mismatch_masks(cols, flags)
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    try:
+        sheet = workbook.add_worksheet("Comparison")
+        header = workbook.add_format({"bold": True, "bottom": 1})
+        bad = workbook.add_format({"bg_color": MISMATCH_FILL, "font_color": MISMATCH_FONT})
+        sheet.write_row(0, 0, cols, header)
+        sheet.freeze_panes(1, 0)
+
+        # Typed writers skip write()'s formula/URL sniffing, which dominates
+        # the run time; cell text is stored exactly as shown in the table.
+        writers = {
+            str: sheet.write_string,
+            bool: sheet.write_boolean,
+            int: sheet.write_number,
+            float: sheet.write_number,
+        }
+        write_any = sheet.write
+        # constant_memory flushes each row once the next starts – write in order
+        for r in range(len(df)):
+            for c, column in enumerate(values):
+                value = column[r]
+                mask = masks[c]
+                if mask is not None and mask[r]:
+                    if value is None:
+                        sheet.write_blank(r + 1, c, None, bad)
+                    else:
+                        writers.get(type(value), write_any)(r + 1, c, value, bad)
+                elif value is not None:
+                    writers.get(type(value), write_any)(r + 1, c, value)
+    finally:
+        workbook.close()
+
+
+def _write_xlsx_openpyxl(df, cols, flags, path: Path):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    values = _cell_columns(df, cols)
+    masks = _mismatch_masks(cols, flags)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Comparison")
+    fill = PatternFill("solid", fgColor=MISMATCH_FILL.lstrip("#"))
+    font = Font(color=MISMATCH_FONT.lstrip("#"))
+    header_font = Font(bold=True)
+
+    header = []
+    for name in cols:
+        cell = WriteOnlyCell(sheet, value=name)
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+    for r in range(len(df)):
+        row = []
+        for c, column in enumerate(values):
+            mask = masks[c]
+            if mask is not None and mask[r]:
+                cell = WriteOnlyCell(sheet, value=column[r])
+                cell.fill, cell.font = fill, font
+                row.append(cell)
+            else:
+                row.append(column[r])
+        sheet.append(row)
+    workbook.save(path)
+
+
+def _arrow_ready(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn mixed-type object columns into strings so Arrow can type them."""
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype == object:
+            kind = pd.api.types.infer_dtype(out[col], skipna=True)
+            if kind.startswith("mixed"):
+                out[col] = out[col].astype("string")
+    return out
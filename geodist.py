@@ -0,0 +1,122 @@
+"""
+geodist.py – great-circle distances, one pair at a time or in bulk.
+
+``haversine_m`` is the scalar helper ``compare`` has always used.  The
+array functions take coordinates as ``(N, 2)`` sequences of
+``(lat, lon)`` degrees and evaluate the same formula with NumPy, so a
+tier-3 candidate sweep or a map clustering pass costs one vectorised call
+instead of a Python loop:
+
+    d = haversine_matrix(spida_coords, kat_coords)        # (N, M) metres
+    idx, dist = nearest_k(spida_coords, kat_coords, k=3, max_dist_m=5.0)
+
+All results are in metres on a sphere of radius ``EARTH_R``.
+"""
+
+from __future__ import annotations
+
+from math import atan2, cos, radians, sin, sqrt
+from typing import NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+EARTH_R = 6371000                        # metres – same sphere as compare.py
+
+Coord = Tuple[float, float]              # (lat, lon) helper alias
+
+# nearest_k() works through the query set in blocks of about this many
+# query×point distances (8 MB of float64 per temporary matrix).
+_BLOCK_ELEMS = 1 << 20
+
+
+def haversine_m(p1: Coord, p2: Coord) -> float:
+    """Distance between two ``(lat, lon)`` coordinates in metres."""
+    lat1, lon1 = radians(p1[0]), radians(p1[1])
+    lat2, lon2 = radians(p2[0]), radians(p2[1])
+    dlat, dlon = lat2 - lat1, lon2 - lon1
+    a = sin(dlat/2)**2 + cos(lat1)*cos(lat2)*sin(dlon/2)**2
+    return 2 * EARTH_R * atan2(sqrt(a), sqrt(1-a))
+
+
+def as_radians(coords: Sequence[Coord] | np.ndarray) -> np.ndarray:
+    """``(N, 2)`` float array of ``(lat, lon)`` in radians."""
+    arr = np.asarray(coords, dtype=np.float64)
+    if arr.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    if arr.ndim != 2 or arr.shape[1] != 2:
+        raise ValueError(f"expected (N, 2) coordinates, got shape {arr.shape}")
+    return np.radians(arr)
+
+
+def _haversine_rad(lat1, lon1, lat2, lon2) -> np.ndarray:
+    # Broadcasting core shared by the array functions; inputs in radians.
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_R * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def haversine_pairs(a: Sequence[Coord] | np.ndarray, b: Sequence[Coord] | np.ndarray) -> np.ndarray:
+    """Element-wise distances between ``a[i]`` and ``b[i]``; shape ``(N,)``."""
+    ra, rb = as_radians(a), as_radians(b)
+    if len(ra) != len(rb):
+        raise ValueError(f"length mismatch: {len(ra)} vs {len(rb)} coordinates")
+    return _haversine_rad(ra[:, 0], ra[:, 1], rb[:, 0], rb[:, 1])
+
+
+def haversine_matrix(a: Sequence[Coord] | np.ndarray, b: Sequence[Coord] | np.ndarray) -> np.ndarray:
+    """All distances from each of *a* to each of *b*; shape ``(len(a), len(b))``.
+
+    Memory grows with ``len(a) * len(b)`` – use :func:`nearest_k` when only
+    the closest points are needed.
+    """
+    ra, rb = as_radians(a), as_radians(b)
+    return _haversine_rad(ra[:, 0:1], ra[:, 1:2], rb[:, 0], rb[:, 1])
+
+
+class Nearest(NamedTuple):
+    """Result of :func:`nearest_k`; rows follow the query order, nearest first."""
+    indices: np.ndarray    # (N, k) int – positions in *points*, -1 where none
+    distances: np.ndarray  # (N, k) float metres – inf where none
+
+
+def nearest_k(
+    query: Sequence[Coord] | np.ndarray,
+    points: Sequence[Coord] | np.ndarray,
+    k: int = 1,
+    max_dist_m: float | None = None,
+) -> Nearest:
+    """The *k* points closest to each query coordinate.
+
+    Columns beyond the number of points – or farther than *max_dist_m* –
+    hold index ``-1`` and distance ``inf``.  Equal distances within a row
+    are ordered by point index.  The query set is processed in blocks so the
+    temporary distance matrix stays small however many points there are.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    rq, rp = as_radians(query), as_radians(points)
+    n, m = len(rq), len(rp)
+    indices = np.full((n, k), -1, dtype=np.intp)
+    distances = np.full((n, k), np.inf)
+    if n == 0 or m == 0:
+        return Nearest(indices, distances)
+
+    take = min(k, m)
+    block = max(1, _BLOCK_ELEMS // m)
+    for start in range(0, n, block):
+        q = rq[start:start + block]
+        d = _haversine_rad(q[:, 0:1], q[:, 1:2], rp[:, 0], rp[:, 1])
+        if take < m:
+            part = np.argpartition(d, take - 1, axis=1)[:, :take]
+        else:
+            part = np.broadcast_to(np.arange(m), d.shape)
+        part_d = np.take_along_axis(d, part, axis=1)
+        order = np.lexsort((part, part_d), axis=1)
+        idx = np.take_along_axis(part, order, axis=1)
+        dist = np.take_along_axis(part_d, order, axis=1)
+        if max_dist_m is not None:
+            far = dist > max_dist_m
+            idx = np.where(far, -1, idx)
+            dist = np.where(far, np.inf, dist)
+        indices[start:start + len(q), :take] = idx
+        distances[start:start + len(q), :take] = dist
+    return Nearest(indices, distances)
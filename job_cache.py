@@ -0,0 +1,178 @@
+"""
+job_cache.py – on-disk cache of the tables extracted from SPIDA/Katapult files.
+
+QC work re-opens the same job files many times a day; parsing a large export
+and walking it for rows dominates ``compare()``. ``JobCache`` stores the
+extracted rows (as plain tuples) and service-drop sets (see
+``compare._extract_spida`` / ``compare._extract_katapult``) as pickles next
+to a schema version, so a repeat run of an unchanged file skips parsing
+entirely.
+
+Entries are keyed by file size + mtime + a BLAKE2 hash of the content and
+evicted least-recently-used once the directory grows past ``max_bytes``.
+
+Usage:
+    cache = JobCache()                       # default per-user cache folder
+    df = compare(spida_path, kat_path, cache=cache)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from . import json_codec
+except ImportError:
+    import json_codec
+
+# Bump whenever the extracted table layout changes – older entries are ignored
+CACHE_SCHEMA = 3
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_HASH_CHUNK = 1 << 20
+_SUFFIX = ".pkl"
+
+
+def default_cache_dir() -> Path:
+    """``$QUIC_CACHE_DIR``, else the platform's per-user cache folder."""
+    env = os.environ.get("QUIC_CACHE_DIR")
+    if env:
+        return Path(env)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "QuiC" / "cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "QuiC"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "quic"
+
+
+class JobCache:
+    """Directory of pickled extraction results, LRU-evicted by total size."""
+
+    def __init__(self, root: Path | str | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        # (path, size, mtime_ns) → content digest, so an unchanged file is
+        # hashed once per session rather than on every lookup
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # keys
+    # ------------------------------------------------------------------
+    def key(self, path: Path | str, kind: str) -> str:
+        """Cache key for *path* extracted as *kind* (``"spida"``/``"katapult"``)."""
+        path = Path(path)
+        st = path.stat()
+        memo = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(memo)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=20)
+            h.update(f"{st.st_size}:{st.st_mtime_ns}:".encode())
+            with path.open("rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            with self._lock:
+                self._digests[memo] = digest
+        return f"{kind}-v{CACHE_SCHEMA}-{digest}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}{_SUFFIX}"
+
+    # ------------------------------------------------------------------
+    # lookups
+    # ------------------------------------------------------------------
+    def contains(self, path: Path | str, kind: str) -> bool:
+        """True when an entry exists for the current contents of *path*."""
+        try:
+            return self._entry_path(self.key(path, kind)).is_file()
+        except OSError:
+            return False
+
+    def get(self, path: Path | str, kind: str) -> Optional[Any]:
+        """Return the cached tables for *path*, or None on a miss.
+
+        Unreadable or outdated entries are deleted and count as a miss.
+        """
+        try:
+            entry_path = self._entry_path(self.key(path, kind))
+        except OSError:
+            return None  # unreadable source – let the loader report it
+        try:
+            with entry_path.open("rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            with contextlib.suppress(OSError):
+                entry_path.unlink()
+            return None
+
+        if not isinstance(entry, dict) or entry.get("schema") != CACHE_SCHEMA or entry.get("kind") != kind:
+            with contextlib.suppress(OSError):
+                entry_path.unlink()
+            return None
+
+        # mark as recently used for LRU eviction
+        with contextlib.suppress(OSError):
+            os.utime(entry_path)
+        return entry["tables"]
+
+    def put(self, path: Path | str, kind: str, tables: Any) -> None:
+        """Store *tables* for *path*, then evict old entries if over budget.
+
+        Failures (read-only folder, full disk) are ignored – the cache is
+        an optimisation, never a requirement.
+        """
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            entry = {"schema": CACHE_SCHEMA, "kind": kind, "source": str(path), "tables": tables}
+            with json_codec.open_atomic(self._entry_path(self.key(path, kind))) as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.evict()
+        except OSError as e:
+            print(f"⚠️  Job cache write skipped: {e}")
+
+    # ------------------------------------------------------------------
+    # housekeeping
+    # ------------------------------------------------------------------
+    def size(self) -> int:
+        """Total bytes held by cache entries."""
+        return sum(st.st_size for _, st in self._entries())
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least-recently-used entries until under *max_bytes*; returns count removed."""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime_ns)
+        total = sum(st.st_size for _, st in entries)
+        removed = 0
+        for entry_path, st in entries:
+            if total <= budget:
+                break
+            with contextlib.suppress(OSError):
+                entry_path.unlink()
+                total -= st.st_size
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        self.evict(0)
+
+    def _entries(self):
+        if not self.root.is_dir():
+            return []
+        out = []
+        for entry_path in self.root.glob(f"*{_SUFFIX}"):
+            with contextlib.suppress(OSError):
+                out.append((entry_path, entry_path.stat()))
+        return out
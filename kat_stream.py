@@ -0,0 +1,200 @@
+"""
+kat_stream.py – incremental Katapult job extractor.
+
+``compare()`` only needs a handful of node attributes, the connection
+topology and the birthmark blocks, yet a Katapult export also carries
+photos, traces and history that can be hundreds of MB.  This module streams
+the export with ``ijson`` and keeps just the projected fields, so peak
+memory scales with the number of poles rather than with the file size.
+
+The result is a compact document with the same shape ``compare()`` reads::
+
+    {"nodes": {...}, "connections": {...}, "birthmark": {...}}
+
+When ``ijson`` is not installed the file is parsed in full and projected
+afterwards – same output, without the memory saving.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import ijson
+except ImportError:  # optional dependency
+    ijson = None
+
+try:
+    from . import json_codec
+except ImportError:
+    import json_codec
+
+# Node attributes read by compare(); keys mentioning "birthmark"/"spec" are
+# kept as well because compare() scans for those by name.
+NODE_ATTRS = frozenset({
+    "scid",
+    "node_type",
+    "node_sub_type",
+    "measured_attachments",
+    "DLOC_number",
+    "pole_tag",
+    "pole_spec",
+    "pole_height",
+    "poleLength",
+    "Height",
+    "pole_class",
+    "Class",
+    "pole_species",
+    "Species",
+    "existing_capacity_%",
+    "final_passing_capacity_%",
+    "latitude",
+    "longitude",
+})
+
+CONNECTION_ATTRS = frozenset({"connection_type"})
+
+
+def _keep_node_attr(key: str) -> bool:
+    lowered = key.lower()
+    return key in NODE_ATTRS or "birthmark" in lowered or "spec" in lowered
+
+
+def project_node(node: Any) -> dict:
+    """Return a node reduced to the attributes compare() reads."""
+    if not isinstance(node, dict):
+        return {"attributes": {}}
+    attrs = node.get("attributes") or {}
+    return {"attributes": {k: v for k, v in attrs.items() if _keep_node_attr(k)}}
+
+
+def project_connection(conn: Any) -> dict:
+    """Return a connection reduced to its end nodes, section ids and type."""
+    if not isinstance(conn, dict):
+        return {}
+    out: Dict[str, Any] = {}
+    for key in ("node_id_1", "node_id_2"):
+        if key in conn:
+            out[key] = conn[key]
+    out["sections"] = dict.fromkeys(conn.get("sections") or {})
+    attrs = conn.get("attributes") or {}
+    out["attributes"] = {k: v for k, v in attrs.items() if k in CONNECTION_ATTRS}
+    return out
+
+
+def project_job(kat: dict, birthmarks: dict | None = None) -> dict:
+    """Project an already-parsed Katapult job down to the compact document.
+
+    *birthmarks* is the merged birthmark index; it is stored last so that
+    later walks over the compact document end on the authoritative values.
+    """
+    return {
+        "nodes": {nid: project_node(n) for nid, n in (kat.get("nodes") or {}).items()},
+        "connections": {
+            cid: project_connection(c) for cid, c in (kat.get("connections") or {}).items()
+        },
+        "birthmark": birthmarks if birthmarks is not None else {},
+    }
+
+
+def _index_birthmarks(kat: dict) -> dict:
+    # late import – compare imports this module
+    try:
+        from .compare import _index_birthmarks as index
+    except ImportError:
+        from compare import _index_birthmarks as index
+    return index(kat)
+
+
+def _stream_extract(f) -> dict:
+    """Single ijson pass collecting projected nodes/connections and birthmarks."""
+    targets = {"nodes": project_node, "connections": project_connection}
+    sections: Dict[str, dict] = {"nodes": {}, "connections": {}}
+    birthmarks: dict = {}
+
+    depth = 0                      # number of open containers
+    top_key = None                 # current top-level key
+    item_key = None                # id of the node/connection being built
+    item = None                    # ObjectBuilder for that entry
+    item_level = 0
+    bm = None                      # ObjectBuilder for a birthmark value
+    bm_level = 0
+    start_item = start_bm = False
+
+    for event, value in ijson.basic_parse(f, use_float=True):
+        if event == "map_key":
+            if item is not None:
+                item.event(event, value)
+            if bm is not None:
+                bm.event(event, value)
+            if depth == 1:
+                top_key = value
+            elif depth == 2 and top_key in targets:
+                item_key = value
+                start_item = True
+            # a birthmark's value is never searched for nested birthmarks
+            if value == "birthmark" and bm is None:
+                start_bm = True
+            continue
+
+        if event == "start_map" or event == "start_array":
+            if start_item:
+                item, item_level, start_item = ijson.ObjectBuilder(), depth, False
+            if start_bm:
+                bm, bm_level, start_bm = ijson.ObjectBuilder(), depth, False
+            if item is not None:
+                item.event(event, value)
+            if bm is not None:
+                bm.event(event, value)
+            depth += 1
+            continue
+
+        if event == "end_map" or event == "end_array":
+            depth -= 1
+            if item is not None:
+                item.event(event, value)
+                if depth == item_level:
+                    sections[top_key][item_key] = targets[top_key](item.value)
+                    item = None
+            if bm is not None:
+                bm.event(event, value)
+                if depth == bm_level:
+                    if isinstance(bm.value, dict):
+                        birthmarks.update(bm.value)
+                    bm = None
+            continue
+
+        # scalar value
+        if item is not None:
+            item.event(event, value)
+        if bm is not None:
+            bm.event(event, value)
+        if start_item:
+            sections[top_key][item_key] = targets[top_key](value)
+            start_item = False
+        start_bm = False
+
+    return {
+        "nodes": sections["nodes"],
+        "connections": sections["connections"],
+        "birthmark": birthmarks,
+    }
+
+
+def extract_katapult(path: Path | str, stream: bool | None = None) -> dict:
+    """Return the compact Katapult document for the job file at *path*.
+
+    ``stream=None`` streams whenever ``ijson`` is available; ``False``
+    forces a full parse followed by projection.
+    """
+    if stream is None:
+        stream = ijson is not None
+    if stream:
+        if ijson is None:
+            raise ImportError("streaming Katapult extraction requires the 'ijson' package")
+        with Path(path).open("rb") as f:
+            return _stream_extract(f)
+
+    kat = json_codec.load_path(path)
+    return project_job(kat, _index_birthmarks(kat))
@@ -2,18 +2,26 @@
 GUI.desktop main – Tkinter GUI application for SPIDA ↔ Katapult Comparer.
 Launch with:
     python -m gui.main
+
+Only Tk/ttkbootstrap are imported up front so the window appears quickly;
+pandas, the compare engine and the map load on a background thread once it
+is on screen (see ``DEFERRED_MODULES``).
 """
 
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import tkintermapview as tkm
 from pathlib import Path
-import pandas as pd
-import json
+import importlib
 import traceback
 import sys
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageDraw, ImageTk
 
 # Ensure project root is on sys.path so sibling modules (compare.py, spida_writer.py) resolve
@@ -27,12 +35,44 @@ else:
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-try:
-    from .compare import compare, haversine_m
-    from .spida_writer import apply_edit
-except ImportError:
-    from compare import compare, haversine_m
-    from spida_writer import apply_edit
+# QuiC's own modules, imported relative to the package when run as one
+_SIBLING_MODULES = {"compare", "spida_writer", "exporter", "job_cache", "map_layer",
+                    "tile_cache", "json_codec"}
+
+# Heavy imports (≈0.6 s, much more in the frozen build) loaded by
+# CompareApp._start_deferred_imports after the window is shown, in this order
+DEFERRED_MODULES = ("pandas", "json_codec", "job_cache", "compare", "exporter",
+                    "spida_writer", "tkintermapview", "map_layer", "tile_cache")
+
+
+def _import(name: str):
+    if __package__ and name in _SIBLING_MODULES:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+class _LazyModule:
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = _import(self._name)
+        return getattr(self._module, attr)
+
+
+pd = _LazyModule("pandas")
+tkm = _LazyModule("tkintermapview")
+compare = _LazyModule("compare")
+spida_writer = _LazyModule("spida_writer")
+exporter = _LazyModule("exporter")
+job_cache = _LazyModule("job_cache")
+map_layer = _LazyModule("map_layer")
+tile_cache = _LazyModule("tile_cache")
+json_codec = _LazyModule("json_codec")
 
 # Replace previous import of EditableTree with robust fallback
 try:
@@ -41,6 +81,64 @@ except ImportError:  # when run as script via path
     from editable_tree import EditableTree
 
 
+# How often the Tk loop checks the worker queue (ms)
+WORKER_POLL_MS = 100
+
+# Status-bar text for each compare() stage
+COMPARE_STAGE_LABELS = {
+    "load_spida": "📊 Loading SPIDA data...",
+    "load_katapult": "⚡ Loading Katapult data...",
+    "build_tables": "🧮 Building lookup tables...",
+    "tier_matching": "🔍 Matching poles (SCID → Pole # → coordinates)...",
+    "build_frame": "📋 Building comparison table...",
+}
+
+
+# Table columns the user may edit inline; edits are written back on save
+EDITABLE_COLS = ("SPIDA Pole Spec", "SPIDA Existing %", "SPIDA Final %", "Com Drop? (SPIDA)")
+
+# Table cells that get a ❌ marker when their match flag is False
+MISMATCH_INDICATORS = {
+    "SPIDA Pole Spec": "Spec Match",
+    "Katapult Pole Spec": "Spec Match",
+    "SPIDA Existing %": "Existing % Match", 
+    "Katapult Existing %": "Existing % Match",
+    "SPIDA Final %": "Final % Match",
+    "Katapult Final %": "Final % Match",
+    "Com Drop? (SPIDA)": "Charter Drop Match",
+    "Com Drop? (Kat)": "Charter Drop Match"
+}
+
+
+def build_display_rows(df: pd.DataFrame, columns: list[str]) -> list[list[str]]:
+    """Return the table's display strings for *columns*, one list per row.
+
+    Formatting is done column-wise: blanks for missing values, Yes/No for
+    the SPIDA Com Drop column and a ❌ prefix where the matching flag in
+    :data:`MISMATCH_INDICATORS` is False.
+    """
+    text_cols = []
+    for col in columns:
+        values = df[col]
+        missing = values.isna()
+        text = values.astype(object).where(~missing, "").astype(str)
+
+        # Convert True/False to Yes/No for Com Drop (SPIDA) column
+        if col == "Com Drop? (SPIDA)":
+            lowered = text.str.lower()
+            text = text.mask(lowered == "true", "Yes").mask(lowered == "false", "No")
+
+        # Mark cells whose comparison flag says the two sides differ
+        match_col = MISMATCH_INDICATORS.get(col)
+        if match_col in df.columns:
+            mismatch = df[match_col].astype(str).str.lower() == "false"
+            marked = ("❌ " + text).where(text != "", "❌ [Empty]")
+            text = text.mask(mismatch, marked)
+
+        text_cols.append(text.tolist())
+    return [list(row) for row in zip(*text_cols)] if text_cols else [[] for _ in range(len(df))]
+
+
 # ------------------------------------------------------------------
 # Map icon creation utilities
 # ------------------------------------------------------------------
@@ -62,19 +160,20 @@ def make_circle_icon(radius_px=4,
 # Create circle icons for each match tier (keep global refs to prevent GC)
 TIER_CIRCLE_ICONS = {}
 
+# (fill, outline) per match tier – pole circles and cluster markers
+TIER_COLOURS = {
+    "scid":               ("#00c853", "#006644"),  # green - exact SCID match
+    "pole_num":           ("#2979ff", "#1a237e"),  # blue - pole number match
+    "coord_direct":       ("#ffb300", "#ff6f00"),  # amber - coordinate < 1m
+    "coord_spec_verified":("#ff9800", "#e65100"),  # orange - coordinate + spec verified
+    "katapult_only":      ("#d500f9", "#6a0080"),  # purple - Katapult only
+    "unmatched":          ("#d50000", "#b71c1c"),  # red - unmatched SPIDA
+}
+
 def init_circle_icons():
     """Initialize circle icons for each match tier color."""
     global TIER_CIRCLE_ICONS
-    tier_colours = {
-        "scid":               ("#00c853", "#006644"),  # green - exact SCID match
-        "pole_num":           ("#2979ff", "#1a237e"),  # blue - pole number match
-        "coord_direct":       ("#ffb300", "#ff6f00"),  # amber - coordinate < 1m
-        "coord_spec_verified":("#ff9800", "#e65100"),  # orange - coordinate + spec verified
-        "katapult_only":      ("#d500f9", "#6a0080"),  # purple - Katapult only
-        "unmatched":          ("#d50000", "#b71c1c"),  # red - unmatched SPIDA
-    }
-    
-    for tier, (fill, outline) in tier_colours.items():
+    for tier, (fill, outline) in TIER_COLOURS.items():
         TIER_CIRCLE_ICONS[tier] = make_circle_icon(
             radius_px=4,
             fill=fill,
@@ -338,23 +437,24 @@ class CompareApp(ttk.Window):
         )
         
         print("🎨 Setting up window...")
-        # Set app icon and styling
-        self.iconify()
-        self.deiconify()
-        
-        # Center window on screen
-        self.center_window()
-
-        print("🔘 Initializing circle icons...")
-        # Initialize circle icons for map markers
-        init_circle_icons()
+        # Center window on screen (from the requested size – no layout pass)
+        self.center_window(1500, 900)
 
         print("💾 Initializing data storage...")
         # Initialize data storage
         self.spida_path: Path | None = None
         self.kat_path: Path | None = None
         self.df: pd.DataFrame | None = None
-        self.spida_data: dict | None = None  # Store original SPIDA data for editing
+        self.spida_data: dict | None = None  # Original SPIDA document, from compare or the first save
+        self.job_cache = None  # JobCache, created with the pipeline
+        self._pipeline = None  # ComparePipeline, created on first use (see pipeline)
+        self._spida_index = None  # SCID → location index over spida_data (built on first save)
+        self.edits: dict = {}  # (SCID, column) → edited value, applied on save
+
+        # Background worker (one job at a time) for long-running operations
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quic-worker")
+        self._worker = None
+        self._worker_cancel = threading.Event()
 
         print("🖼️ Setting up icon...")
         # Define icon path
@@ -363,16 +463,64 @@ class CompareApp(ttk.Window):
 
         print("🎮 Creating widgets...")
         self.create_widgets()
+        # pandas, the compare engine and the map load once the window is up
+        self.after_idle(self._start_deferred_imports)
         print("✅ CompareApp initialization complete")
 
+    @property
+    def pipeline(self) -> compare.ComparePipeline:
+        """Comparison stages, kept between runs (created on first use)."""
+        if self._pipeline is None:
+            # extracted rows per file – unchanged files skip parsing
+            self.job_cache = job_cache.JobCache()
+            # Stage results are kept between runs: re-loading one file re-runs only its side
+            # $QUIC_EXTRACT_WORKERS > 1 extracts large Katapult jobs across processes
+            # (forkserver/spawn workers here – forking next to the Tk threads can deadlock)
+            self._pipeline = compare.ComparePipeline(
+                stream_katapult=True, cache=self.job_cache,
+                extract_workers=compare.default_extract_workers(),
+                keep_spida_document=True,
+            )
+        return self._pipeline
+
+    def _start_deferred_imports(self):
+        """Import DEFERRED_MODULES on a background thread, then build the map."""
+        done = threading.Event()
+        started = time.perf_counter()
+
+        def run():
+            for name in DEFERRED_MODULES:
+                try:
+                    _import(name)
+                except Exception as e:  # reported again where the module is used
+                    print(f"⚠️  Deferred import of {name} failed: {e}")
+            done.set()
+
+        threading.Thread(target=run, name="quic-imports", daemon=True).start()
+        self.after(WORKER_POLL_MS, self._poll_deferred_imports, done, started)
+
+    def _poll_deferred_imports(self, done: threading.Event, started: float):
+        if not done.is_set():
+            self.after(WORKER_POLL_MS, self._poll_deferred_imports, done, started)
+            return
+        print(f"📦 Background modules loaded in {time.perf_counter() - started:.2f}s")
+        self.create_map()
+
     # ------------------------------------------------------------------
     # basic window helpers
     # ------------------------------------------------------------------
-    def center_window(self):
-        """Center the application window on the screen."""
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
+    def destroy(self):
+        """Stop any background job before tearing the window down."""
+        self._worker_cancel.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if getattr(self, 'map_layer', None):
+            self.map_layer.stop()
+        if getattr(self, 'tile_cache', None):
+            self.tile_cache.flush()
+        super().destroy()
+
+    def center_window(self, width: int, height: int):
+        """Center a *width* × *height* application window on the screen."""
         x = (self.winfo_screenwidth() // 2) - (width // 2)
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f"{width}x{height}+{x}+{y}")
@@ -453,7 +601,17 @@ class CompareApp(ttk.Window):
             style="success.TButton",
             width=22
         )
-        self.compare_btn.pack()
+        self.compare_btn.pack(pady=(0, 8))
+        
+        self.cancel_btn = ttk.Button(
+            analysis_card, 
+            text="⛔ Cancel", 
+            command=self.cancel_compare, 
+            state=DISABLED, 
+            style="secondary.TButton",
+            width=22
+        )
+        self.cancel_btn.pack()
         
         # Export card  
         export_card = ttk.Labelframe(toolbar_frame, text="📤 Export", padding=15)
@@ -461,7 +619,7 @@ class CompareApp(ttk.Window):
         
         self.export_btn = ttk.Button(
             export_card, 
-            text="📈 Export Excel", 
+            text="📈 Export Data", 
             command=self.export_xlsx, 
             state=DISABLED,
             width=15
@@ -514,15 +672,17 @@ class CompareApp(ttk.Window):
 
         self.tree = EditableTree(
             tree_container,
-            editable_cols={"SPIDA Pole Spec", "SPIDA Existing %", "SPIDA Final %", "Com Drop? (SPIDA)"},
+            editable_cols=set(EDITABLE_COLS),
+            on_edit=self._on_cell_edit,
             show="headings",
             height=18,
         )
         
-        # Enhanced scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_container, orient=VERTICAL, command=self.tree.yview)
+        # Enhanced scrollbars (vertical one spans every row, not just the loaded window)
+        v_scrollbar = ttk.Scrollbar(tree_container, orient=VERTICAL)
         h_scrollbar = ttk.Scrollbar(tree_container, orient=HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.attach_yscrollbar(v_scrollbar)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
         
         self.tree.grid(row=0, column=0, sticky="nsew")
         v_scrollbar.grid(row=0, column=1, sticky="ns")
@@ -557,37 +717,81 @@ class CompareApp(ttk.Window):
             style="secondary.TButton"
         ).pack(side=RIGHT, padx=(5, 0))
         
-        # Map widget container
-        map_container = ttk.Frame(map_frame, relief="sunken", borderwidth=1)
-        map_container.pack(fill=BOTH, expand=YES)
+        self.tiles_btn = ttk.Button(
+            map_controls,
+            text="📥 Save Tiles Offline",
+            command=self.prefetch_map_tiles,
+            style="secondary.TButton"
+        )
+        self.tiles_btn.pack(side=RIGHT, padx=(5, 0))
+        
+        # Map widget container – the map itself is built by create_map() once
+        # tkintermapview has loaded in the background
+        self.map_container = ttk.Frame(map_frame, relief="sunken", borderwidth=1)
+        self.map_container.pack(fill=BOTH, expand=YES)
+        self.map_widget = None
+        self.map_layer = None
+        self.tile_cache = None
+        self._map_placeholder = ttk.Label(
+            self.map_container,
+            text="🗺️ Loading map...",
+            foreground="#b9bbbe",
+            font=("Segoe UI", 10)
+        )
+        self._map_placeholder.pack(expand=YES)
+
+        # Add panes to main container
+        main_paned.add(table_frame, weight=3)
+        main_paned.add(map_frame, weight=2)
         
+    def create_map(self):
+        """Build the map widget, its pole layer and the tile cache."""
+        self._map_placeholder.destroy()
         try:
+            # Initialize circle icons for map markers
+            init_circle_icons()
             self.map_widget = tkm.TkinterMapView(
-                map_container, 
+                self.map_container, 
                 width=800, 
                 height=350, 
                 corner_radius=8
             )
             self.map_widget.pack(fill=BOTH, expand=YES, padx=2, pady=2)
+            # Clustered, viewport-culled pole markers (see map_layer.py)
+            self.map_layer = map_layer.PoleMapLayer(
+                self.map_widget, TIER_CIRCLE_ICONS,
+                on_click=self._show_pole_details, tier_colors=TIER_COLOURS,
+            )
+            # Tiles are read from / saved to the on-disk tile cache
+            try:
+                self.tile_cache = tile_cache.TileCache()
+                if not self.tile_cache.attach(self.map_widget):
+                    # tkintermapview internals changed – keep its own tile loading
+                    print("⚠️  Tile cache not attached: unsupported tkintermapview version")
+                    self.tile_cache.close()
+                    self.tile_cache = None
+            except Exception as e:
+                print(f"⚠️  Tile cache unavailable: {e}")
+                self.tile_cache = None
         except Exception as e:
             error_label = ttk.Label(
-                map_container, 
+                self.map_container, 
                 text=f"🗺️ Map widget unavailable: {e}", 
                 foreground="#f04747",
                 font=("Segoe UI", 10)
             )
             error_label.pack(expand=YES)
             self.map_widget = None
+            self.map_layer = None
+            self.tile_cache = None
+        # a comparison may have finished before the map was ready
+        if self.df is not None:
+            self.update_map()
 
-        # Add panes to main container
-        main_paned.add(table_frame, weight=3)
-        main_paned.add(map_frame, weight=2)
-        
     def fit_map_to_markers(self):
         """Helper method to fit map view to all markers."""
-        if hasattr(self, 'map_widget') and self.map_widget:
-            # This would be called from update_map() when we have marker data
-            pass
+        if getattr(self, 'map_layer', None):
+            self.map_layer.fit()
 
     # ------------------------------------------------------------------
     # file loading helpers
@@ -596,46 +800,56 @@ class CompareApp(ttk.Window):
         filetypes = [("JSON files", "*.json"), ("All files", "*.*")]
         filename = filedialog.askopenfilename(title="Select SPIDA JSON file", filetypes=filetypes)
         if filename:
-            try:
-                self.progress.start(10)
-                self.status_label.config(text="📊 Loading SPIDA data...")
-                self.update()
-                
-                self.spida_path = Path(filename)
-                with open(self.spida_path, "r", encoding="utf-8") as f:
-                    self.spida_data = json.load(f)
-                
-                self.progress.stop()
-                self.status_label.config(text=f"✅ SPIDA loaded: {self.spida_path.name}")
-                self.check_ready_to_compare()
-            except Exception as e:
-                self.progress.stop()
-                messagebox.showerror("Error", f"Failed to load SPIDA file:\n{e}")
-                self.spida_path = None
-                self.spida_data = None
-                self.status_label.config(text="❌ Failed to load SPIDA file")
+            self._load_job_file("spida", Path(filename))
 
     def load_katapult(self):
         filetypes = [("JSON files", "*.json"), ("All files", "*.*")]
         filename = filedialog.askopenfilename(title="Select Katapult JSON file", filetypes=filetypes)
         if filename:
-            try:
-                self.progress.start(10)
-                self.status_label.config(text="⚡ Loading Katapult data...")
-                self.update()
-                
-                self.kat_path = Path(filename)
-                with open(self.kat_path, "r", encoding="utf-8") as f:
-                    json.load(f)
-                
-                self.progress.stop()
-                self.status_label.config(text=f"✅ Katapult loaded: {self.kat_path.name}")
-                self.check_ready_to_compare()
-            except Exception as e:
-                self.progress.stop()
-                messagebox.showerror("Error", f"Failed to load Katapult file:\n{e}")
-                self.kat_path = None
-                self.status_label.config(text="❌ Failed to load Katapult file")
+            self._load_job_file("katapult", Path(filename))
+
+    def _load_job_file(self, kind: str, path: Path):
+        """Check *path* and look it up in the job cache on the worker, then use it.
+
+        Parsing happens on the worker during compare (or not at all on a
+        cache hit); the SPIDA document itself is only needed when saving.
+        """
+        if self._worker is not None:
+            messagebox.showinfo("Busy", "Please wait for the running task to finish.")
+            return
+        cache = self.pipeline.cache  # the JobCache, created along with the pipeline
+
+        def task(report, cancel):
+            json_codec.check_object_file(path)  # reads a few KB, not the document
+            # hashes the file; the digest is remembered, so compare doesn't redo it
+            return cache.contains(path, kind)
+
+        label = "SPIDA" if kind == "spida" else "Katapult"
+        self.status_label.config(text=f"📂 Checking {label} file: {path.name}...")
+        self._start_worker(
+            task,
+            on_done=lambda cached: self._on_load_done(kind, path, cached),
+            on_error=lambda exc, tb: self._on_load_error(label, path, exc),
+        )
+
+    def _on_load_done(self, kind: str, path: Path, cached: bool):
+        if kind == "spida":
+            self.spida_path = path
+            self.pipeline.set_spida(path)
+            self.spida_data = None
+            self._spida_index = None
+            label = "SPIDA"
+        else:
+            self.kat_path = path
+            self.pipeline.set_katapult(path)
+            label = "Katapult"
+        note = " (cached)" if cached else ""
+        self.status_label.config(text=f"✅ {label} loaded{note}: {path.name}")
+        self.check_ready_to_compare()
+
+    def _on_load_error(self, label: str, path: Path, exc: BaseException):
+        self.status_label.config(text=f"❌ {label} file not loaded: {path.name}")
+        messagebox.showerror("Load Error", f"Failed to load {label} JSON file:\n{exc}")
 
     def check_ready_to_compare(self):
         if self.spida_path and self.kat_path:
@@ -651,102 +865,78 @@ class CompareApp(ttk.Window):
         if not self.spida_path or not self.kat_path:
             messagebox.showwarning("Warning", "Please load both SPIDA and Katapult files first.")
             return
+        if self._worker is not None:
+            return
+        pipeline = self.pipeline
+
+        self.compare_btn.config(state=DISABLED)
+        self.cancel_btn.config(state=NORMAL)
+        self.progress.stop()
+        self.progress.config(mode="determinate", maximum=len(compare.COMPARE_STAGES), value=0)
+        self.status_label.config(text="🔍 Analyzing and comparing datasets...")
+        self._start_worker(
+            lambda report, cancel: self._compare_job(pipeline, report, cancel),
+            on_done=self._on_compare_done,
+            on_error=self._on_compare_error,
+            on_progress=self._on_compare_progress,
+        )
+
+    def cancel_compare(self):
+        """Ask the running comparison to stop at its next checkpoint."""
+        if self._worker is not None:
+            self._worker_cancel.set()
+            self.cancel_btn.config(state=DISABLED)
+            self.status_label.config(text="⛔ Cancelling comparison...")
+
+    @staticmethod
+    def _compare_job(pipeline: compare.ComparePipeline, report, cancel) -> pd.DataFrame:
+        """Worker-thread half of run_compare – no Tk calls allowed in here."""
+        # Unchanged stages are reused; Katapult is streamed and both files go
+        # through the job cache
+        df = pipeline.run(progress=report, cancel=cancel)
+
+        # ---- rename / reorder columns per README ----
+        df = df.rename(columns=compare.GUI_COLUMN_NAMES)
+        wanted = [
+            "SPIDA SCID #",
+            "Katapult SCID #",
+            "SPIDA Pole #",
+            "Katapult Pole #",
+            "SPIDA Pole Spec",
+            "Katapult Pole Spec",
+            "SPIDA Existing %",
+            "Katapult Existing %",
+            "SPIDA Final %",
+            "Katapult Final %",
+            "Com Drop? (SPIDA)",
+            "Com Drop? (Kat)",
+        ]
+        df = df.reindex(columns=wanted + [c for c in df.columns if c not in wanted])
+        
+        # Recalculate match indicators after column renaming (vectorised, one pass)
+        df[list(compare.MATCH_FLAG_COLUMNS)] = compare.compute_match_flags(df)
+        
+        return df
+
+    def _on_compare_progress(self, stage: str):
+        self.progress.config(value=compare.COMPARE_STAGES.index(stage))
+        self.status_label.config(text=COMPARE_STAGE_LABELS.get(stage, stage))
+
+    def _on_compare_done(self, df: pd.DataFrame):
+        self.cancel_btn.config(state=DISABLED)
+        self.check_ready_to_compare()
         try:
-            self.progress.start(10)
-            self.status_label.config(text="🔍 Analyzing and comparing datasets...")
-            self.update()
-            
-            self.df = compare(self.spida_path, self.kat_path)
-            
-            # ---- rename / reorder columns per README ----
-            rename_map = {
-                "SCID": "SPIDA SCID #",
-                "Katapult SCID #": "Katapult SCID #",
-                "SPIDA Pole #": "SPIDA Pole #",
-                "Katapult Pole #": "Katapult Pole #",
-                "SPIDA Spec": "SPIDA Pole Spec",
-                "Katapult Spec": "Katapult Pole Spec",
-                "SPIDA Existing %": "SPIDA Existing %",
-                "Katapult Existing %": "Katapult Existing %",
-                "SPIDA Final %": "SPIDA Final %",
-                "Katapult Final %": "Katapult Final %",
-                "SPIDA Charter Drop": "Com Drop? (SPIDA)",
-                "Com Drop?": "Com Drop? (Kat)",  # Fix for service drop column
-            }
-            self.df = self.df.rename(columns=rename_map)
-            wanted = [
-                "SPIDA SCID #",
-                "Katapult SCID #",
-                "SPIDA Pole #",
-                "Katapult Pole #",
-                "SPIDA Pole Spec",
-                "Katapult Pole Spec",
-                "SPIDA Existing %",
-                "Katapult Existing %",
-                "SPIDA Final %",
-                "Katapult Final %",
-                "Com Drop? (SPIDA)",
-                "Com Drop? (Kat)",
-            ]
-            self.df = self.df.reindex(columns=wanted + [c for c in self.df.columns if c not in wanted])
-            
-            # Recalculate match indicators after column renaming with data cleaning
-            def clean_value(val):
-                """Clean and normalize values for comparison."""
-                if pd.isna(val) or val is None:
-                    return None
-                val_str = str(val).strip()
-                return val_str if val_str else None
-            
-            def normalize_charter_drop(val):
-                """Normalize charter drop values for comparison (True/False <-> Yes/No)."""
-                if pd.isna(val) or val is None:
-                    return None
-                val_str = str(val).strip().lower()
-                if val_str in ['true', 'yes']:
-                    return 'yes'
-                elif val_str in ['false', 'no']:
-                    return 'no'
-                return val_str
-            
-            def normalize_spec(val):
-                """Normalize pole specifications for comparison by removing formatting differences."""
-                if pd.isna(val) or val is None:
-                    return None
-                val_str = str(val).strip()
-                # Remove prime symbols and normalize spacing
-                normalized = val_str.replace("′", "").replace("'", "")
-                # Normalize multiple spaces to single spaces
-                normalized = " ".join(normalized.split())
-                return normalized.lower() if normalized else None
-            
-            # Recalculate match indicators with cleaned data
-            self.df["Spec Match"] = self.df.apply(
-                lambda row: normalize_spec(row.get("SPIDA Pole Spec")) == normalize_spec(row.get("Katapult Pole Spec")), 
-                axis=1
-            )
-            self.df["Existing % Match"] = self.df.apply(
-                lambda row: clean_value(row.get("SPIDA Existing %")) == clean_value(row.get("Katapult Existing %")), 
-                axis=1
-            )
-            self.df["Final % Match"] = self.df.apply(
-                lambda row: clean_value(row.get("SPIDA Final %")) == clean_value(row.get("Katapult Final %")), 
-                axis=1
-            )
-            self.df["Charter Drop Match"] = self.df.apply(
-                lambda row: normalize_charter_drop(row.get("Com Drop? (SPIDA)")) == normalize_charter_drop(row.get("Com Drop? (Kat)")), 
-                axis=1
-            )
-            
-            # track original editable cols
-            for col in ["SPIDA Pole Spec", "SPIDA Existing %", "SPIDA Final %", "Com Drop? (SPIDA)"]:
-                if col in self.df.columns:
-                    self.df[f"__orig_{col}"] = self.df[col].copy()
-            
+            self.df = df
+            self.edits = {}
+            # the compare worker's parse of SPIDA (None on a cache hit) is reused on save
+            document = self.pipeline.spida_document
+            if document is not None and document is not self.spida_data:
+                self.spida_data, self._spida_index = document, None
+
             # Update UI with results
-            self.progress.stop()
+            self.progress.config(value=len(compare.COMPARE_STAGES))
             self.status_label.config(text="🎨 Updating interface...")
-            self.update()
+            self.update_idletasks()
             
             # refresh UI
             self.populate_tree()
@@ -766,19 +956,69 @@ class CompareApp(ttk.Window):
                 self.df = self.df.drop(columns=["Charter Drop Match"])
                 
         except Exception as e:
-            self.progress.stop()
             messagebox.showerror("Comparison Error", f"Error during comparison:\n{e}\n\n{traceback.format_exc()}")
             self.status_label.config(text="❌ Comparison failed")
 
+    def _on_compare_error(self, exc: BaseException, tb: str):
+        self.cancel_btn.config(state=DISABLED)
+        self.progress.config(value=0)
+        self.check_ready_to_compare()
+        if isinstance(exc, compare.CompareCancelled):
+            self.status_label.config(text="⛔ Comparison cancelled")
+            return
+        messagebox.showerror("Comparison Error", f"Error during comparison:\n{exc}\n\n{tb}")
+        self.status_label.config(text="❌ Comparison failed")
+
+    # ------------------------------------------------------------------
+    # background worker
+    # ------------------------------------------------------------------
+    def _start_worker(self, task, on_done, on_error, on_progress=None):
+        """Run *task(report, cancel)* on the worker thread.
+
+        *report(msg)* queues a progress message for *on_progress*; the result
+        (or exception) is delivered to *on_done* / *on_error* on the Tk thread.
+        A thread is used rather than a process so the parsed JSON documents
+        held by the window are shared instead of pickled.
+        """
+        events: queue.Queue = queue.Queue()
+        self._worker_cancel = threading.Event()
+
+        def report(msg):
+            events.put(("progress", msg))
+
+        def run():
+            try:
+                events.put(("done", task(report, self._worker_cancel)))
+            except BaseException as exc:  # delivered to the Tk thread
+                events.put(("error", (exc, traceback.format_exc())))
+
+        self._worker = self._executor.submit(run)
+        self.after(WORKER_POLL_MS, self._poll_worker, events, on_done, on_error, on_progress)
+
+    def _poll_worker(self, events, on_done, on_error, on_progress):
+        while True:
+            try:
+                kind, payload = events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if on_progress is not None:
+                    on_progress(payload)
+                continue
+            self._worker = None
+            if kind == "done":
+                on_done(payload)
+            else:
+                on_error(*payload)
+            return
+        self.after(WORKER_POLL_MS, self._poll_worker, events, on_done, on_error, on_progress)
+
     # ------------------------------------------------------------------
     # tree handling
     # ------------------------------------------------------------------
     def populate_tree(self):
         if self.df is None:
             return
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         # Filter out internal/analysis columns from display
         display_cols = [c for c in self.df.columns if not c.startswith("__")]
         
@@ -793,7 +1033,7 @@ class CompareApp(ttk.Window):
         
         visible_cols = [c for c in display_cols if c not in hidden_cols]
         
-        self.tree["columns"] = visible_cols
+        self.tree.set_rows(visible_cols, build_display_rows(self.df, visible_cols))
         self.tree["show"] = "headings"
         
         for col in visible_cols:
@@ -809,222 +1049,54 @@ class CompareApp(ttk.Window):
             else:
                 width = 150
             self.tree.column(col, width=width, anchor=CENTER)
-        
-        # Define column pairs and their corresponding match indicators
-        mismatch_indicators = {
-            "SPIDA Pole Spec": "Spec Match",
-            "Katapult Pole Spec": "Spec Match",
-            "SPIDA Existing %": "Existing % Match", 
-            "Katapult Existing %": "Existing % Match",
-            "SPIDA Final %": "Final % Match",
-            "Katapult Final %": "Final % Match",
-            "Com Drop? (SPIDA)": "Charter Drop Match",
-            "Com Drop? (Kat)": "Charter Drop Match"
-        }
-        
-        for idx, row in self.df.iterrows():
-            values = []
-            
-            for col in visible_cols:
-                raw_value = row[col] if pd.notna(row[col]) and row[col] is not None else ""
-                display_value = str(raw_value)
-                
-                # Convert True/False to Yes/No for Com Drop (SPIDA) column
-                if col == "Com Drop? (SPIDA)":
-                    if str(raw_value).lower() == "true":
-                        display_value = "Yes"
-                    elif str(raw_value).lower() == "false":
-                        display_value = "No"
-                    elif raw_value == "":
-                        display_value = ""
-                
-                # Check if this specific column should be highlighted for mismatches
-                if col in mismatch_indicators:
-                    match_col = mismatch_indicators[col]
-                    if match_col in self.df.columns:
-                        is_match = row.get(match_col, True)
-                        if is_match is False or (isinstance(is_match, str) and is_match.lower() == "false"):
-                            display_value = f"❌ {display_value}" if display_value else "❌ [Empty]"
-                
-                values.append(display_value)
-            
-            # Insert the row with normal styling
-            self.tree.insert("", END, values=values)
+
+    def _on_cell_edit(self, row_idx: int, col: str, value: str):
+        """Record an inline edit against its SCID and mirror it into the DataFrame."""
+        if self.df is None or row_idx >= len(self.df):
+            return
+        # Drop the mismatch marker the cell may have been displayed with
+        if value.startswith("❌ "):
+            value = value[2:]
+        if value == "[Empty]":
+            value = ""
+        if col == "Com Drop? (SPIDA)":
+            flag = value.strip().lower() in ("yes", "true")
+            self.df.iat[row_idx, self.df.columns.get_loc(col)] = flag
+            value = str(flag).lower()
+        else:
+            self.df.iat[row_idx, self.df.columns.get_loc(col)] = value
+        scid = self.df.iat[row_idx, self.df.columns.get_loc("SPIDA SCID #")]
+        self.edits[(scid, col)] = value
 
     # ------------------------------------------------------------------
     # map handling with rich visual grammar
     # ------------------------------------------------------------------
     
-    def _mk_circle(self, lat, lon, tooltip_text: str, tier="unmatched"):
-        """
-        Place a small circle marker with an optional click-tooltip.
-        Uses pre-created PhotoImage icons for clean, properly sized markers.
-        """
-        if not self.map_widget:
-            return None
-            
-        # Get the appropriate circle icon for this tier
-        icon = TIER_CIRCLE_ICONS.get(tier, TIER_CIRCLE_ICONS.get("unmatched"))
-        
-        marker = self.map_widget.set_marker(
-            lat, lon,
-            icon=icon,                     # Use the circular PhotoImage
-            text=None                      # No text overlay
-        )
-        
-        # Add tooltip on click
-        if tooltip_text:
-            def show_tooltip(marker_obj):  # Accept the marker argument passed by tkintermapview
-                PoleDetailDialog(self, "Pole Details", tooltip_text, tier)
-            marker.command = show_tooltip
-            
-        return marker
+    def _show_pole_details(self, row_pos: int, tier="unmatched"):
+        """Open the detail dialog for a clicked pole marker (built from its row)."""
+        if self.df is None or row_pos >= len(self.df):
+            return
+        row = self.df.iloc[[row_pos]].to_dict("records")[0]
+        PoleDetailDialog(self, "Pole Details", map_layer.pole_details_text(row), tier)
 
     def update_map(self):
-        """Update map with color-coded markers, connecting lines, and enhanced legend."""
-        if not self.map_widget or self.df is None:
+        """Update map with color-coded markers, connecting lines, and enhanced legend.
+
+        Poles go to the :class:`PoleMapLayer`, which clusters them when zoomed
+        out and only draws what is inside the viewport.  Markers keep just
+        their row position; the detail text is built when one is clicked.
+        """
+        if not self.map_layer or self.df is None:
             return
         
         try:
-            # Clear existing markers and paths
-            self.map_widget.delete_all_marker()
-            self.map_widget.delete_all_path()
-            
-            marker_lats: list[float] = []
-            marker_lons: list[float] = []
-            edges = []  # Store matched pairs for drawing lines
-            
-            stats = {
-                "scid": 0,
-                "pole_num": 0,
-                "coord_direct": 0,
-                "coord_spec_verified": 0,
-                "unmatched_spida": 0,
-                "katapult_only": 0
-            }
-            
             # Color palette for connecting lines (since we can't extract from PhotoImage)
-            tier_line_colors = {
-                "scid": "#00c853",
-                "pole_num": "#2979ff", 
-                "coord_direct": "#ffb300",
-                "coord_spec_verified": "#ff9800",
-                "katapult_only": "#d500f9",
-                "unmatched": "#d50000"
-            }
-            
-            for _, row in self.df.iterrows():
-                tier = row.get("Match Tier", "unmatched")
-                spida_coord = row.get("SPIDA Coord")
-                kat_coord = row.get("Katapult Coord")
-                
-                # Build comprehensive tooltip info from both datasets
-                spida_scid = row.get("SPIDA SCID #") or "—"
-                spida_spec = row.get("SPIDA Pole Spec") or "—"
-                spida_pole = row.get("SPIDA Pole #") or "—"
-                spida_existing = row.get("SPIDA Existing %") or "—"
-                spida_final = row.get("SPIDA Final %") or "—"
-                spida_charter = row.get("Com Drop? (SPIDA)") or "—"
-                
-                kat_scid = row.get("Katapult SCID #") or "—"
-                kat_spec = row.get("Katapult Pole Spec") or "—"
-                kat_pole = row.get("Katapult Pole #") or "—"
-                kat_existing = row.get("Katapult Existing %") or "—"
-                kat_final = row.get("Katapult Final %") or "—"
-                kat_charter = row.get("Com Drop? (Kat)") or "—"
-                
-                # Add match distance info for coordinate matches
-                match_info = ""
-                if tier in ["coord_direct", "coord_spec_verified"]:
-                    distance = row.get("Match Distance (m)")
-                    if distance:
-                        match_info = f"\n\nMatch Distance: {distance}m"
-                
-                # Create comprehensive tooltip showing both datasets
-                def create_comprehensive_tooltip():
-                    tooltip_parts = []
-                    
-                    # Header with match tier
-                    tooltip_parts.append(f"🔍 Match Tier: {tier.replace('_', ' ').title()}")
-                    
-                    # SPIDA data section
-                    if spida_scid != "—" or spida_spec != "—" or spida_pole != "—":
-                        tooltip_parts.append("\n📊 SPIDA Data:")
-                        tooltip_parts.append(f"   SCID: {spida_scid}")
-                        tooltip_parts.append(f"   Pole #: {spida_pole}")
-                        tooltip_parts.append(f"   Spec: {spida_spec}")
-                        tooltip_parts.append(f"   Existing %: {spida_existing}")
-                        tooltip_parts.append(f"   Final %: {spida_final}")
-                        tooltip_parts.append(f"   Charter Drop: {spida_charter}")
-                    
-                    # Katapult data section  
-                    if kat_scid != "—" or kat_spec != "—" or kat_pole != "—":
-                        tooltip_parts.append("\n📋 Katapult Data:")
-                        tooltip_parts.append(f"   SCID: {kat_scid}")
-                        tooltip_parts.append(f"   Pole #: {kat_pole}")
-                        tooltip_parts.append(f"   Spec: {kat_spec}")
-                        tooltip_parts.append(f"   Existing %: {kat_existing}")
-                        tooltip_parts.append(f"   Final %: {kat_final}")
-                        tooltip_parts.append(f"   Charter Drop: {kat_charter}")
-                    
-                    return "\n".join(tooltip_parts) + match_info
-                
-                comprehensive_tooltip = create_comprehensive_tooltip()
-                
-                # Place SPIDA marker if coordinates exist
-                if spida_coord:
-                    self._mk_circle(spida_coord[0], spida_coord[1], comprehensive_tooltip, tier)
-                    marker_lats.append(spida_coord[0])
-                    marker_lons.append(spida_coord[1])
-                
-                # Place Katapult marker if coordinates exist (only if different from SPIDA)
-                if kat_coord and (not spida_coord or kat_coord != spida_coord):
-                    kat_tier = tier if tier != "unmatched" else "katapult_only"
-                    self._mk_circle(kat_coord[0], kat_coord[1], comprehensive_tooltip, kat_tier)
-                    marker_lats.append(kat_coord[0])
-                    marker_lons.append(kat_coord[1])
-                
-                # Collect matched pairs for drawing connecting lines
-                if spida_coord and kat_coord and tier in ["scid", "pole_num", "coord_direct", "coord_spec_verified"]:
-                    line_color = tier_line_colors.get(tier, "#gray")
-                    edges.append((spida_coord, kat_coord, line_color, tier))
-                
-                # Update statistics
-                if tier in stats:
-                    stats[tier] += 1
-                elif tier == "katapult_only":
-                    stats["katapult_only"] += 1
-                else:
-                    stats["unmatched_spida"] += 1
+            tier_line_colors = {tier: fill for tier, (fill, _outline) in TIER_COLOURS.items()}
+            points, edges, stats = map_layer.frame_map_items(self.df, tier_line_colors)
             
-            # Draw connecting lines between matched pairs
-            for spida_coord, kat_coord, color, tier in edges:
-                # Use different line styles for different tiers
-                width = 3 if tier == "scid" else 2
-                self.map_widget.set_path(
-                    [spida_coord, kat_coord], 
-                    width=width, 
-                    color=color
-                )
-            
-            # Auto-zoom to fit all markers
-            if marker_lats and marker_lons:
-                centroid_lat = sum(marker_lats) / len(marker_lats)
-                centroid_lon = sum(marker_lons) / len(marker_lons)
-                lat_span = max(marker_lats) - min(marker_lats)
-                lon_span = max(marker_lons) - min(marker_lons)
-                max_span = max(lat_span, lon_span)
-                
-                # Add padding around the markers
-                desired_coverage = 0.8  # Use 80% of viewport
-                if max_span == 0:
-                    zoom = 18
-                else:
-                    import math
-                    zoom = int(max(3, min(18, math.log2(360.0 / (max_span / desired_coverage)))))
-                
-                self.map_widget.set_position(centroid_lat, centroid_lon)
-                self.map_widget.set_zoom(zoom)
+            # Hand everything to the layer and auto-zoom to fit all markers
+            self.map_layer.set_data(points, edges)
+            self.map_layer.fit()
             
             total_poles = len(self.df)
             print(f"📍 Map updated: {total_poles} poles")
@@ -1035,12 +1107,76 @@ class CompareApp(ttk.Window):
             print(f"   ❌ Unmatched SPIDA: {stats['unmatched_spida']}")
             print(f"   💜 Katapult only: {stats['katapult_only']}")
             print(f"   🔗 Connecting lines: {len(edges)}")
+            print(f"   🧩 Map markers: {len(points)} (clustered below zoom {self.map_layer.detail_zoom})")
             
         except Exception as e:
             print(f"Error updating map: {e}")
             import traceback
             traceback.print_exc()
 
+    def prefetch_map_tiles(self):
+        """Download the map tiles around the current job for offline use."""
+        if self.df is None:
+            messagebox.showwarning("Warning", "No data to map. Please run comparison first.")
+            return
+        if self.tile_cache is None or self._worker is not None:
+            return
+        coords = []
+        for col in ("SPIDA Coord", "Katapult Coord"):
+            if col in self.df.columns:
+                coords.extend(self.df[col].tolist())
+        bbox = tile_cache.coords_bbox(coords)
+        if bbox is None:
+            return
+        cache = self.tile_cache
+        zoom_min, zoom_max = tile_cache.DEFAULT_PREFETCH_ZOOMS
+        confirm_osm = False
+        if cache.is_osm:
+            tiles = min(tile_cache.bbox_tile_count(bbox, zoom_min, zoom_max), tile_cache.PREFETCH_MAX_TILES)
+            confirm_osm = messagebox.askyesno(
+                "Map Tiles",
+                "Map tiles come from OpenStreetMap, whose tile usage policy discourages "
+                "bulk downloads. Set QUIC_TILE_SERVER to a tile server that allows them "
+                "for regular use.\n\n"
+                f"Download up to {tiles} tiles from OpenStreetMap anyway "
+                f"({tile_cache.OSM_PREFETCH_WORKERS} connections at most)?",
+                icon="warning", default="no",
+            )
+            if not confirm_osm:
+                return
+        self.tiles_btn.config(state=DISABLED)
+        self.progress.stop()
+        self.progress.config(mode="determinate", value=0)
+        self.status_label.config(text="📥 Downloading map tiles...")
+        self._start_worker(
+            lambda report, cancel: cache.prefetch(
+                bbox, zoom_min, zoom_max, progress=lambda done, total: report((done, total)), cancel=cancel,
+                confirm_osm=confirm_osm),
+            on_done=self._on_prefetch_done,
+            on_error=self._on_prefetch_error,
+            on_progress=self._on_prefetch_progress,
+        )
+
+    def _on_prefetch_progress(self, counts):
+        done, total = counts
+        self.progress.config(maximum=max(total, 1), value=done)
+        self.status_label.config(text=f"📥 Downloading map tiles... {done}/{total}")
+
+    def _on_prefetch_done(self, result):
+        self.tiles_btn.config(state=NORMAL)
+        self.progress.config(value=0)
+        text = (f"✅ Map tiles saved: {result.downloaded} downloaded, {result.cached} already cached"
+                f" (zoom {tile_cache.DEFAULT_PREFETCH_ZOOMS[0]}–{result.zoom_max})")
+        if result.failed:
+            text += f", {result.failed} failed"
+        self.status_label.config(text=text)
+
+    def _on_prefetch_error(self, exc: BaseException, tb: str):
+        self.tiles_btn.config(state=NORMAL)
+        self.progress.config(value=0)
+        self.status_label.config(text="❌ Tile download failed")
+        messagebox.showerror("Map Tiles", f"Failed to download map tiles:\n{exc}")
+
     # ------------------------------------------------------------------
     # export / save helpers
     # ------------------------------------------------------------------
@@ -1048,32 +1184,51 @@ class CompareApp(ttk.Window):
         if self.df is None:
             messagebox.showwarning("Warning", "No data to export. Please run comparison first.")
             return
+        if self._worker is not None:
+            return
         filename = filedialog.asksaveasfilename(
-            title="Save Excel file", 
+            title="Export comparison", 
             defaultextension=".xlsx", 
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+            filetypes=[
+                ("Excel files", "*.xlsx"),
+                ("CSV files", "*.csv"),
+                ("Parquet files", "*.parquet"),
+                ("Feather files", "*.feather"),
+                ("All files", "*.*"),
+            ]
         )
-        if filename:
-            try:
-                self.progress.start(10)
-                self.status_label.config(text="📈 Exporting to Excel...")
-                self.update()
-                
-                export_cols = [c for c in self.df.columns if not c.startswith("__") and "Coord" not in c]
-                self.df[export_cols].to_excel(filename, index=False)
-                
-                self.progress.stop()
-                self.status_label.config(text=f"✅ Excel exported: {Path(filename).name}")
-                messagebox.showinfo("Export Complete", f"📊 Data exported successfully to:\n{filename}")
-            except Exception as e:
-                self.progress.stop()
-                self.status_label.config(text="❌ Excel export failed")
-                messagebox.showerror("Export Error", f"Failed to export Excel file:\n{e}")
+        if not filename:
+            return
+        # Snapshot on the Tk thread – cell edits keep mutating self.df
+        df = self.df[exporter.export_columns(self.df)].copy()
+        self.export_btn.config(state=DISABLED)
+        self.progress.config(mode="indeterminate")
+        self.progress.start(10)
+        self.status_label.config(text=f"📈 Exporting {Path(filename).name}...")
+        self._start_worker(
+            lambda report, cancel: exporter.export_frame(df, filename),
+            on_done=self._on_export_done,
+            on_error=self._on_export_error,
+        )
+
+    def _on_export_done(self, path: Path):
+        self.progress.stop()
+        self.export_btn.config(state=NORMAL)
+        self.status_label.config(text=f"✅ Exported: {path.name}")
+        messagebox.showinfo("Export Complete", f"📊 Data exported successfully to:\n{path}")
+
+    def _on_export_error(self, exc: BaseException, tb: str):
+        self.progress.stop()
+        self.export_btn.config(state=NORMAL)
+        self.status_label.config(text="❌ Export failed")
+        messagebox.showerror("Export Error", f"Failed to export file:\n{exc}")
 
     def save_new_json(self):
-        if self.df is None or self.spida_data is None:
+        if self.df is None or self.spida_path is None:
             messagebox.showwarning("Warning", "No data to save. Please run comparison first.")
             return
+        if self._worker is not None:
+            return
         filename = filedialog.asksaveasfilename(
             title="Save updated SPIDA JSON", 
             defaultextension=".json", 
@@ -1081,44 +1236,54 @@ class CompareApp(ttk.Window):
         )
         if not filename:
             return
-        try:
-            self.progress.start(10)
-            self.status_label.config(text="💾 Saving SPIDA JSON...")
-            self.update()
-            
-            updated_spida = json.loads(json.dumps(self.spida_data))
-            current_data = [self.tree.item(item, "values") for item in self.tree.get_children()]
-            if current_data:
-                visible_cols = [c for c in self.df.columns if not c.startswith("__") and "Coord" not in c]
-                for i, values in enumerate(current_data):
-                    if i < len(self.df):
-                        for j, col in enumerate(visible_cols):
-                            if j < len(values):
-                                self.df.iat[i, self.df.columns.get_loc(col)] = values[j]
-            changes_made = 0
-            editable_cols = ["SPIDA Pole Spec", "SPIDA Existing %", "SPIDA Final %", "Com Drop? (SPIDA)"]
-            for _, row in self.df.iterrows():
-                scid = row["SPIDA SCID #"]
-                for col in editable_cols:
-                    orig = f"__orig_{col}"
-                    if orig in self.df.columns and str(row[col]) != str(row[orig]):
-                        apply_edit(updated_spida, scid, col, str(row[col]))
-                        changes_made += 1
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(updated_spida, f, indent=2, ensure_ascii=False)
-            
-            self.progress.stop()
-            self.status_label.config(text=f"✅ SPIDA JSON saved: {Path(filename).name}")
-            messagebox.showinfo(
-                "Save Complete", 
-                f"✅ Updated SPIDA JSON saved successfully!\n\n"
-                f"📄 File: {filename}\n"
-                f"🔧 Changes applied: {changes_made}"
-            )
-        except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="❌ SPIDA save failed")
-            messagebox.showerror("Save Error", f"Failed to save JSON file:\n{e}\n\n{traceback.format_exc()}")
+        # Snapshot on the Tk thread – cell edits keep arriving while saving
+        edits = [(scid, col, value) for (scid, col), value in self.edits.items()]
+        spida_path, doc, index = self.spida_path, self.spida_data, self._spida_index
+
+        def task(report, cancel):
+            # Only parsed here when compare served the SPIDA tables from the cache
+            nonlocal doc, index
+            if doc is None:
+                doc = json_codec.load_path(spida_path)
+                index = None
+            # Edits are merged into copies of just the touched locations;
+            # the loaded document itself is never copied or modified.
+            if index is None:
+                index = spida_writer.build_scid_index(doc)
+            overlay = spida_writer.EditOverlay(doc, index)
+            changes_made = overlay.record_many(edits)
+            # Streamed lead/location at a time, compact, via temp file + rename
+            overlay.write(filename)
+            return changes_made, doc, index
+
+        self.save_btn.config(state=DISABLED)
+        self.progress.config(mode="indeterminate")
+        self.progress.start(10)
+        self.status_label.config(text="💾 Saving SPIDA JSON...")
+        self._start_worker(
+            task,
+            on_done=lambda result: self._on_save_done(filename, spida_path, *result),
+            on_error=self._on_save_error,
+        )
+
+    def _on_save_done(self, filename: str, spida_path: Path, changes_made: int, doc: dict, index):
+        self.progress.stop()
+        self.save_btn.config(state=NORMAL)
+        if spida_path == self.spida_path:  # keep the parse for the next save
+            self.spida_data, self._spida_index = doc, index
+        self.status_label.config(text=f"✅ SPIDA JSON saved: {Path(filename).name}")
+        messagebox.showinfo(
+            "Save Complete", 
+            f"✅ Updated SPIDA JSON saved successfully!\n\n"
+            f"📄 File: {filename}\n"
+            f"🔧 Changes applied: {changes_made}"
+        )
+
+    def _on_save_error(self, exc: BaseException, tb: str):
+        self.progress.stop()
+        self.save_btn.config(state=NORMAL)
+        self.status_label.config(text="❌ SPIDA save failed")
+        messagebox.showerror("Save Error", f"Failed to save JSON file:\n{exc}\n\n{tb}")
 
 
 # ----------------------------------------------------------------------
@@ -0,0 +1,439 @@
+"""
+map_layer.py – clustered, viewport-culled pole layer for TkinterMapView.
+
+TkinterMapView redraws every marker and path on each pan or zoom, so a job
+with thousands of poles makes the map unusable if each pole is a marker.
+:class:`PoleMapLayer` keeps the poles in a :class:`ClusterIndex` and only
+puts on the canvas what the current view needs:
+
+* below :data:`DETAIL_ZOOM` poles are merged into grid clusters (one marker
+  per :data:`CLUSTER_CELL_PX` screen cell, coloured by its most common match
+  tier, labelled with the pole count; clicking zooms in);
+* from :data:`DETAIL_ZOOM` on, the individual tier-coloured circles and the
+  SPIDA ↔ Katapult lines are drawn;
+* either way only items inside the viewport (plus a margin) exist.
+
+The layer polls the widget's zoom and viewport with ``after()`` and, once
+the view has settled, adds and removes only the items that changed.
+
+``ClusterIndex`` has no Tk dependency; everything is computed in
+Web-Mercator "world" units (0–1 across the whole map) with NumPy.
+"""
+
+from __future__ import annotations
+
+import math
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+Coord = Tuple[float, float]              # (lat, lon) helper alias
+
+# Individual pole markers from this zoom level on; clusters below it
+DETAIL_ZOOM = 16
+# Edge length of a clustering cell on screen (px)
+CLUSTER_CELL_PX = 64
+# Even at detail zoom, cluster when more poles than this would be visible
+MAX_DETAIL_MARKERS = 2000
+# Extra area drawn around the viewport, as a fraction of its width/height
+VIEWPORT_MARGIN = 0.25
+# How often the layer checks the map's zoom/viewport (ms)
+MAP_POLL_MS = 150
+
+TILE_SIZE = 256
+MAX_ZOOM = 19
+
+# tkintermapview internals PoleMapLayer._remove touches directly
+_MAP_WIDGET_LISTS = ("canvas_marker_list", "canvas_path_list")
+_MARKER_CANVAS_ATTRS = ("polygon", "big_circle", "canvas_text", "canvas_icon", "canvas_image")
+
+
+class MapPoint(NamedTuple):
+    """One pole marker; *data* is handed to the layer's click callback."""
+    lat: float
+    lon: float
+    tier: str
+    data: Any = None
+
+
+class MapEdge(NamedTuple):
+    """A line between two coordinates, drawn at detail zoom only."""
+    start: Coord
+    end: Coord
+    color: str
+    width: int = 2
+
+
+class Clusters(NamedTuple):
+    """Grid clusters of a :class:`ClusterIndex` at one zoom level (parallel arrays)."""
+    x: np.ndarray        # centroid, world units
+    y: np.ndarray
+    count: np.ndarray    # poles per cluster
+    tier: np.ndarray     # index into ClusterIndex.tiers of the most common tier
+    first: np.ndarray    # index of the cluster's first pole (its only one when count == 1)
+
+
+def to_world(lat, lon):
+    """Web-Mercator world coordinates (0–1) for degrees; scalars or arrays."""
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -85.05112878, 85.05112878)
+    x = (np.asarray(lon, dtype=np.float64) + 180.0) / 360.0
+    lat_r = np.radians(lat)
+    y = (1.0 - np.log(np.tan(lat_r) + 1.0 / np.cos(lat_r)) / math.pi) / 2.0
+    return x, y
+
+
+def to_latlon(x, y):
+    """Inverse of :func:`to_world`."""
+    lon = np.asarray(x, dtype=np.float64) * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(math.pi * (1.0 - 2.0 * np.asarray(y, dtype=np.float64)))))
+    return lat, lon
+
+
+class ClusterIndex:
+    """Pole positions with per-zoom grid clusters and viewport queries."""
+
+    def __init__(self, points: Sequence[MapPoint], cell_px: int = CLUSTER_CELL_PX):
+        self.points = list(points)
+        self.cell_px = cell_px
+        self.tiers: List[str] = list(dict.fromkeys(p.tier for p in self.points))
+        tier_at = {t: i for i, t in enumerate(self.tiers)}
+        self.tier_codes = np.array([tier_at[p.tier] for p in self.points], dtype=np.intp)
+        self.x, self.y = to_world([p.lat for p in self.points], [p.lon for p in self.points])
+        self._clusters: Dict[int, Clusters] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def clusters(self, zoom: int) -> Clusters:
+        """Grid clusters at integer *zoom*, computed once per level."""
+        cached = self._clusters.get(zoom)
+        if cached is not None:
+            return cached
+        cell = self.cell_px / (TILE_SIZE * 2.0 ** zoom)      # cell size in world units
+        cx = np.floor(self.x / cell).astype(np.int64)
+        cy = np.floor(self.y / cell).astype(np.int64)
+        keys = cx * (1 << 32) + cy
+        _uniq, first, inverse, count = np.unique(keys, return_index=True, return_inverse=True,
+                                                  return_counts=True)
+        inverse = inverse.ravel()
+        n = len(count)
+        x = np.bincount(inverse, weights=self.x, minlength=n) / count
+        y = np.bincount(inverse, weights=self.y, minlength=n) / count
+        ntiers = max(len(self.tiers), 1)
+        per_tier = np.bincount(inverse * ntiers + self.tier_codes, minlength=n * ntiers)
+        tier = per_tier.reshape(n, ntiers).argmax(axis=1)
+        result = Clusters(x, y, count, tier, first)
+        self._clusters[zoom] = result
+        return result
+
+    @staticmethod
+    def in_bounds(x: np.ndarray, y: np.ndarray, bounds: Tuple[float, float, float, float]) -> np.ndarray:
+        """Indices of positions inside ``(x0, y0, x1, y1)`` world bounds."""
+        x0, y0, x1, y1 = bounds
+        return np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+
+    def visible_points(self, bounds) -> np.ndarray:
+        return self.in_bounds(self.x, self.y, bounds)
+
+    def visible_clusters(self, zoom: int, bounds) -> Tuple[Clusters, np.ndarray]:
+        clusters = self.clusters(zoom)
+        return clusters, self.in_bounds(clusters.x, clusters.y, bounds)
+
+    def extent(self) -> Optional[Tuple[float, float, float, float]]:
+        """World bounds of all poles, or None without poles."""
+        if not len(self.points):
+            return None
+        return float(self.x.min()), float(self.y.min()), float(self.x.max()), float(self.y.max())
+
+
+def fit_zoom(extent: Tuple[float, float, float, float], width_px: int, height_px: int,
+             coverage: float = 0.8, max_zoom: int = 18) -> int:
+    """Largest integer zoom at which *extent* fills at most *coverage* of the view."""
+    x0, y0, x1, y1 = extent
+    span_x, span_y = max(x1 - x0, 1e-12), max(y1 - y0, 1e-12)
+    zoom = math.log2(min(width_px / span_x, height_px / span_y) * coverage / TILE_SIZE)
+    return int(max(3, min(max_zoom, math.floor(zoom))))
+
+
+# ---------------------------------------------------------------------------
+# comparison frame → map items
+# ---------------------------------------------------------------------------
+# Tiers whose SPIDA and Katapult poles are joined by a line
+LINKED_TIERS = ("scid", "pole_num", "coord_direct", "coord_spec_verified")
+
+
+class MapItems(NamedTuple):
+    """What :func:`frame_map_items` extracts from a comparison frame."""
+    points: List[MapPoint]   # MapPoint.data is the row's position in the frame
+    edges: List[MapEdge]
+    stats: Dict[str, int]    # rows per tier (plus "unmatched_spida")
+
+
+def _column(df, name: str, default=None) -> list:
+    return df[name].tolist() if name in df.columns else [default] * len(df)
+
+
+def frame_map_items(df, line_colors: Mapping[str, str]) -> MapItems:
+    """Markers, connecting lines and tier counts for every row of *df*.
+
+    Markers only carry the row position; the detail text is built on click
+    with :func:`pole_details_text`.
+    """
+    points: List[MapPoint] = []
+    edges: List[MapEdge] = []
+    stats = dict.fromkeys(LINKED_TIERS + ("unmatched_spida", "katapult_only"), 0)
+    rows = zip(_column(df, "Match Tier", "unmatched"),
+               _column(df, "SPIDA Coord"), _column(df, "Katapult Coord"))
+    for pos, (tier, spida_coord, kat_coord) in enumerate(rows):
+        if spida_coord:
+            points.append(MapPoint(spida_coord[0], spida_coord[1], tier, pos))
+        # Katapult marker only where it does not sit on the SPIDA one
+        if kat_coord and (not spida_coord or kat_coord != spida_coord):
+            kat_tier = tier if tier != "unmatched" else "katapult_only"
+            points.append(MapPoint(kat_coord[0], kat_coord[1], kat_tier, pos))
+        if spida_coord and kat_coord and tier in LINKED_TIERS:
+            width = 3 if tier == "scid" else 2
+            edges.append(MapEdge(spida_coord, kat_coord, line_colors.get(tier, "gray"), width))
+        if tier in stats:
+            stats[tier] += 1
+        else:
+            stats["unmatched_spida"] += 1
+    return MapItems(points, edges, stats)
+
+
+def pole_details_text(row: Mapping[str, Any]) -> str:
+    """Multi-line description of one comparison row for the pole dialog."""
+    tier = row.get("Match Tier", "unmatched")
+    parts = [f"🔍 Match Tier: {tier.replace('_', ' ').title()}"]
+    for heading, prefix, drop_col in (("📊 SPIDA Data:", "SPIDA", "Com Drop? (SPIDA)"),
+                                      ("📋 Katapult Data:", "Katapult", "Com Drop? (Kat)")):
+        scid = row.get(f"{prefix} SCID #") or "—"
+        spec = row.get(f"{prefix} Pole Spec") or "—"
+        pole = row.get(f"{prefix} Pole #") or "—"
+        if scid == "—" and spec == "—" and pole == "—":
+            continue
+        parts.append(f"\n{heading}")
+        parts.append(f"   SCID: {scid}")
+        parts.append(f"   Pole #: {pole}")
+        parts.append(f"   Spec: {spec}")
+        parts.append(f"   Existing %: {row.get(f'{prefix} Existing %') or '—'}")
+        parts.append(f"   Final %: {row.get(f'{prefix} Final %') or '—'}")
+        parts.append(f"   Charter Drop: {row.get(drop_col) or '—'}")
+    text = "\n".join(parts)
+    # coordinate matches also show how far apart the two poles are
+    if tier in ("coord_direct", "coord_spec_verified"):
+        distance = row.get("Match Distance (m)")
+        if distance:
+            text += f"\n\nMatch Distance: {distance}m"
+    return text
+
+
+class PoleMapLayer:
+    """Draws a :class:`ClusterIndex` onto a ``TkinterMapView``.
+
+    *icons* maps tier → PhotoImage for individual poles; *on_click* is
+    called with the clicked pole's :attr:`MapPoint.data` and tier.
+    *tier_colors* maps tier → ``(fill, outline)`` for cluster markers.
+    """
+
+    def __init__(self, map_widget, icons: Mapping[str, tk.PhotoImage],
+                 on_click: Optional[Callable[[Any, str], None]] = None,
+                 tier_colors: Optional[Mapping[str, Tuple[str, str]]] = None,
+                 detail_zoom: int = DETAIL_ZOOM, cell_px: int = CLUSTER_CELL_PX,
+                 poll_ms: int = MAP_POLL_MS):
+        self.map_widget = map_widget
+        self.icons = icons
+        self.on_click = on_click
+        self.tier_colors = dict(tier_colors or {})
+        self.detail_zoom = detail_zoom
+        self.cell_px = cell_px
+        self.poll_ms = poll_ms
+        self.index = ClusterIndex([], cell_px)
+        self.edges: List[MapEdge] = []
+        self._edge_world = (np.empty((0, 2)), np.empty((0, 2)))
+        self._drawn: Dict[tuple, Any] = {}          # item key → marker / path
+        self._cluster_icons: Dict[Tuple[str, str], tk.PhotoImage] = {}
+        self._rendered_view = None
+        self._last_view = None
+        self._after_id = None
+
+    # ---- data --------------------------------------------------------
+    def set_data(self, points: Sequence[MapPoint], edges: Sequence[MapEdge] = ()) -> None:
+        """Replace the layer's poles and lines; redraws on the next poll."""
+        self.clear()
+        self.index = ClusterIndex(points, self.cell_px)
+        self.edges = list(edges)
+        if self.edges:
+            sx, sy = to_world([e.start[0] for e in self.edges], [e.start[1] for e in self.edges])
+            ex, ey = to_world([e.end[0] for e in self.edges], [e.end[1] for e in self.edges])
+            self._edge_world = (np.column_stack([sx, sy]), np.column_stack([ex, ey]))
+        else:
+            self._edge_world = (np.empty((0, 2)), np.empty((0, 2)))
+        self._rendered_view = None
+        self._start_polling()
+
+    def clear(self) -> None:
+        """Remove every canvas item this layer created."""
+        self._remove(list(self._drawn))
+        self._rendered_view = None
+
+    def stop(self) -> None:
+        """Stop polling the map (call before destroying the widget)."""
+        if self._after_id is not None:
+            try:
+                self.map_widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def fit(self, coverage: float = 0.8) -> None:
+        """Centre and zoom the map on all poles."""
+        extent = self.index.extent()
+        if extent is None:
+            return
+        x0, y0, x1, y1 = extent
+        lat, lon = to_latlon((x0 + x1) / 2, (y0 + y1) / 2)
+        width = max(self.map_widget.winfo_width(), 100)
+        height = max(self.map_widget.winfo_height(), 100)
+        self.map_widget.set_position(float(lat), float(lon))
+        self.map_widget.set_zoom(fit_zoom(extent, width, height, coverage))
+        self.refresh(force=True)
+
+    # ---- rendering ---------------------------------------------------
+    def _view(self):
+        mw = self.map_widget
+        return (round(mw.zoom), tuple(mw.upper_left_tile_pos), tuple(mw.lower_right_tile_pos))
+
+    def _bounds(self, view) -> Tuple[float, float, float, float]:
+        zoom, (ux, uy), (lx, ly) = view
+        scale = 2.0 ** zoom
+        x0, y0, x1, y1 = ux / scale, uy / scale, lx / scale, ly / scale
+        mx, my = (x1 - x0) * VIEWPORT_MARGIN, (y1 - y0) * VIEWPORT_MARGIN
+        return x0 - mx, y0 - my, x1 + mx, y1 + my
+
+    def _start_polling(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.map_widget.after(self.poll_ms, self._poll)
+
+    def _poll(self) -> None:
+        self._after_id = None
+        try:
+            view = self._view()
+            # redraw once the view has stopped changing between two polls
+            if view == self._last_view and view != self._rendered_view:
+                self._render(view)
+            self._last_view = view
+            self._after_id = self.map_widget.after(self.poll_ms, self._poll)
+        except tk.TclError:
+            pass  # widget destroyed
+
+    def refresh(self, force: bool = False) -> None:
+        """Redraw for the current view now (only changed items unless *force*)."""
+        view = self._view()
+        if force or view != self._rendered_view:
+            self._render(view)
+        self._last_view = view
+
+    def _render(self, view) -> None:
+        zoom = view[0]
+        bounds = self._bounds(view)
+        wanted: Dict[tuple, Callable[[], Any]] = {}
+        index = self.index
+
+        points = index.visible_points(bounds) if zoom >= self.detail_zoom else None
+        if points is not None and len(points) <= MAX_DETAIL_MARKERS:
+            for i in points.tolist():
+                wanted[("p", i)] = lambda i=i: self._point_marker(index.points[i])
+            starts, ends = self._edge_world
+            near = (ClusterIndex.in_bounds(starts[:, 0], starts[:, 1], bounds).tolist()
+                    + ClusterIndex.in_bounds(ends[:, 0], ends[:, 1], bounds).tolist())
+            for i in set(near):
+                wanted[("e", i)] = lambda i=i: self._edge_path(self.edges[i])
+        else:
+            clusters, visible = index.visible_clusters(zoom, bounds)
+            for c in visible.tolist():
+                count = int(clusters.count[c])
+                if count == 1:
+                    i = int(clusters.first[c])
+                    wanted[("p", i)] = lambda i=i: self._point_marker(index.points[i])
+                else:
+                    wanted[("c", zoom, c)] = lambda c=c: self._cluster_marker(clusters, c, zoom)
+
+        self._remove([key for key in self._drawn if key not in wanted])
+        for key, make in wanted.items():
+            if key not in self._drawn:
+                self._drawn[key] = make()
+        self._rendered_view = view
+
+    # ---- canvas items ------------------------------------------------
+    def _point_marker(self, point: MapPoint):
+        icon = self.icons.get(point.tier) or self.icons.get("unmatched")
+
+        def clicked(_marker, point=point):
+            if self.on_click is not None:
+                self.on_click(point.data, point.tier)
+
+        return self.map_widget.set_marker(point.lat, point.lon, icon=icon, command=clicked, data=point.data)
+
+    def _cluster_marker(self, clusters: Clusters, c: int, zoom: int):
+        tier = self.index.tiers[int(clusters.tier[c])]
+        count = int(clusters.count[c])
+        lat, lon = to_latlon(clusters.x[c], clusters.y[c])
+
+        def zoom_in(_marker, lat=float(lat), lon=float(lon)):
+            self.map_widget.set_position(lat, lon)
+            self.map_widget.set_zoom(min(zoom + 2, MAX_ZOOM))
+            self.refresh()
+
+        return self.map_widget.set_marker(float(lat), float(lon), icon=self._cluster_icon(tier, count),
+                                          command=zoom_in)
+
+    def _edge_path(self, edge: MapEdge):
+        return self.map_widget.set_path([edge.start, edge.end], color=edge.color, width=edge.width)
+
+    def _cluster_icon(self, tier: str, count: int) -> tk.PhotoImage:
+        label = str(count) if count < 1000 else f"{count // 1000}k"
+        key = (tier, label)
+        icon = self._cluster_icons.get(key)
+        if icon is None:
+            fill, outline = self.tier_colors.get(tier, ("#5865f2", "#3c45a5"))
+            radius = 9 + 2 * len(label)
+            size = radius * 2 + 2
+            img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            draw.ellipse((1, 1, size - 1, size - 1), fill=fill, outline=outline, width=2)
+            font = ImageFont.load_default()
+            left, top, right, bottom = draw.textbbox((0, 0), label, font=font)
+            draw.text(((size - (right - left)) / 2 - left, (size - (bottom - top)) / 2 - top),
+                      label, fill="white", font=font)
+            icon = self._cluster_icons[key] = ImageTk.PhotoImage(img)
+        return icon
+
+    def _remove(self, keys: List[tuple]) -> None:
+        # Deleting canvas items directly skips the full canvas.update() that
+        # CanvasPositionMarker.delete() does per marker. That relies on
+        # tkintermapview internals, so without them the public delete() is used.
+        if not keys:
+            return
+        mw = self.map_widget
+        items = [(key, self._drawn.pop(key)) for key in keys]
+        if not all(hasattr(mw, attr) for attr in _MAP_WIDGET_LISTS):
+            for _key, item in items:
+                item.delete()
+            return
+        canvas = mw.canvas
+        for key, item in items:
+            attrs = ("canvas_line",) if key[0] == "e" else _MARKER_CANVAS_ATTRS
+            if not hasattr(item, "deleted") or not any(hasattr(item, attr) for attr in attrs):
+                item.delete()
+                continue
+            for attr in attrs:
+                canvas_id = getattr(item, attr, None)
+                if canvas_id is not None:
+                    canvas.delete(canvas_id)
+                    setattr(item, attr, None)
+            item.deleted = True
+        mw.canvas_marker_list = [m for m in mw.canvas_marker_list if not m.deleted]
+        mw.canvas_path_list = [p for p in mw.canvas_path_list if not p.deleted]
@@ -2,42 +2,245 @@
 spida_writer.py – given a loaded SPIDA JSON, a SCID,
 the column name, and the user's new value, patch the JSON
 in-place so it's ready to dump back to disk.
+
+:class:`EditOverlay` records the same edits *without* touching the loaded
+document; only the edited locations are copied when the result is built.
 """
 
-from typing import Tuple
+import copy
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+try:
+    from . import json_codec
+except ImportError:
+    import json_codec
+
+
+class LocationRef(NamedTuple):
+    """Where one SCID lives inside a SPIDA document."""
+    lead_idx: int
+    loc_idx: int
+    location: dict
+    recommended: Optional[dict]   # "Recommended" design, if present
+    measured: Optional[dict]      # "Measured" design, if present
+
 
-def apply_edit(spida: dict, scid: str, column: str, new_val: str):
-    """Mutate *spida* so that column on that SCID equals new_val."""
+def build_scid_index(spida: dict) -> Dict[str, LocationRef]:
+    """Map each SCID ("001", "002", …) to its location and designs.
+
+    SCIDs follow the same numbering as ``compare()``: locations counted in
+    lead order. Build this once per document and pass it to every edit.
+    """
+    index: Dict[str, LocationRef] = {}
     scid_counter = 0
-    
-    for lead in spida.get("leads", []):
-        for loc in lead.get("locations", []):
+    for lead_idx, lead in enumerate(spida.get("leads", [])):
+        for loc_idx, loc in enumerate(lead.get("locations", [])):
             scid_counter += 1
-            if f"{scid_counter:03d}" != scid:
-                continue
+            designs = {}
+            for design in loc.get("designs", []):
+                designs.setdefault(design.get("layerType"), design)
+            index[f"{scid_counter:03d}"] = LocationRef(
+                lead_idx, loc_idx, loc, designs.get("Recommended"), designs.get("Measured")
+            )
+    return index
+
+def apply_edit(spida: dict, scid: str, column: str, new_val: str,
+               index: Optional[Dict[str, LocationRef]] = None):
+    """Mutate *spida* so that column on that SCID equals new_val.
+
+    Pass a prebuilt *index* (:func:`build_scid_index`) when applying many
+    edits; without one the document is indexed for this call only.
+    """
+    if index is None:
+        index = build_scid_index(spida)
+    ref = index.get(scid)
+    if ref is None or ref.recommended is None:
+        return
+    _patch_location(ref, column, new_val)
+
+def apply_edits(spida: dict, edits: Iterable[Tuple[str, str, str]],
+                index: Optional[Dict[str, LocationRef]] = None) -> int:
+    """Apply ``(scid, column, new_val)`` edits in order; returns how many landed.
+
+    The SCID index is built once and shared by every edit.
+    """
+    if index is None:
+        index = build_scid_index(spida)
+    applied = 0
+    for scid, column, new_val in edits:
+        ref = index.get(scid)
+        if ref is None or ref.recommended is None:
+            continue
+        _patch_location(ref, column, new_val)
+        applied += 1
+    return applied
+
+class EditOverlay:
+    """Copy-on-write edit layer over a SPIDA document.
+
+    Edits are recorded against the SCID index and merged at serialisation
+    time into private copies of just the touched locations. Untouched leads
+    and locations are shared with the original document, which is never
+    modified.
+    """
 
-            # Find the recommended design
-            rec = None
+    def __init__(self, spida: dict, index: Optional[Dict[str, LocationRef]] = None):
+        self.spida = spida
+        self.index = index if index is not None else build_scid_index(spida)
+        self._edits: Dict[str, list] = {}   # scid → [(column, new_val), …] in order
+
+    def __len__(self) -> int:
+        return sum(len(e) for e in self._edits.values())
+
+    def record(self, scid: str, column: str, new_val: str) -> bool:
+        """Queue one edit; returns False when the SCID can't be patched."""
+        ref = self.index.get(scid)
+        if ref is None or ref.recommended is None:
+            return False
+        self._edits.setdefault(scid, []).append((column, new_val))
+        return True
+
+    def record_many(self, edits: Iterable[Tuple[str, str, str]]) -> int:
+        """Queue ``(scid, column, new_val)`` edits; returns how many were accepted."""
+        return sum(self.record(scid, column, new_val) for scid, column, new_val in edits)
+
+    def patched_locations(self) -> Dict[Tuple[int, int], dict]:
+        """Return ``(lead_idx, loc_idx) → edited copy`` for every touched location."""
+        patched = {}
+        for scid, edits in self._edits.items():
+            ref = self.index[scid]
+            loc = copy.deepcopy(ref.location)
+            designs = {}
             for design in loc.get("designs", []):
-                if design.get("layerType") == "Recommended":
-                    rec = design
-                    break
-            
-            if not rec:
-                continue
-                
-            pole = rec.get("structure", {}).get("pole", {}).get("clientItem", {})
-
-            if column in ("SPIDA Spec", "SPIDA Pole Spec"):
-                _update_pole_spec(pole, new_val)
-            elif column in ("SPIDA Existing %",):
-                _set_loading(loc, "Measured", float(new_val.strip("%")) / 100)
-            elif column in ("SPIDA Final %",):
-                _set_loading(loc, "Recommended", float(new_val.strip("%")) / 100)
-            elif column in ("SPIDA Charter Drop", "Com Drop? (SPIDA)"):
-                _toggle_charter(rec, new_val.lower().startswith("t"))
-
-            return  # once patched → done
+                designs.setdefault(design.get("layerType"), design)
+            local = ref._replace(
+                location=loc,
+                recommended=designs.get("Recommended"),
+                measured=designs.get("Measured"),
+            )
+            for column, new_val in edits:
+                _patch_location(local, column, new_val)
+            patched[(ref.lead_idx, ref.loc_idx)] = loc
+        return patched
+
+    def materialise(self) -> dict:
+        """Return the edited document.
+
+        Containers on the path to an edited location (document, ``leads``
+        list, lead, ``locations`` list) are shallow-copied; everything else
+        is the original objects.
+        """
+        patched = self.patched_locations()
+        if not patched:
+            return self.spida
+
+        doc = dict(self.spida)
+        leads = list(doc.get("leads", []))
+        for lead_idx in sorted({li for li, _ in patched}):
+            lead = dict(leads[lead_idx])
+            locations = list(lead.get("locations", []))
+            for (li, loc_idx), loc in patched.items():
+                if li == lead_idx:
+                    locations[loc_idx] = loc
+            lead["locations"] = locations
+            leads[lead_idx] = lead
+        doc["leads"] = leads
+        return doc
+
+    def write(self, path: Union[Path, str], indent: Optional[int] = None) -> None:
+        """Stream the edited document to *path* (see :func:`write_spida`)."""
+        write_spida(self.spida, path, indent=indent, patched=self.patched_locations())
+
+
+# ---------------------------------------------------------------------------
+# streaming writer
+# ---------------------------------------------------------------------------
+
+def write_spida(spida: dict, path: Union[Path, str], indent: Optional[int] = None,
+                patched: Optional[Dict[Tuple[int, int], dict]] = None) -> None:
+    """Write *spida* to *path* one lead/location at a time.
+
+    ``indent=None`` (default) writes compact JSON; pass e.g. ``2`` for a
+    human-readable file. *patched* maps ``(lead_idx, loc_idx)`` to a
+    replacement location (see :meth:`EditOverlay.patched_locations`), so
+    edits are merged on the way out without building a new document.
+    The file is replaced atomically.
+    """
+    with json_codec.open_atomic(path) as f:
+        _SpidaStream(f, indent, patched or {}).document(spida)
+
+
+class _SpidaStream:
+    """Incremental encoder for the SPIDA exchange layout."""
+
+    def __init__(self, f: BinaryIO, indent: Optional[int], patched: Dict[Tuple[int, int], dict]):
+        self.f = f
+        self.indent = indent
+        self.patched = patched
+        self.key_sep = b":" if indent is None else b": "
+
+    def _newline(self, level: int) -> bytes:
+        return b"" if self.indent is None else b"\n" + b" " * (self.indent * level)
+
+    def _value(self, obj: Any, level: int):
+        data = json_codec.dumps(obj, indent=self.indent)
+        if self.indent is not None and level:
+            # nested blocks are encoded from column 0 – shift them into place
+            data = data.replace(b"\n", self._newline(level))
+        self.f.write(data)
+
+    def _container(self, items, level: int, is_dict: bool, write_item):
+        f = self.f
+        f.write(b"{" if is_dict else b"[")
+        empty = True
+        for i, item in enumerate(items):
+            f.write((b"," if i else b"") + self._newline(level + 1))
+            if is_dict:
+                f.write(json_codec.dumps(item[0]) + self.key_sep)
+            write_item(i, item, level + 1)
+            empty = False
+        if not empty:
+            f.write(self._newline(level))
+        f.write(b"}" if is_dict else b"]")
+
+    def document(self, doc: dict):
+        def item(_i, kv, level):
+            key, value = kv
+            if key == "leads" and isinstance(value, list):
+                self._container(value, level, False, self._lead)
+            else:
+                self._value(value, level)
+        self._container(doc.items(), 0, True, item)
+
+    def _lead(self, lead_idx: int, lead: Any, level: int):
+        if not isinstance(lead, dict):
+            return self._value(lead, level)
+
+        def location(loc_idx, loc, loc_level):
+            self._value(self.patched.get((lead_idx, loc_idx), loc), loc_level)
+
+        def item(_i, kv, item_level):
+            key, value = kv
+            if key == "locations" and isinstance(value, list):
+                self._container(value, item_level, False, location)
+            else:
+                self._value(value, item_level)
+        self._container(lead.items(), level, True, item)
+
+def _patch_location(ref: LocationRef, column: str, new_val: str):
+    """Write one edited column into the location/designs behind *ref*."""
+    rec = ref.recommended
+    pole = rec.get("structure", {}).get("pole", {}).get("clientItem", {})
+
+    if column in ("SPIDA Spec", "SPIDA Pole Spec"):
+        _update_pole_spec(pole, new_val)
+    elif column in ("SPIDA Existing %",):
+        _set_loading(ref.location, "Measured", float(new_val.strip("%")) / 100)
+    elif column in ("SPIDA Final %",):
+        _set_loading(ref.location, "Recommended", float(new_val.strip("%")) / 100)
+    elif column in ("SPIDA Charter Drop", "Com Drop? (SPIDA)"):
+        _toggle_charter(rec, new_val.lower().startswith("t"))
 
 def _update_pole_spec(pole: dict, new_val: str):
     """Parse and update pole specification string like "40' H1 Southern Pine"."""
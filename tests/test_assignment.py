@@ -0,0 +1,122 @@
+"""
+test_assignment.py – min_cost_assignment() against a brute-force matching.
+
+Random small sparse graphs (unequal row and column counts included) are
+solved by every available backend – SciPy when installed and the built-in
+Hungarian algorithm – and compared with an exhaustive search for the
+largest matching of least total cost. Exact cost ties may pick different
+pairs, so the pair count and total cost are compared, not the pairs.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import assignment                                 # noqa: E402
+
+BACKENDS = ["hungarian"] + (["scipy"] if assignment.linear_sum_assignment is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == "hungarian":
+        monkeypatch.setattr(assignment, "linear_sum_assignment", None)
+    return request.param
+
+
+def _brute_force(edges) -> tuple:
+    """``(pairs, total cost)`` of the largest, then cheapest, matching."""
+    by_row = {}
+    for r, c, cost in edges:
+        by_row.setdefault(r, []).append((c, cost))
+    rows = sorted(by_row)
+
+    def best(i, used):
+        if i == len(rows):
+            return 0, 0.0
+        pairs, cost = best(i + 1, used)          # row i left unpaired
+        options = [(pairs, cost)]
+        for c, edge_cost in by_row[rows[i]]:
+            if c not in used:
+                p, total = best(i + 1, used | {c})
+                options.append((p + 1, total + edge_cost))
+        return max(options, key=lambda o: (o[0], -o[1]))
+
+    return best(0, frozenset())
+
+
+def _check(edges, result):
+    costs = {}
+    for r, c, cost in edges:
+        costs[(r, c)] = min(cost, costs.get((r, c), cost))
+    assert len(set(result.values())) == len(result)          # one-to-one
+    assert all((r, c) in costs for r, c in result.items())   # only listed edges
+    pairs, total = _brute_force([(r, c, cost) for (r, c), cost in costs.items()])
+    assert len(result) == pairs
+    assert sum(costs[(r, c)] for r, c in result.items()) == pytest.approx(total)
+
+
+def _random_edges(rnd: random.Random, n_rows: int, n_cols: int, density: float):
+    edges = [(r, 100 + c, round(rnd.uniform(0, 5), 3))
+             for r in range(n_rows) for c in range(n_cols) if rnd.random() < density]
+    rnd.shuffle(edges)
+    return edges
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_random_components_match_brute_force(backend, seed):
+    rnd = random.Random(seed)
+    edges = _random_edges(rnd, rnd.randint(1, 6), rnd.randint(1, 6), rnd.uniform(0.2, 0.9))
+    _check(edges, assignment.min_cost_assignment(edges))
+
+
+def test_prefers_more_pairs_over_lower_cost(backend):
+    # pairing r0–c0 alone is cheapest, but r0–c1 + r1–c0 pairs both rows
+    edges = [(0, 0, 0.1), (0, 1, 4.9), (1, 0, 4.9)]
+    assert assignment.min_cost_assignment(edges) == {0: 1, 1: 0}
+
+
+@pytest.mark.parametrize("n_rows, n_cols", [(2, 5), (5, 2), (3, 4), (4, 3)])
+def test_unequal_sides_dense(backend, n_rows, n_cols):
+    rnd = random.Random(n_rows * 10 + n_cols)
+    for _ in range(20):
+        edges = _random_edges(rnd, n_rows, n_cols, 1.0)
+        result = assignment.min_cost_assignment(edges)
+        assert len(result) == min(n_rows, n_cols)
+        _check(edges, result)
+
+
+def test_star_shortcut_takes_cheapest_edge():
+    one_row = [(7, 1, 3.0), (7, 2, 0.5), (7, 3, 2.0)]
+    one_col = [(1, 9, 3.0), (2, 9, 1.5), (3, 9, 0.25)]
+    assert assignment.min_cost_assignment(one_row) == {7: 2}
+    assert assignment.min_cost_assignment(one_col) == {3: 9}
+
+
+def test_duplicate_edges_keep_cheapest_and_components_solved_apart(backend):
+    edges = [(0, 0, 5.0), (0, 0, 1.0), (0, 1, 2.0), (1, 0, 2.5),   # component A
+             (10, 20, 1.0), (11, 20, 0.5)]                          # component B (a star)
+    assert len(assignment.components(edges)) == 2
+    result = assignment.min_cost_assignment(edges)
+    assert result == {0: 1, 1: 0, 11: 20}
+    _check(edges, result)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_hungarian_matches_permutation_search(seed):
+    rnd = random.Random(seed)
+    n = rnd.randint(1, 5)
+    m = rnd.randint(n, 6)
+    cost = [[rnd.uniform(-10, 10) for _ in range(m)] for _ in range(n)]
+    assigned = assignment._hungarian(cost)
+    assert len(set(assigned)) == n and all(0 <= j < m for j in assigned)
+    best = min(sum(cost[i][j] for i, j in enumerate(cols))
+               for cols in itertools.permutations(range(m), n))
+    assert sum(cost[i][j] for i, j in enumerate(assigned)) == pytest.approx(best)
@@ -0,0 +1,126 @@
+"""
+test_incremental.py – rematch() / patch_frame() against a fresh compare().
+
+A synthetic job (benchmarks/synth_jobs.py) is matched once, then some of
+its Katapult pole nodes are changed, added and removed. The incremental
+path must produce exactly the frame and ``match_stats`` that a full
+``compare()`` of the edited job does.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import compare                                    # noqa: E402
+from synth_jobs import SynthConfig, make_job      # noqa: E402
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):   # compare() reports as it goes
+        return fn(*args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def job():
+    return make_job(SynthConfig(poles=400, katapult_only=0.05, charter_drop=0.2, seed=7))
+
+
+def _pole_nodes(doc: dict) -> list:
+    return [nid for nid, node in doc["nodes"].items()
+            if node["attributes"].get("node_type", {}).get("button_added") == "pole"]
+
+
+def _set(node: dict, attr: str, value: str) -> None:
+    node["attributes"][attr] = {"-Imported": value}
+
+
+def _move(node: dict, coord: tuple) -> None:
+    _set(node, "latitude", f"{coord[0]:.8f}")
+    _set(node, "longitude", f"{coord[1]:.8f}")
+    node["latitude"], node["longitude"] = coord
+
+
+def _edit_katapult(job) -> dict:
+    """A copy of the job's Katapult document with nodes changed, added and removed."""
+    doc = copy.deepcopy(job.katapult)
+    nodes = doc["nodes"]
+    poles = _pole_nodes(doc)
+    spida = _quiet(compare.extract_spida, job.spida).rows
+    unmatched = [i for i, tier in enumerate(job.tiers) if tier == "unmatched"]
+    assert len(unmatched) >= 4
+
+    # changed: loading values, a spec, a stolen SCID, a pole # and a position
+    for nid in poles[0:40:4]:
+        _set(nodes[nid], "existing_capacity_%", "12.34")
+        _set(nodes[nid], "final_passing_capacity_%", "98.76")
+    _set(nodes[poles[41]], "pole_spec", "99'-H9 Unobtainium")
+    nodes[poles[41]]["attributes"].pop("birthmark_id", None)
+    _set(nodes[poles[42]], "scid", spida[0].scid)
+    _set(nodes[poles[43]], "DLOC_number", spida[unmatched[0]].pole_num)
+    _move(nodes[poles[44]], spida[unmatched[1]].coord)
+
+    # removed: pole nodes together with their connections
+    removed = set(poles[50:60])
+    for nid in removed:
+        del nodes[nid]
+    doc["connections"] = {cid: conn for cid, conn in doc["connections"].items()
+                          if conn["node_id_1"] not in removed and conn["node_id_2"] not in removed}
+
+    # added: one keyed by SCID, one sitting on an unmatched pole, one Katapult-only
+    for n, (scid, coord) in enumerate([
+        (spida[unmatched[2]].scid, (0.0, 0.0)),
+        ("30000001", spida[unmatched[3]].coord),
+        ("30000002", (31.0, -98.0)),
+    ]):
+        node = copy.deepcopy(nodes[poles[1]])
+        _set(node, "scid", scid)
+        _set(node, "DLOC_number", f"9{n:06d}")
+        _move(node, coord)
+        nodes[f"added{n}"] = node
+    return doc
+
+
+@pytest.mark.parametrize("assignment", compare.ASSIGNMENT_MODES)
+def test_rematch_patch_frame_matches_fresh_compare(job, assignment):
+    edited = _edit_katapult(job)
+    spida = _quiet(compare.extract_spida, job.spida)
+    before = _quiet(compare.match, spida, compare.build_indexes(_quiet(compare.extract_katapult, job.katapult)),
+                    assignment=assignment)
+    frame = _quiet(compare.to_frame, before)
+
+    indexes = compare.build_indexes(_quiet(compare.extract_katapult, edited))
+    result = _quiet(compare.rematch, before, indexes)
+    patched = _quiet(compare.patch_frame, frame, result)
+    fresh = _quiet(compare.compare, job.spida, edited, assignment=assignment)
+
+    if assignment == "greedy":
+        assert result.rematched and len(result.rematched) < len(spida.rows)
+    else:   # falls back to a full match
+        assert result.rematched is None
+    assert dict(result.stats) == fresh.attrs["match_stats"]
+    assert patched.attrs["match_stats"] == fresh.attrs["match_stats"]
+    pd.testing.assert_frame_equal(patched, fresh)
+
+
+@pytest.mark.parametrize("assignment", compare.ASSIGNMENT_MODES)
+def test_pipeline_new_katapult_matches_fresh_compare(job, assignment):
+    edited = _edit_katapult(job)
+    pipe = compare.ComparePipeline(job.spida, job.katapult, assignment=assignment)
+    _quiet(pipe.run)
+    pipe.set_katapult(edited)
+    df = _quiet(pipe.run)
+    fresh = _quiet(compare.compare, job.spida, edited, assignment=assignment)
+
+    assert df.attrs["match_stats"] == fresh.attrs["match_stats"]
+    pd.testing.assert_frame_equal(df, fresh)
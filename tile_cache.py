@@ -0,0 +1,462 @@
+"""
+tile_cache.py – persistent map tiles for the TkinterMapView pane.
+
+``TkinterMapView`` downloads every tile it shows and only keeps them in
+memory, so each session (and each pan into a new area) waits on the tile
+server – or shows grey squares on a poor connection.  ``TileCache`` keeps
+the tiles in an SQLite database laid out like tkintermapview's own offline
+database (``server`` / ``tiles`` / ``sections`` tables, so
+``TkinterMapView(database_path=...)`` and ``OfflineLoader`` can read and
+fill it too), plus a ``tile_access`` table used to evict the least
+recently used tiles once the database outgrows ``max_bytes``.
+
+    cache = TileCache()                       # per-user cache folder
+    cache.attach(map_widget)                  # serve + store tiles while panning
+    cache.prefetch(coords_bbox(coords), 12, 18)   # fill a job's area ahead of time
+
+The tile server defaults to ``$QUIC_TILE_SERVER`` or OpenStreetMap; point it
+at a server whose usage policy allows bulk downloads before prefetching
+large areas. OpenStreetMap's tile usage policy discourages bulk downloads,
+so :meth:`TileCache.prefetch` refuses to run against it unless the caller
+passes ``confirm_osm=True`` (after asking the user), and then uses at most
+:data:`OSM_PREFETCH_WORKERS` connections. Requests carry an identifying
+``User-Agent`` (``$QUIC_TILE_USER_AGENT`` overrides it, e.g. to add contact
+details).
+
+:meth:`TileCache.attach` relies on a few tkintermapview internals; when a
+release lacks them the widget is left to load tiles its own way.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from . import __version__
+    from .job_cache import default_cache_dir
+except ImportError:
+    from job_cache import default_cache_dir
+    __version__ = "dev"
+
+DEFAULT_TILE_SERVER = "https://a.tile.openstreetmap.org/{z}/{x}/{y}.png"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Zoom range fetched for a job: overview (clusters) down to individual poles
+DEFAULT_PREFETCH_ZOOMS = (12, 18)
+# Refuse prefetches larger than this many tiles (highest zooms are dropped)
+PREFETCH_MAX_TILES = 20_000
+PREFETCH_WORKERS = 8
+# OpenStreetMap's usage policy asks for no more than two download connections
+OSM_PREFETCH_WORKERS = 2
+FETCH_TIMEOUT_S = 10
+# After a failed download the map stops asking the server for this long
+OFFLINE_RETRY_S = 30
+USER_AGENT = f"QuiC/{__version__} (SPIDA-Katapult pole comparison; tile cache)"
+
+# Tile accesses are written back in batches, evictions checked every N stores
+_TOUCH_BATCH = 64
+_EVICT_EVERY = 256
+
+BBox = Tuple[float, float, float, float]   # (south, west, north, east) degrees
+Tile = Tuple[int, int, int]                # (zoom, x, y)
+
+# Same DDL as tkintermapview.OfflineLoader, so either side can use the file
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS server (
+           url VARCHAR(300) PRIMARY KEY NOT NULL,
+           max_zoom INTEGER NOT NULL);""",
+    """CREATE TABLE IF NOT EXISTS tiles (
+           zoom INTEGER NOT NULL,
+           x INTEGER NOT NULL,
+           y INTEGER NOT NULL,
+           server VARCHAR(300) NOT NULL,
+           tile_image BLOB NOT NULL,
+           CONSTRAINT fk_server FOREIGN KEY (server) REFERENCES server (url),
+           CONSTRAINT pk_tiles PRIMARY KEY (zoom, x, y, server));""",
+    """CREATE TABLE IF NOT EXISTS sections (
+           position_a VARCHAR(100) NOT NULL,
+           position_b VARCHAR(100) NOT NULL,
+           zoom_a INTEGER NOT NULL,
+           zoom_b INTEGER NOT NULL,
+           server VARCHAR(300) NOT NULL,
+           CONSTRAINT fk_server FOREIGN KEY (server) REFERENCES server (url),
+           CONSTRAINT pk_tiles PRIMARY KEY (position_a, position_b, zoom_a, zoom_b, server));""",
+    # QuiC's own addition: last use per tile for LRU eviction
+    """CREATE TABLE IF NOT EXISTS tile_access (
+           zoom INTEGER NOT NULL,
+           x INTEGER NOT NULL,
+           y INTEGER NOT NULL,
+           server VARCHAR(300) NOT NULL,
+           last_used REAL NOT NULL,
+           CONSTRAINT pk_tile_access PRIMARY KEY (zoom, x, y, server));""",
+)
+
+
+def default_tile_db() -> Path:
+    """``tiles.db`` in the job cache folder (see ``job_cache.default_cache_dir``)."""
+    return default_cache_dir() / "tiles.db"
+
+
+def default_tile_server() -> str:
+    """``$QUIC_TILE_SERVER`` (a ``{z}/{x}/{y}`` URL template), else OpenStreetMap."""
+    return os.environ.get("QUIC_TILE_SERVER") or DEFAULT_TILE_SERVER
+
+
+def default_user_agent() -> str:
+    """``$QUIC_TILE_USER_AGENT``, else :data:`USER_AGENT`."""
+    return os.environ.get("QUIC_TILE_USER_AGENT") or USER_AGENT
+
+
+def is_osm_server(tile_server: str) -> bool:
+    """True for the OpenStreetMap tile servers (``*.openstreetmap.org``)."""
+    host = (urlsplit(tile_server).hostname or "").lower()
+    return host == "openstreetmap.org" or host.endswith(".openstreetmap.org")
+
+
+# Widget attributes TileCache.attach reads or replaces (tkintermapview internals)
+_MAP_WIDGET_ATTRS = ("request_image", "tile_server", "overlay_tile_server", "running",
+                     "empty_tile_image", "tile_image_cache", "set_tile_server")
+
+
+# ---------------------------------------------------------------------------
+# tile arithmetic
+# ---------------------------------------------------------------------------
+def coords_bbox(coords: Iterable[Optional[Tuple[float, float]]]) -> Optional[BBox]:
+    """``(south, west, north, east)`` around the given ``(lat, lon)`` pairs (None entries skipped)."""
+    lats, lons = [], []
+    for coord in coords:
+        if coord:
+            lats.append(coord[0])
+            lons.append(coord[1])
+    if not lats:
+        return None
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def tile_xy(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
+    """Web-Mercator tile holding ``(lat, lon)`` at *zoom*."""
+    n = 1 << zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return min(max(int(x), 0), n - 1), min(max(int(y), 0), n - 1)
+
+
+def bbox_tiles(bbox: BBox, zoom_min: int, zoom_max: int, margin: int = 1) -> Iterator[Tile]:
+    """Every tile covering *bbox* from *zoom_min* to *zoom_max*, plus *margin* tiles around it."""
+    south, west, north, east = bbox
+    for zoom in range(zoom_min, zoom_max + 1):
+        last = (1 << zoom) - 1
+        x0, y0 = tile_xy(north, west, zoom)
+        x1, y1 = tile_xy(south, east, zoom)
+        for x in range(max(x0 - margin, 0), min(x1 + margin, last) + 1):
+            for y in range(max(y0 - margin, 0), min(y1 + margin, last) + 1):
+                yield zoom, x, y
+
+
+def bbox_tile_count(bbox: BBox, zoom_min: int, zoom_max: int, margin: int = 1) -> int:
+    """``len(list(bbox_tiles(...)))`` without listing them."""
+    south, west, north, east = bbox
+    total = 0
+    for zoom in range(zoom_min, zoom_max + 1):
+        last = (1 << zoom) - 1
+        x0, y0 = tile_xy(north, west, zoom)
+        x1, y1 = tile_xy(south, east, zoom)
+        total += ((min(x1 + margin, last) - max(x0 - margin, 0) + 1)
+                  * (min(y1 + margin, last) - max(y0 - margin, 0) + 1))
+    return total
+
+
+class PrefetchResult(NamedTuple):
+    """Outcome of :meth:`TileCache.prefetch`."""
+    zoom_max: int        # highest zoom actually fetched (lowered to fit PREFETCH_MAX_TILES)
+    tiles: int           # tiles in the area
+    cached: int          # already in the database
+    downloaded: int
+    failed: int
+
+
+# ---------------------------------------------------------------------------
+# the cache
+# ---------------------------------------------------------------------------
+class TileCache:
+    """SQLite tile store for one tile server, LRU-evicted by total size.
+
+    Safe to use from several threads (the map's loader threads and a
+    prefetch job); all database access goes through one locked connection.
+    """
+
+    def __init__(self, path: Path | str | None = None, tile_server: str | None = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_zoom: int = 19,
+                 user_agent: str | None = None):
+        self.path = Path(path) if path is not None else default_tile_db()
+        self.tile_server = tile_server or default_tile_server()
+        self.user_agent = user_agent or default_user_agent()
+        self.max_bytes = max_bytes
+        self.max_zoom = max_zoom
+        self._lock = threading.RLock()
+        self._touched: Dict[Tile, float] = {}   # pending tile_access updates
+        self._stores = 0
+        self._offline_until = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        with self._lock, self._db:
+            for ddl in _SCHEMA:
+                self._db.execute(ddl)
+            self._db.execute("INSERT OR IGNORE INTO server (url, max_zoom) VALUES (?, ?);",
+                             (self.tile_server, max_zoom))
+            self._bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(tile_image)), 0) FROM tiles;").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # lookups
+    # ------------------------------------------------------------------
+    def get(self, zoom: int, x: int, y: int) -> Optional[bytes]:
+        """Stored image bytes for a tile, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tile_image FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?;",
+                (zoom, x, y, self.tile_server)).fetchone()
+            if row is None:
+                return None
+            self._touched[(zoom, x, y)] = time.time()
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched()
+        return row[0]
+
+    def contains(self, zoom: int, x: int, y: int) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?;",
+                (zoom, x, y, self.tile_server)).fetchone() is not None
+
+    def put(self, zoom: int, x: int, y: int, data: bytes) -> None:
+        """Store a tile, evicting old ones every so often when over budget."""
+        with self._lock:
+            with self._db:
+                old = self._db.execute(
+                    "SELECT LENGTH(tile_image) FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?;",
+                    (zoom, x, y, self.tile_server)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tiles (zoom, x, y, server, tile_image) VALUES (?, ?, ?, ?, ?);",
+                    (zoom, x, y, self.tile_server, sqlite3.Binary(data)))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tile_access (zoom, x, y, server, last_used) VALUES (?, ?, ?, ?, ?);",
+                    (zoom, x, y, self.tile_server, time.time()))
+            self._bytes += len(data) - (old[0] if old else 0)
+            self._stores += 1
+            if self._stores % _EVICT_EVERY == 0 and self._bytes > self.max_bytes:
+                self.evict()
+
+    # ------------------------------------------------------------------
+    # network
+    # ------------------------------------------------------------------
+    @property
+    def is_osm(self) -> bool:
+        """Whether tiles come from OpenStreetMap's servers."""
+        return is_osm_server(self.tile_server)
+
+    def url(self, zoom: int, x: int, y: int) -> str:
+        return self.tile_server.replace("{z}", str(zoom)).replace("{x}", str(x)).replace("{y}", str(y))
+
+    def fetch(self, zoom: int, x: int, y: int) -> bytes:
+        """Download one tile (not stored); raises ``OSError`` on failure."""
+        request = urllib.request.Request(self.url(zoom, x, y), headers={"User-Agent": self.user_agent})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_S) as response:
+            return response.read()
+
+    def tile(self, zoom: int, x: int, y: int) -> Optional[bytes]:
+        """Cached tile, else download and store it; None when unavailable.
+
+        After a failed download the server is not contacted again for
+        ``OFFLINE_RETRY_S`` seconds, so an offline map fills from the
+        database without waiting on timeouts for every tile.
+        """
+        data = self.get(zoom, x, y)
+        if data is not None or time.monotonic() < self._offline_until:
+            return data
+        try:
+            data = self.fetch(zoom, x, y)
+        except urllib.error.HTTPError:
+            return None          # server answered – just no such tile
+        except OSError:
+            self._offline_until = time.monotonic() + OFFLINE_RETRY_S
+            return None
+        self.put(zoom, x, y, data)
+        return data
+
+    def prefetch(self, bbox: BBox, zoom_min: int = DEFAULT_PREFETCH_ZOOMS[0],
+                 zoom_max: int = DEFAULT_PREFETCH_ZOOMS[1],
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 cancel: Optional[threading.Event] = None,
+                 workers: int = PREFETCH_WORKERS,
+                 max_tiles: int = PREFETCH_MAX_TILES,
+                 confirm_osm: bool = False) -> PrefetchResult:
+        """Download every missing tile of *bbox* for the zoom range.
+
+        The highest zoom levels are dropped until the area fits in
+        *max_tiles*.  *progress(done, total)* is called as tiles complete;
+        setting *cancel* stops after the tiles already in flight.
+
+        Against OpenStreetMap (see :func:`is_osm_server`) this raises
+        ``PermissionError`` unless *confirm_osm* is set, and *workers* is
+        capped at :data:`OSM_PREFETCH_WORKERS`.
+        """
+        if self.is_osm:
+            if not confirm_osm:
+                raise PermissionError(
+                    "OpenStreetMap's tile usage policy discourages bulk downloads; set "
+                    "QUIC_TILE_SERVER to a server that allows them, or confirm the prefetch")
+            workers = min(workers, OSM_PREFETCH_WORKERS)
+        zoom_max = min(zoom_max, self.max_zoom)
+        while zoom_max > zoom_min and bbox_tile_count(bbox, zoom_min, zoom_max) > max_tiles:
+            zoom_max -= 1
+        tiles = list(bbox_tiles(bbox, zoom_min, zoom_max))[:max_tiles]
+        missing = [t for t in tiles if not self.contains(*t)]
+        cached = len(tiles) - len(missing)
+
+        downloaded = failed = done = 0
+
+        def download(tile: Tile) -> Optional[bytes]:
+            if cancel is not None and cancel.is_set():
+                return None
+            try:
+                return self.fetch(*tile)
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="quic-tiles") as pool:
+            for tile, data in zip(missing, pool.map(download, missing)):
+                if data is None:
+                    failed += 1
+                else:
+                    self.put(*tile, data)
+                    downloaded += 1
+                done += 1
+                if progress is not None:
+                    progress(cached + done, len(tiles))
+                if cancel is not None and cancel.is_set():
+                    failed += len(missing) - done
+                    break
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO sections (position_a, position_b, zoom_a, zoom_b, server) "
+                "VALUES (?, ?, ?, ?, ?);",
+                (str((bbox[2], bbox[1])), str((bbox[0], bbox[3])), zoom_min, zoom_max, self.tile_server))
+        self.evict()
+        return PrefetchResult(zoom_max, len(tiles), cached, downloaded, failed)
+
+    # ------------------------------------------------------------------
+    # TkinterMapView integration
+    # ------------------------------------------------------------------
+    def attach(self, map_widget) -> bool:
+        """Make *map_widget* load its tiles through this cache.
+
+        The widget's loader threads call ``request_image``; the wrapper
+        answers from the database, downloads and stores misses, and falls
+        back to the widget's own loader for another tile server or an
+        overlay.
+
+        Returns False, leaving the widget untouched, when it lacks one of
+        the tkintermapview internals the wrapper uses (another release).
+        """
+        if not all(hasattr(map_widget, attr) for attr in _MAP_WIDGET_ATTRS):
+            return False
+        from PIL import Image, ImageTk
+
+        original = map_widget.request_image
+
+        def request_image(zoom, x, y, db_cursor=None):
+            if map_widget.tile_server != self.tile_server or map_widget.overlay_tile_server is not None:
+                return original(zoom, x, y, db_cursor=db_cursor)
+            data = self.tile(zoom, x, y)
+            if data is None or not map_widget.running:
+                return map_widget.empty_tile_image   # not cached: retried when shown again
+            try:
+                image = ImageTk.PhotoImage(Image.open(io.BytesIO(data)))
+            except Exception:
+                return map_widget.empty_tile_image
+            map_widget.tile_image_cache[f"{zoom}{x}{y}"] = image
+            return image
+
+        map_widget.request_image = request_image
+        # also drops whatever the widget loaded before the wrapper existed
+        map_widget.set_tile_server(self.tile_server, max_zoom=self.max_zoom)
+        return True
+
+    # ------------------------------------------------------------------
+    # housekeeping
+    # ------------------------------------------------------------------
+    def size(self) -> int:
+        """Total bytes of stored tile images."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tiles;").fetchone()[0]
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least-recently-used tiles until under *max_bytes*; returns count removed.
+
+        Tiles written by other tools (no access record) go first.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        removed = 0
+        with self._lock:
+            self._flush_touched()
+            if self._bytes <= budget:
+                return 0
+            rows = self._db.execute(
+                "SELECT t.zoom, t.x, t.y, t.server, LENGTH(t.tile_image) FROM tiles t "
+                "LEFT JOIN tile_access a ON a.zoom=t.zoom AND a.x=t.x AND a.y=t.y AND a.server=t.server "
+                "ORDER BY COALESCE(a.last_used, 0);").fetchall()
+            doomed = []
+            for zoom, x, y, server, length in rows:
+                if self._bytes <= budget:
+                    break
+                doomed.append((zoom, x, y, server))
+                self._bytes -= length
+            with self._db:
+                self._db.executemany(
+                    "DELETE FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?;", doomed)
+                self._db.executemany(
+                    "DELETE FROM tile_access WHERE zoom=? AND x=? AND y=? AND server=?;", doomed)
+            removed = len(doomed)
+        return removed
+
+    def clear(self) -> None:
+        """Remove every stored tile."""
+        self.evict(0)
+
+    def flush(self) -> None:
+        """Write pending access times (the LRU order) to the database."""
+        with self._lock:
+            self._flush_touched()
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+    def _flush_touched(self) -> None:
+        # caller holds self._lock
+        if not self._touched:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tile_access (zoom, x, y, server, last_used) VALUES (?, ?, ?, ?, ?);",
+                [(z, x, y, self.tile_server, t) for (z, x, y), t in self._touched.items()])
+        self._touched.clear()